@@ -1,2054 +1,5607 @@
-#! python3
-# -*- coding: utf-8 -*-
-
-# "Wrapper" for Pandoc (python 3): pandy [file/folder] [options]
-# tested for pandoc 1.19.2.1
-
-"""
-	Basically takes a file/folder, input the markup to convert from, the output markup and run it through pandoc.
-
-	More explained:
-	From a file/folder/.list/.ini, input the "from" markup and the output format, which can be a list separated with spaces. Formats are stripped down to the most common ones:
-
-		from: docbook, html, json, latex, markdown, markdown_github, markdown_mmd, markdown_phpextra, markdown_strict, mediawiki, mw, opml, rst, textile
-		output: all the above +  asciidoc, beamer, docx (or doc), epub, epub3, fb2, html5, odt, opendocument (or opendoc), pdf, plain, rtf, slides (or slide)
-
-		 All "markdown"s can be entered as "md". So: markdown -> md; markdown_github -> md_github; etc
-		 
-		 And these markdown extensions are automatically added: 'link_attributes', 'hard_line_breaks'
-
-	You can input some options of pandoc but with different names:
-
-	--from , -f           Convert from this format
-	--to, -t              Convert to this format (can be a space separated list)
-	--output, -o          Output folder
-	--self                self contained file
-	--header FILE         Header file. Included as it is (raw, verbatim)
-	--footer FILE         Footer file. Included as it is (raw, verbatim)
-	--index FILE          Custom index file for book. Can use wiki links
-	--html4               Use html4 output instead of html5
-	--merge, -m           Merge files.
-	--slides              Slides format.
-	--bib FILE            Use bibliography file
-	--css FILE            External CSS
-	--highlight           Highlight style. 
-	--highlight-no        No highlight
-	--tpl FILE            Template file.
-	--toc                 include TOC
-	--depth               TOC depth.
-	--hide                e-mail obfuscation
-	--sections            Wrap sections in <sections>, attach identifiers instead of titles
-	--pandoc PANDOC       Pandoc path. Default: pandoc
-	--data-dir FOLDER     Data directory
-	
-	If you merge and use output, you must only specify the folder. It takes the name from the parent folder/source 
-
-	As well as some of my own:
-	
-	--flat                Don't keep folder structure
-	--book, -b            Make a book with navigation (next/prev) and index
-	--no-nav, -nn         (For book) disable book navigation
-	--nav-title, -nt      (For book) use titles in book navigation
-	--no-side, -ns        (For book) Disable sidebar navigation
-	--no-side-toc, -nst   (For book) disable TOC in sidebar (keep in doc)
-	--config FILE         Use a configuration file (option=key values)
-	--tpl-pandy           (For book) Pandy's embebed template: simple and not so ugly
-
-	If you use markdown and convert to HTML, there're some goodies for you. You can have abbreviations, as PHP Markdown Extra:
-
-	Some text with an ABBR and a REF. Ignore REFERENCE and ref.
-	*[ABBR]: Abbreviation
-	*[REF]: Abbreviation Reference
-
-	admonitions with my own markup 
-
-	[class/type:optional title]
-	  * markdown
-	  * super
-	  * content
-
-    The "class/type" would be something like "information", "danger", "tip", "hint", "hungry", "duck", "yay" ...
-	  
-	You can also include a tag for toc ([TOC]) to have that file with a toc instead of remembering to enter --toc. (It just adds it automatically after searching the file, no magic here)
-	
-	Book converts all files to HTML and adds navigation links. Useful to make simple documentation. 
-	
-	If you use markdown you have more goodies: create your own index (as index.md) and have "wikiLinks". Wikilinks can be in any file as [:filename][optional title] where filename can have extension or not, and if you don't include a title, it finds the file title. The order of the files in the index affect the sidebar navigation. With this you can create cooler documentation or use it as a poor's man/simple wiki.
-
-	If you wish to create your own template for book, pandy adds some variables for you to include: 
-
-	  * ``side_navigation`` the sidebar navigation 
-	  * ``book_navigation`` book navigation (previous/index/next)
-	  * ``project-index`` link to index. Useful if you have subfolders 
-	  * ``project-title`` Index title. Useful if you create your own index with a title
-	
-	If you don't like setting the options in the CLI, or having a script, you can create your configuration in a key=value file (like ini). Example: myconfiguration.ini contains:
-
-	PANDOC_DATA_DIR = C:\Program Files\Pandoc
-	TEMPLATE = github.html
-	HIGHLIGHT = zenburn
-
-	Specify the configuration file with --config (the extension doesn't matter, and INI headers are ignored. Don't worry) or just have a settings.ini where you run pandy.
-
-"""
-
-import sys
-import argparse
-import subprocess
-import os
-import codecs
-import re
-
-drinkSoup = False
-try:
-	from bs4 import BeautifulSoup
-	drinkSoup = True 
-except ImportError:
-	# Dale, hacemela mas dificil
-	pass
-
-
-# ==============================
-# ==== info & pandoc config ====
-# ==============================
-
-__version__ = "2.0.3"
-_MY_USAGE = ''' %(prog)s [source] [options] '''
-# must replace the lists inside. This is just to have a bit of order.
-_MY_DESCRIPTION = '''
- [format_from] can be 
- {{ _FORMATS_BOTHWAYS }}
-
- All "markdown"s can be entered as "md". So: markdown -> md; markdown_github -> md_github; etc 
-
-   
- [format_to] include above formats plus: 
- {{ _FORMATS_OUTPUT }}
-
- Choose the slide format with --slides. 
-'''
-
-# pandoc's formats. Filtered to remove some that will never be used (by me)
-# Includes some synonyms
-_FORMATS_BOTHWAYS = [
-	'docbook', 'html', 'json', 'latex',
-	'markdown', "md",
-	'markdown_github', "md_github",
-	'markdown_mmd', "md_mmd",
-	'markdown_phpextra', "md_phpextra",
-	'markdown_strict', "md_strict",
-	'mediawiki', "mw", 'opml', 'rst', 'textile',
-	]
-_FORMATS_OUTPUT   = [
-	'odt', 'opendocument', 'opendoc', 'docx', 'doc',
-	'asciidoc', 'beamer', 'plain', 'rtf', 
-	'epub', 'epub3', 'fb2', 'html5',
-	'pdf', #[*for pdf output, use latex or beamer and -o FILENAME.pdf] 
-	"slides", "slide", #options slides in another list
-	"dokuwiki"
-	]
-
-_HIGHLIGHT_OPTIONS = ('pygments', 'kate', 'monochrome', 'espresso', 'zenburn',
-                     'haddock', 'tango')
-_SLIDES_OPTIONS    = ('dzslides', 'slidy', 'reveal', 'slideous', 's5')
-
-_COMMANDS_COMPLETE = {
-	'HIGHLIGHT_NO' : "--no-highlight",
-	'TOC'          : "--toc",
-	'SELF_CONTAINED' : "--self-contained",
-	'EMAIL_HIDE'   : "--email-obfuscation=references",
-	'CSS'          : "--css=",
-	'TOC_DEPTH'    : "--toc-depth=" ,
-	'SECTIONS'     : "--section-divs",
-	'BIBLIOGRAPHY' : "--bibliography=",
-	'TEMPLATE'     : "--template=",
-	'PANDOC_DATA_DIR' : "--data-dir=",
-	'HIGHLIGHT'    : "--highlight-style=",
-	'FILE_HEADER'  : "--include-before-body=",
-	'FILE_FOOTER'  : "--include-after-body=",
-	'CSL'          : "--csl=",
-	'RAW_HTML'     : "--parse-raw"
-
-	}
-
-EXTENSIONS_EXTRA  = ('link_attributes', 'hard_line_breaks', 'raw_html', '-markdown_in_html_blocks')
-
-# =======================
-# ==== configuration ====
-# =======================
-
-DEFAULT_INI_NAME = "settings.ini"
-
-_DEFAULT_CONFIG = {
-	'PANDOC': 'pandoc', # pandoc path
-	'PANDOC_DATA_DIR': "", # empty for default
-	'TEMPLATE': '',
-	'HIGHLIGHT': 'pygments',
-	'HIGHLIGHT_NO': False,
-	'SLIDES': 'dzslides', 
-	'TEMPLATE_PANDY': False,
-	
-	'SOURCE': os.getcwd(),
-	'OUTPUT_PATH': os.getcwd(),
-	'OUTPUT_FLAT': False,
-	'CONFIG_FILE' : DEFAULT_INI_NAME,
-	
-	'FORMAT_FROM': 'md',
-	'FORMAT_TO': ['html'],
-	
-	'TOC': False,
-	'TOC_DEPTH': 3,
-	'SECTIONS': False,
-	'SELF_CONTAINED': False,
-	'CSS_EXTERNAL': '',
-	'FILE_FOOTER': '',
-	'FILE_HEADER': '',
-	
-	'MERGE': False,
-	'BOOK': False,
-	'FILE_INDEX': '',
-	'USE_NAV': True, 
-	'NAV_TITLE': False,  #book, use title navigation
-	'NAV_SIDEBAR': True,  #book, sidebar with titles
-	'NAV_SIDEBAR_TOC': True, #book, have current toc in sidebar
-
-	'EMAIL_HIDE': False, # e-mail obfuscation (default none, true = references)
-	'BIBLIOGRAPHY': '',
-	'HTML_VER': 'html5', # Output html5 instead of html4 (html)
-	'TOC_TAG': '[TOC]',
-	}
-
-# for wiki links mostly
-ACCEPTED_MD_EXTENSIONS = ('md', 'txt', 'mdown', 'markdown')
-
-HTML_CSS = """
-    *           { margin: 0; padding: 0; }
-    html, body  { color: black; }
-
-    body {
-        padding: 0px 25px; 
-        margin: -1px auto;
-        font: 14px "Noto Sans", "Segoe UI", "Open Sans", "Dejavu Sans", arial, sans-serif; 
-        line-height: 1.8em;
-        color: #3A3A3A;
-        background-color: #f2f2f2;
-    }
-
-    .jp, [lang=jp] {font-family: "Noto Sans CJK JP", "DejaVu Sans", "Open Sans", sans-serif; }
-
-    p { margin: 1em 0; }
-
-    a {text-decoration: none; border-bottom: 1px solid; color: #4183c4; }
-    a:hover, a:active { color: #75A837; }
-
-    blockquote {
-        margin: 14px 0; padding: 0.7em 11px;
-        color: #555;
-        font-style: italic;
-        border-left: 10px solid #838383;
-    }
-
-    img {
-        display:          block;
-        background-color: #F3F3F2;
-        border:           1px solid #D9D9D7;
-        margin:           0px auto;   padding: 5px;
-    }
-
-    ins { color:#008000; }
-    del { color:#ACACAC; }
-
-    hr { border: 0; height: 1px; background: #333; }
-
-    sup, sub, a.footnote-ref, span.citation {
-        height:         0;
-        line-height:    1;
-        vertical-align: super;
-        position:       relative;
-    }
-	 
-    sub            {vertical-align: sub; top: -1px; }
-    a.footnote-ref { font-size: 1em; }
-    span.citation { font-size: 0.74em; }
-
-    abbr { border-bottom: 1px dotted }
-
-    h1,h2,h3,h4,h5,h6 { margin: 1.5em 0px 1em; padding: 4px 0; border-bottom: 1px solid #e0e0e0; }
-    h1 { font-size: 2em;}
-    h2 { font-size: 1.571em; }
-    h3 { font-size: 1.429em; }
-    h4 { font-size: 1.286em; }
-    h5 { font-size: 1.143em; color: #4d4d4d;}
-    h6 { font-size: 1em; color: #666; }
-    h1.title { margin:0 }
-
-    ul, ol  { margin: 21px 0 0px 30px; list-style-position: outside; }
-    li      { margin: 7px 0 }
-    ul      { list-style-type: disc; }
-    ol      { list-style-type: decimal-leading-zero; }
-
-    dl, dt, dd { margin: 0; }
-    dl { padding: 0px 1em 10px; }
-    dt { padding: 5px 0 5px; font-weight: bold; line-height: normal; }
-    dd { padding: 0 10px 20px 3em; }
-
-    /* based on 
-	 http://icant.co.uk/csstablegallery/tables/50.php (Blaugrana).   DEAD! 
-	 http://www.csslab.cl/csstablegallery/   previews are DEAD as well as some links 
-	 probably works: https://web.archive.org/web/20130829004021/http://icant.co.uk:80/csstablegallery/tables/50.php
-	 */
-    table { 
-        padding: 0; margin: 0 auto 2em auto;
-        border-spacing: 0; border-collapse: collapse;
-        min-width: 50%;
-        border: 1px solid;
-    }
-    th, caption {color: #444; font-weight: bold;text-align: center;}
-    td, th {padding: .6em .4em; vertical-align: top; border: 1px solid #779; }
-    th, tfoot td {border: 1px solid #361; background: #e0e5cf; }
-    tr { background: #cfe0e5 }
-    tr:nth-of-type(odd){background:#e5cfe0;}
-    tr:nth-of-type(odd) td, tr:nth-of-type(odd) th {border-color:#977;}
-
-    pre, code {
-        border:         1px solid #ccc;
-        font-size:      12px;    
-        background-color:#eee;
-    }
-
-    pre  { margin: 5px 0 0; padding: 6px 5px; white-space: pre; overflow: auto; }
-    code { font-family:    Consolas, "Liberation Mono", Courier, monospace; margin: 0 2px; padding: 2px 5px; /*white-space: nowrap;*/ }
-
-    pre code { border: none }
-
-    #TOC    { margin-top: 30px; background-color: #e5efdf; border: 1px solid #cedec4;}
-    #TOC a  { margin: 0 15px !important; }
-    #TOC ul {
-        margin: 1px 0 0 15px !important;    
-        padding: 0 0 0 1px !important;
-        display: block;
-        line-height: 20px;
-        list-style: none;
-    }
-    #TOC ul li  { border-left: 1px solid; position: relative; margin:0 !important; }
-    #TOC ul > #TOC li { padding-bottom: 10px !important;}
-    #TOC ul li:before {
-        content: '';
-        width: 14px;
-        position: absolute;
-        border-bottom: 1px solid;
-        left: 0px;
-        top: 10px;
-    }
-    #TOC ul li:last-child {border-left:none;}
-    #TOC ul li:last-child:before {border-left:1px solid; height: 10px; margin-top:-10px !important; }
-    #TOC ul li, #TOC ul li:before, #TOC ul li:last-child:before {border-color: #7A7A7A; }
-    .admonition p   { margin: 0.5em 1em 0.5em 1em; padding: 0;}
-    .admonition pre { margin: 0.4em 1em 0.4em 1em;}
-    .admonition ul, .admonition ol { margin: 0.1em 0.5em 0.5em 3em;   padding: 0;}
-
-    .admonition {
-        margin: 2em; padding: 0;
-        font-size:        0.9em;
-        border:           1px solid #c2c2c2;
-        background-color: #e9e9e9;
-    }
-
-    .admonition p.admonition-title {
-        margin:     0;
-        padding:    0.1em 0 0.1em 0.5em;
-        font-size:  1.1em;
-        font-weight: bold;
-        color:      #fff;
-        border-bottom: 1px solid #c2c2c2;
-        background-color: #999; 
-    }
-
-    .admonition.error, .admonition.caution, .admonition.danger
-    {border-color: #900000; background-color: #ffe9e9;}
-
-    .error p.admonition-title, .caution p.admonition-title, .danger p.admonition-title
-    {background-color: #b04040; border-color: #900000;}
-
-    .admonition.hint
-    {background-color: #ECFAE3;  border-color: #609060;}
-
-    .hint p.admonition-title
-    {background-color: #70A070; border-color: #609060;}
-
-    .admonition.note, .admonition.tip, .admonition.warning
-    {border-color:#e2ba54; background-color:#fcfce1;}
-
-    .note p.admonition-title, .tip p.admonition-title, .warning p.admonition-title
-    {background-color: #f1d170; border-color:#e2ba54;}
-
-    .admonition.info, .admonition.attention, .admonition.important
-    {background-color: #e8edfc; border-color: #94A7BF;}
-
-    .info p.admonition-title, .attention p.admonition-title, .important p.admonition-title
-    {background-color: #7088A0; border-color: #94A7BF;}
-
-    mark {background-color: #e7d600; padding: 0.2em;}
-    mark.second {background-color: #f08333;}
-
-    .bookbar {padding: 10px; border: 1px solid #ccc; border-width: 1px 0; overflow: auto}
-    .bookbar li {display: inline-block;}
-    .bookbar ul {margin: 0}
-    .breadcrumbs {float: left;}
-    .breadcrumbs li:after {content: "\\0BB \\020" /* » */; padding-left: 0.6em;}
-    .breadcrumbs li:last-child:after {content: ""}
-    .booknav {float:right;}
-    .booknav li {padding: 0 1.0em;}
-
-    #content {display: table-row;}
-
-    #sidebar {display: table-cell; width: 240px; font-size: small; background-color: #eeeeee;}
-    #sidebar ul ul {margin: 5px 0px 0px 5px;}
-    #sidebar ul ul li {margin-left: 10px;}
-    #sidebar ul {list-style: decimal;}
-    #sidebar ul ul {list-style: lower-alpha;}
-    #sidebar ul ul ul {list-style: lower-roman;}
-    #sidebar li.active > a {font-weight: bold}
-
-    #content-body {padding: 20px; font-size: 16px;}
-
-    #footer {padding: 10px; font-size: small; }
-"""
-
-HTML_BEFORE = """
-	<div id="wrapper">
-	{bookbar}
-
-	<div id="content">
-
-	<div id="sidebar">
-	{side_navigation}
-	</div>
-
-	<div id="content-body">
-"""
-
-HTML_BOOKBAR = """
-	<div class="bookbar">
-		<ul class="breadcrumbs">
-			<li>{projectindex}</li>
-			<li class="active">{pagetitle}</li>
-		</ul>
-
-		{book_navigation}
-	</div>
-"""
-
-HTML_AFTER = """
-	</div> <!-- contentbody -->
-	</div> <!-- content -->
-
-	{bookbar}
-
-	<div id="footer">
-	</div>
-
-	</div> <!-- wrapper -->
-"""
-
-
-# =======================
-# == methods: system ====
-# =======================
-
-def path_mkdir(path):
-	""" make tree dirs from path """
-
-	try:
-		os.makedirs(path)
-	except OSError:
-		pass
-
-def path_get(thefile):
-	""" Get path from file """
-
-	return os.path.dirname(thefile)
-
-def path_getFilename(file_path):
-	""" Get filename from path"""
-
-	return os.path.basename(file_path)
-
-def path_delExtension(file_path):
-	""" Delete the extension from path """
-
-	path, _ = os.path.splitext(file_path)
-	return path
-
-def path_lastDir(path):
-	""" Parent folder name """
-
-	return os.path.split(path)[1]
-
-def path_relative_to(this_path, root, index=False):
-	"""Gets the relative path of this_path from root """
-
-	if index:
-		return os.path.relpath(this_path, root)
-		
-	# Delete first "folder" (..\)
-	return os.path.relpath(this_path, root)[3:]
-
-def save(path, text):
-	""" Saves file using it properties"""
-
-	cmd = cmd_open_write(path, 'w')
-
-	with cmd as outputFile:
-		outputFile.write(text)
-
-def files_get(path, only_exts=None, exclude_files=None):
-	""" Get a list of files in dir. Returns list 
-
-	:param:only_exts   tuple to include only selected extensions (mainly for html pages 
-		               saved locally (which has folders > images ) )
-	:param:exclude_files tuple to exclude files, mainly to exclude custom index 
-	""" 
-
-	theFiles = list()
-
-	if os.path.isfile(path):
-		if os.path.exists(path):
-			theFiles.append(path)
-	else:
-		for root, subFolders, files in os.walk(path):
-			for filename in files:
-				filePath = os.path.join(root, filename)
-
-				if os.path.exists(filePath):
-					if only_exts and filePath.endswith(only_exts):
-						theFiles.append(filePath)
-					else:
-						if exclude_files and filePath in exclude_files:
-							continue
-						theFiles.append(filePath)
-
-	return theFiles	
-
-def files_list(path, only_exts=None, exclude_files=None):
-	"""Gets the files from the .list (returns list). If not a .list, calls files_get"""
-
-	if path.endswith(".list"):
-		fileList = list()
-		cmd      = cmd_open_write(path, 'r')
-			
-		with cmd as listFiles:
-			for line in listFiles:
-				line = line.strip()
-
-				if os.path.exists(line):
-					fileList.append(line)
-		return fileList
-	
-	return files_get(path, only_exts, exclude_files)
-
-def cmd_open_write(path, mode):
-	""" Create the open/write command according to python version 
-	mode is: 'r' for read and 'w' for write
-	"""
-
-	return codecs.open(path, mode, encoding='utf-8-sig')
-
-def cmd_open_file(path):
-	""" Opens file and returns text """
-
-	with cmd_open_write(path, 'r') as readme:
-		return readme.read()
-
-def get_ini(filepath, keys_upper=False, space_list=None):
-	"""Read ini without headers (ignores them). Return dict
-
-	:keys_upper: if key (options) are returned as uppercase. 
-	:space_list  a list/tuple of keys that (the value) is a space separated list
-	"""
-
-	# lets be nice and convert to lowercase
-	[z.lower() for z in space_list]
-
-	import configparser
-	config = configparser.ConfigParser(empty_lines_in_values=False)
-
-	# config parser doesnt parse ini without section, fake it
-	dummy_section_name = "sexysettings"
-	dummy_file = "[" + dummy_section_name + "]\n"
-	
-	with open(filepath) as dumb:
-	    dummy_file += dumb.read()
-
-	config.read_string(dummy_file, source=filepath)
-	
-	config = config[dummy_section_name]
-
-	tmp_options  = dict()
-	for key, value in list(config.items()):
-
-		#Convert booleans, ints, lists
-		if value.isnumeric():
-			value = int(value)
-		elif value.startswith("[") and value.endswith("]"):
-			value = value[1:len(value)-1]
-			value = value.split(",")
-		else:
-			# booleans can accept true/false, yes/no
-			try:
-				config.getboolean(key)
-			except ValueError:
-				pass
-			else:
-				value = config.getboolean(key)
-
-		if key.lower() in space_list:
-			# must do checking for string only
-			value = value.split()
-
-		if keys_upper:
-			key = key.upper()
-		
-		tmp_options[key] = value	
-
-	return tmp_options
-
-
-# =========================
-# == methods: commands ====
-# =========================
-
-def run_subprocess(command, output=False, text=None):
-	""" run the cmd (list) 
-	normally -> check_call
-	if output activated: returns the output to string -> check_output
-	if also text: to interact -> Popen (encodes to utf-8)
-
-	Added shell=True because Windows/Python is crazy sometimes and cant find .exe in path. 
-	Thank you <http://stackoverflow.com/questions/3022013>
-	"""
-
-	if not output:
-		return subprocess.check_call(command, stderr=subprocess.STDOUT, shell=True)
-	elif not text:
-		return subprocess.check_output(command, shell=True)
-	else:
-		text = text.encode('utf-8')
-		tmp  = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, shell=True)
-		result = tmp.communicate(text)[0] # send stdin 
-		return result
-
-def translate_synonyms(word):
-	"""Translate the synonyms to complete words"""
-
-	if word == "md" or word.startswith("md"):
-		word = word.replace("md", "markdown")
-		return word
-
-	if word == 'slide':
-		return "slides"
-
-	if word == 'mw':
-		return "mediawiki"
-
-	if word == 'doc':
-		return 'docx'
-
-	if word == 'opendoc':
-		return 'opendocument'
-
-	return word
-
-def translate_argsPandoc(myarg, value):
-	""" translate my arguments to pandoc's """
-
-	if myarg in _COMMANDS_COMPLETE and value:
-		pandoc_arg = _COMMANDS_COMPLETE[myarg]
-
-		if isinstance(value, bool):
-			return [pandoc_arg]
-		else:
-			return [pandoc_arg + str(value)]
-
-	return ""
-
-def msg_cli_yesno(msg):
-	"""Message for cli when answering y/n questions. 
-	msg contains the message without the "Continue (y/n)"
-	Returns boolean 
-	"""
-
-	answer = ""
-	while (not answer.lower() == 'y' and not answer.lower() == 'n'):
-		answer = input(msg + " Continue? (y/n) ")
-
-	if answer == 'y':
-		return True 
-	return False
-
-def check_synonyms(format_from, format_to):
-	"""Translate synonyms, return modified values """
-
-	format_from = translate_synonyms(format_from)
-	format_to = list(format_to)
-	
-	i = 0
-	while i < len(format_to):
-		format_to[i] = translate_synonyms(format_to[i])
-		i += 1
-
-	format_to = list(set(format_to)) # no duplicates
-
-	return format_from, format_to
-
-# ================================
-# == methods: special parsing ====
-# ================================
-
-def if_special_elements(text, toc_tag):
-	"""read text (as list) and process trough specials 
-	(admonitions, abbreviations, TOC tag, internallinks)
-	returns: text (as list) and hasTOC (bool)
-	"""
-	
-	hasTOC, text = find_TOCinFile(text, toc_tag)
-	text = parse_admonitions(text)
-	text = parse_abbreviations(text)
-	text = parse_internalLinks(text)
-
-	return text, hasTOC
-
-def parse_abbreviations(text):
-	""" Find if file has abbreviations, if it does: parse as HTML. 
-	text: list (as just opened)
-	returns parsed text list 
-
-	abbreviations format as PHP Markdown Extra:
-
-    Some text with an ABBR and a REF. Ignore REFERENCE and ref.
-    *[ABBR]: Abbreviation
-    *[REF]: Abbreviation Reference
-
-    should be: Some text with an <abbr title="Abbreviation">ABBR</abbr> and a <abbr 
-            title="Abbreviation Reference">REF</abbr>. Ignore REFERENCE and ref.
-	"""
-
-	p = re.compile(r'\*\[(\w+)\]:\s+(\S.+)')
-
-	newtext = []
-	defs = {}
-
-	for line in text:
-		m = p.match(line)
-		if m:
-			abrr = m.group(1).strip()
-			title = m.group(2).strip()
-			defs[abrr] = title
-		else:
-			newtext.append(line)
-
-	newtext = "<<<<SPLITMEOVERHERE>>>>".join(newtext)
-	for key, value in defs.items():
-		newtext = re.sub(r'\s'+key+r'([\s\.,:;\?!]{1}?)', 
-			             r' <abbr title="'+value+'">'+key+'</abbr>\\1', 
-			             newtext)
-
-	newtext = newtext.split("<<<<SPLITMEOVERHERE>>>>")
-
-	return newtext
-
-def parse_admonitions(text):
-	""" Find and parse my admonitions. 
-	Input text: as list (just after open)
-	returns parsed text as list
-
-	Syntax:
-	[class/type:optional title]
-      * markdown
-      * super
-      * content
-    
-	would be translated as div:
-	<div class="admonition class/type">
-	<p class="admonition-title"> Optional title </p>
-      * markdown
-      * super
-      * content
-	</div>
-    """
-
-	new_test = list()
-	admon_start = False
-
-	for line in text:
-		tmp_line = line.rstrip()
-
-		if tmp_line.count("[") == 1 and tmp_line.startswith("[") and tmp_line.endswith("]"):
-			if admon_start:
-				# close previous
-				new_test.append("</div>")
-
-			admon_start = True
-
-			tmp_line = tmp_line[1:len(tmp_line)-1]
-            
-			if ":" in tmp_line:
-				admon_type, admon_title = tmp_line.split(':')
-			else:
-				admon_type = tmp_line
-				admon_title = None
-
-			new_str = '<div class="admonition ' + admon_type + '">'
-			new_test.append(new_str)
-
-			if admon_title:
-				new_test.append('<p class="admonition-title">' + admon_title + '</p>')
-
-			continue 
-
-		if (tmp_line.startswith("\t") or tmp_line.startswith ("  ") or not tmp_line) and admon_start:
-			if tmp_line:
-				#remove first set of whitespace
-				if tmp_line.startswith("\t"):
-					tmp_line = line.replace("\t", "", 1)
-				else:
-					tmp_line = re.sub(r'^\s{2,4}(.+)', '\\1', line)
-			else:
-				tmp_line = "\n"
-
-			new_test.append(tmp_line)
-
-		else:
-			if admon_start:
-				new_test.append("</div>")
-
-			new_test.append(line)
-			admon_start = False
-
-	return new_test
-
-def find_TOCinFile(text, placeholder, replace_with='<!-- TOCatized -->'):
-	""" automatically check if text (as list) has the TOC tag. Replaces 
-	placeholder with another string. Returns boolean and text (as list) 
-	only for occurence
-	"""
-
-	for index in range(len(text)):
-		if text[index].startswith(placeholder):
-			text[index] = text[index].replace(placeholder, replace_with)
-			return True, text 
-
-	return False, text 
-
-def parse_internalLinks(text):
-	""" Process "internal links": [nicetitle](file.md) to [nicetitle](file.html)
-	Markdown file opened before as list  
-	return  text 
-	No guessing of title
-
-	ex: wikilinks
-	"""
-
-	extensions = "|".join(ACCEPTED_MD_EXTENSIONS)
-
-	# harvest all links first 
-	links = extractMdLinks(text, extension=extensions)
-
-	for link in links:
-		link_new = path_delExtension(link[1]) + ".html"
-		title_new = link[0]
-
-		link.append(title_new)
-		link.append(link_new)
-
-	# replace in file
-	textNew = "<<<<SPLITMEOVERHERE>>>>".join(text)
-	link_tpl = "[{title}]({link})"
-
-	for link in links:
-		find_me    = link_tpl.format(title=link[0], link=link[1])
-		replace_me = link_tpl.format(title=link[2], link=link[3])
-
-		textNew = textNew.replace(find_me, replace_me)
-
-	return textNew.split("<<<<SPLITMEOVERHERE>>>>")
-
-def parse_wikilinks(text, list_files=None, this_references=None):
-	"""Parse wikilinks (reference links but inverted): [:filename][title]
-	[:filename] can have extension or not.
-	[title] is optional. If blank: searches title
-
-	:text             text as list
-	:list_files       dict. files: any key and holding (minimum):
-	                      path_input, title, output ("future path")
-	:this_references  dict. use this as reference list (do not search in files)
-	                    key: ref id. ex. filenames, can be joined (search w/ "in")
-	                    value['output']: output path ("future path"/html)
-	                    value['title']: file future title 
-
-	return processed text (list) and references (list) of the file
-	"""
-
-	# prefere this_references 
-	if list_files and this_references:
-		list_files = None 
-
-	extensions = "|".join(ACCEPTED_MD_EXTENSIONS)
-	links = extractMdLinks(text, extension=extensions, style='wiki')
-
-	references = list()
-	ref_tpl    = "[{thefile}]: {future_html}"
-	new_links  = list() #filename, title_old and title_new. Later text replacement
-
-	search_in_prop = False
-	listing = this_references
-	if list_files is not None:
-		listing = list_files
-		search_in_prop = True 
-
-	for link in links:
-		filename    = link[0]
-		title_old   = link[1]
-		future_path = ""
-		title_new   = title_old
-
-		for key in listing:
-			look_here = key
-			if search_in_prop:
-				look_here = listing[key]['path_input']
-
-			if filename in look_here:
-				future_path = listing[key]['output']
-					
-				if not title_old:
-					title_new = listing[key]['title']
-
-				# create ref
-				tmp = ref_tpl.format(thefile=filename, future_html=future_path)
-				if not tmp in references:
-					references.append(tmp)
-
-				tmp = [filename, title_old, title_new]
-				if not tmp in new_links:
-					new_links.append([filename, title_old, title_new])
-
-				break 				
-
-	# replace in text 
-	newtext     = "<<<<SPLITMEOVERHERE>>>>".join(text)
-	search_tpl  = "[:{filename}][{title}]"
-	replace_tpl = "[{title}][{filename}]"
-
-	for link in new_links:
-		filename  = link[0]
-		title_old = link[1]
-		title_new = link[2]
-
-		newtext = newtext.replace(
-			search_tpl.format(filename=filename, title=title_old), 
-			replace_tpl.format(filename=filename, title=title_new))
-
-	newtext = newtext.split("<<<<SPLITMEOVERHERE>>>>")
-
-	return newtext, references
-
-def extractMdLinks(text, extension="md", style='inline'):
-	"""Extract markdown links in text with extension. 
-	:text list 
-	:extension the allowed extension
-	:referencestyle    for [][] links 
-	:return a nested list. 
-	             normal: holder(title, link)
-	             reference: holder(title, id_link)
-	:style      style of links. Options: inline | reference | wiki | all or both
-	"""
-
-	list_links = list()
-
-	expr_normal    = "\[(.+?)?\]\((.+?\.(" + extension + "))\)"
-	expr_wiki = "\[:(.+?[\.(" + extension + ")]?)\]\[(|.+?)\]"
-	expr_reference = "\[(.+?[\.(" + extension + ")]?)\]\[(|.+?)\]"
-	# all = inline + reference
-	expr_all = "\[\:?(.+?[\.(" + extension + ")]?)\](?:\[(|.+?)\]|\((.+?[\.(" + extension + ")]?)\))"
-
-	if style == "reference":
-		expr = r'' + expr_reference
-	elif style == "wiki":
-		expr = r'' + expr_wiki
-	elif style == "inline":
-		expr = r'' + expr_normal
-	elif style in ('all', 'both'):
-		expr = r'' + expr_all
-
-	for line in text:
-		matches = re.findall(expr, line)
-		for m in matches:
-			title = m[0].strip()
-			if not style == 'all':
-				link  = m[1].strip()
-			else:
-				link  = m[2].strip()
-
-			if [title, link] not in list_links:
-				list_links.append([title, link])
-
-	return list_links
-
-def findTitleMd(filepath=None, text_lines=None):
-	"""Find title in markdown file. All posibilities (% , title: # and =====)
-	:filepath   path to open file 
-	:text_lines   text in list
-	"""
-
-	if filepath:
-		with cmd_open_write(filepath, 'r') as tmp:
-			the_text = tmp.readlines()
-	if text_lines:
-		the_text = text_lines
-
-	max_meta = 30 #max lines to look for metadata title
-
-	for number, line in enumerate(the_text):
-		if line.startswith("% "):
-			return line[1:].strip()
-		
-		if line.startswith("title: "):
-			tmp = line[7:]
-			if tmp.startswith(("'", '"')) and tmp.endswith(("'", '"')):
-				tmp = tmp[1:len(tmp) - 1]
-			return tmp.strip()
-
-		if number == max_meta:
-			break 
-
-	# nothing found. I'm doing extra work for you, ok? Next time use metadata
-	for number, line in enumerate(the_text):
-		if line.startswith("# "):
-			return line[2:]
-		if line.startswith("======="):
-			return the_text[number - 1].strip()
-
-	return False
-
-# =============================
-# == methods: Args/options ====
-# =============================
-
-class InputExist(argparse.Action):
-	""" Custom action for args, check if input exists """
-
-	def __call__(self, parser, namespace, values, option_string=None):
-		if not os.path.exists(values):
-			parser.error('Source file or folder doesn\'t exist')
-
-		setattr(namespace, self.dest, values)
-
-def get_args():
-	""" Args parsing and translation to nice configs"""
-
-	parser = argparse.ArgumentParser(add_help=False, usage=_MY_USAGE 
-		        , description=help_replaceStringFormats(_MY_DESCRIPTION, 
-		        	            ['{{ _FORMATS_OUTPUT }}', '{{ _FORMATS_BOTHWAYS }}'])
-		        , formatter_class=argparse.RawTextHelpFormatter) 
-
-	required = parser.add_argument_group(' Required')
-	required.add_argument("source", action=InputExist, help="file, folder, .list or config file (.ini)")
-	
-	option_file = parser.add_argument_group(' Options:\n\n file related')
-	option_file.add_argument("--from", '-f', metavar="", choices= _FORMATS_BOTHWAYS, help="Convert from this")
-	option_file.add_argument("--to", '-t', nargs='*', choices= _FORMATS_BOTHWAYS + _FORMATS_OUTPUT, 
-		    metavar="", help="Convert to this (can be a space separated list)")
-	option_file.add_argument("--output", "-o", help="Output folder", metavar="FOLDER")
-	option_file.add_argument("--flat", action='store_true', help="Don't keep folder structure")
-	option_file.add_argument("--self", help="self contained file", action='store_true')	
-	option_file.add_argument("--header", metavar="FILE", 
-		    help="Header file. Included as it is (raw, verbatim)")
-	option_file.add_argument("--footer", metavar="FILE", 
-		    help="Footer file. Included as it is (raw, verbatim)")
-	option_file.add_argument("--html4", action="store_true", 
-		    help="Use html4 output instead of html5")
-	option_file.add_argument("--slides", choices=_SLIDES_OPTIONS, metavar="",
-		    help="Slides format. Options: " + ", ".join(_SLIDES_OPTIONS) + ". Default: %(default)s",  
-		    default=_DEFAULT_CONFIG['SLIDES'])
-	option_file.add_argument("--bib", help="Use bibliography file", metavar="FILE")
-	option_file.add_argument("--csl", help="CSL file", metavar="FILE")
-	option_file.add_argument("--parse-raw", help="RAW_HTML", action="store_true")
-
-	exclusive = option_file.add_mutually_exclusive_group()
-	exclusive.add_argument("--merge", "-m", action="store_true", help="Merge files")
-	exclusive.add_argument("--book", "-b",  action="store_true", 
-		    help="Make a book with navigation (next/prev) and index")
-
-	style = parser.add_argument_group(' styling')
-	style.add_argument("--css", help="External CSS", metavar="FILE")
-
-	style.add_argument("--highlight", choices=_HIGHLIGHT_OPTIONS,  metavar="",
-		    default=_DEFAULT_CONFIG['HIGHLIGHT'], 
-		    help="Highlight style. Options: " + ", ".join(_HIGHLIGHT_OPTIONS) + ". Default: %(default)s")
-	style.add_argument("--highlight-no", help="No highlight", action='store_true')
-	style.add_argument("--tpl", metavar="FILE",
-		    help="Template file. Can enter 'default' for pandoc's default.")
-	style.add_argument("--tpl-pandy", help="Pandy's embebed template: simple and not that ugly", 
-		                              action='store_true')
-
-	other = parser.add_argument_group(' other')
-	other.add_argument("--toc", help="include TOC", action='store_true')
-	other.add_argument("--depth", type=int, choices=[1, 2, 3, 4, 5, 6], metavar="",
-		    help="TOC depth. Choices: 1, 2, 3, 4, 5, 6. Default: %(default)s", 
-		    default=_DEFAULT_CONFIG['TOC_DEPTH'])
-	other.add_argument("--hide", action='store_true', 
-		    help="e-mail obfuscation (default none, true = references)")
-	other.add_argument("--sections", action='store_true', 
-		    help="Wrap sections in <sections>, attach identifiers instead of titles")
-	other.add_argument("--config", metavar="FILE", 
-		    help="Use a configuration file (option=key values)")
-
-	other.add_argument("--no-nav", "-nn", action="store_true", 
-		    help="(For book) disable book navigation")
-	other.add_argument("--nav-title", "-nt", action="store_true", 
-		    help="(For book) use titles in book navigation")
-	other.add_argument("--no-side", "-ns", action="store_true", 
-		    help="(For book) Disable sidebar navigation")
-	other.add_argument("--no-side-toc", "-nst", action="store_true", 
-		    help="(For book) disable TOC in sidebar (keep in doc)")
-			 
-	pandoc = parser.add_argument_group(' Pandoc')
-	pandoc.add_argument("--pandoc",   default=_DEFAULT_CONFIG['PANDOC'], 
-		    help="Pandoc path. Default: %(default)s")
-	pandoc.add_argument("--data-dir", default="", help="Data directory", metavar="FOLDER")
-
-	nocateg = parser.add_argument_group(' Last but not least')
-	nocateg.add_argument("--help", "-h", help="show this help message and exit", action="help") 
-	nocateg.add_argument('--version', action='version', version='%(prog)s ' + __version__)
-
-	arg_dict = vars(parser.parse_args())
-	if arg_dict['to'] is not None:
-		arg_dict['to'] = set(arg_dict['to'])
-
-	#convert those ugly names to the nice ones
-	argsToSettings = {
-		'output': 'OUTPUT_PATH',
-		'flat': 'OUTPUT_FLAT',
-		'self': 'SELF_CONTAINED',
-		'css': 'CSS_EXTERNAL',
-		'tpl': 'TEMPLATE',
-		'hide': 'EMAIL_HIDE',
-		'bib': 'BIBLIOGRAPHY',
-		'nav_title': 'NAV_TITLE',
-		'data_dir': 'PANDOC_DATA_DIR',
-		'html4': 'HTML_VER',
-		'header': 'FILE_HEADER',
-		'footer': 'FILE_FOOTER',
-		'depth' : 'TOC_DEPTH',
-		'no_side' : 'NAV_SIDEBAR',
-		'no_nav' : 'USE_NAV',
-		'config' : 'CONFIG_FILE',
-		'no_side_toc' : 'NAV_SIDEBAR_TOC',
-		'from': 'FORMAT_FROM',
-		'to': 'FORMAT_TO',
-		'tpl_pandy': "TEMPLATE_PANDY",
-
-		#convert to upper
-		'pandoc': 'PANDOC',
-		'highlight': 'HIGHLIGHT',
-		'slides': 'SLIDES',
-		'source': 'SOURCE',
-		'sections': 'SECTIONS',
-		'toc': 'TOC',
-		'merge': 'MERGE',
-		'book': 'BOOK',
-		'highlight_no': 'HIGHLIGHT_NO',
-		'csl': "CSL",
-		'parse_raw' : 'RAW_HTML',
-		}
-
-	settings_args = dict()
-
-	def toggleBool(val):
-		if val:
-			return False 
-		return True 
-
-	# transfer & translate
-	for key, val in arg_dict.items():
-		if key == "html4":
-			val = 'html' if val else 'html5'
-
-		if key in ('no_nav', 'no_side_toc', 'no_side'):
-			val = toggleBool(val)
-
-		settings_args[argsToSettings[key]] = val 
-
-	if settings_args['SOURCE'] == ".":
-		settings_args['SOURCE'] = os.getcwd()
-
-	return settings_args
-
-def prepare_args(arg_dict):
-	""" Prepares the args to a nice config dictionary. Also reads .ini """
-	
-	settings_final = dict(_DEFAULT_CONFIG)
-
-	if arg_dict['SOURCE'].endswith(".ini"):
-		settings_final['CONFIG_FILE'] = arg_dict['SOURCE']
-		del arg_dict['SOURCE']
-
-	# complete missing options. default <- .ini <- args 
-	# read ini and replace default
-	if os.path.exists(settings_final['CONFIG_FILE']):
-		settings_file = get_ini(settings_final['CONFIG_FILE'], True, space_list=('format_to','extensions_extra'))
-		settings_final.update(settings_file)
-
-	#remove config option (just because)
-	del settings_final['CONFIG_FILE']
-
-	# now args
-	# remove default values from arg_dic -> not overwrite
-	for key, val in _DEFAULT_CONFIG.items():
-		if key in arg_dict and arg_dict[key] == val:
-			del arg_dict[key]
-
-	#Take care of specials
-	for key, val in list(arg_dict.items()):
-		if val is None:
-			del arg_dict[key]
-
-	settings_final.update(arg_dict)
-
-	# Check option belonging, replace special keys, etc 
-	# if pdf, warn that needs latex 
-	if "pdf" in settings_final['FORMAT_TO']:
-		answer = msg_cli_yesno("  To convert to PDF needs LaTeX installed (and in PATH)")
-		if not answer:
-			exit()
-
-	if settings_final['TEMPLATE'] == "NONE":
-		settings_final['TEMPLATE'] = ""
-
-	if settings_final['SOURCE'].endswith(".list") and not settings_final['OUTPUT_FLAT']:
-		msg("Keeping folder structure with .list not supported. Skipping option")
-		settings_final['OUTPUT_FLAT'] = True 
-
-	#Special belonging if not book, just to clean up
-	if not settings_final['BOOK']:
-		if (settings_final['NAV_TITLE'] or settings_final['NAV_SIDEBAR'] 
-			or settings_final['USE_NAV']):
-
-			settings_final['NAV_TITLE']   = False
-			settings_final['NAV_SIDEBAR'] = False
-			settings_final['USE_NAV']     = False
-
-	if settings_final['TEMPLATE_PANDY'] and settings_final['TEMPLATE']:
-		msg("How cute, but you have to specify only one. Disabling pandy's")
-		settings_final['TEMPLATE_PANDY'] = False 
-
-	return settings_final
-
-# ============
-# == Misc ====
-# ============
-
-def getTOC(html):
-	"""Returns the TOC list as str (splitting from <body>) """
-
-	if drinkSoup:
-		soup = BeautifulSoup(html)
-		soup = soup.body
-
-		toc = soup.find(id='TOC')
-		if toc:
-			toc = toc.extract()
-			toc = toc.ul
-			return str(toc)
-
-		return ''
-
-	else:		
-		text = html.split("<body>")[1]
-		text = text.split("</body>")[0]
-
-		if not '<div id="TOC">' in text:
-			return ''
-
-		text = text.split('<div id="TOC">')[1]
-		text_parts = text.split('</div>')
-		toc = text_parts[0]
-		toc = toc.splitlines()
-		toc = [line for line in toc if line]
-		#toc = toc[1:-1] # remove first <ul> and last </ul>
-		return "".join(toc)
-
-def orderListFromList(orderthis, fromthis, bythiscol=None):
-	"""Order a list, based on another by value. 
-
-	:orderthis    list to be ordered 
-	:fromthis     new order list 
-	:bythiscol    "column" number to order by this value set 
-	"""
-
-	tmp_list = list()
-
-	for new_order in fromthis:
-		for item in orderthis:
-			checkthis = new_order
-			if bythiscol is not None:
-				checkthis = new_order[bythiscol]
-
-			#we trust the user that will be no files with same name
-			if checkthis in item:
-				tmp_list.append(item)
-				break 
-
-	return tmp_list
-
-def help_replaceStringFormats(string, placeholders):
-	"""Replaces placeholders in string, with _FORMATS_BOTHWAYS and _FORMATS_OUTPUT
-	
-	string      : complete string 
-	placeholders: list of placeholders; what to replace -> converts to list to join
-
-	returns processed string 
-	"""
-
-	for placeholder in placeholders:
-		tmp = ""
-		# get the list name
-		the_choosen_one = placeholder[3:len(placeholder) - 3] 
-
-		if the_choosen_one == "_FORMATS_OUTPUT":
-			the_list = _FORMATS_OUTPUT
-		else:
-			the_list = _FORMATS_BOTHWAYS
-
-		is_synom = False
-		
-		for item in the_list:
-
-			if the_choosen_one == "_FORMATS_OUTPUT":
-				is_synom = True if item in ["doc", "opendoc", "slide"] else False 
-			else:
-				if item.startswith("md"):
-					continue 
-
-				is_synom = True if item == 'md' else False 
-
-			if is_synom:
-				tmp += " (or " + item + ")"
-			else:
-				tmp += ", " + item
-
-		tmp = tmp[2:] # delete fist ", "
-		string = string.replace(placeholder, tmp)
-
-	return string
-
-def msg(message, indent=2):
-	""" Because I always forget to include X spaces in the beginning 
-
-	:message     string message
-	:indent  amount of spaces
-	"""
-
-	print(" "*indent + message)
-
-def builtintpl(html, book_nav='', sidebar='', projindex='', pagetitle=''):
-	"""Custom/embebed template; using pandoc's default"""
-
-	#plain splitting
-
-	head_split = html.split("</head>")
-	head = head_split[0]
-	body = head_split[1]
-
-	head_final = head + '<style type="text/css">' + HTML_CSS +  "</style>" + "</head>"
-
-	bookbar = HTML_BOOKBAR.format(projectindex=projindex, pagetitle=pagetitle, 
-		           book_navigation=book_nav)
-
-	code_before = HTML_BEFORE.format(bookbar=bookbar, side_navigation=sidebar)
-	code_after = HTML_AFTER.format(bookbar=bookbar)
-
-	body_split = body.split('<body>')
-	body = body_split[1]
-
-	body_final = '<body>' + code_before + body 
-	body_split = body_final.split('</body>')
-	body = body_split[0]
-	body_final = body + code_after + '</body>' + body_split[1]
-
-	return head_final + body_final
-
-
-# ==============
-# == Pandy! ====
-# ==============
-
-class Pandy(object):
-	"""Handles the parsing and related """
-
-	def __init__(self, config_dict):
-		""" Preparation, config_dict must been checked and translated before """
-
-		self.settings        = config_dict
-		self.input           = config_dict['SOURCE']
-		self.output          = config_dict['OUTPUT_PATH']
-		self.format_from     = config_dict['FORMAT_FROM']
-		self.format_to       = config_dict['FORMAT_TO']
-		self.files           = []
-		self.command         = []
-		self.db_files        = dict()
-		self.references_list = dict()
-		self.references_all  = ""
-
-		exts = tuple()
-		if self.format_from == "html":
-			exts = (".html", ".htm")
-
-		self.files = files_list(self.input, only_exts=exts, exclude_files=[DEFAULT_INI_NAME])
-
-		# find index. file
-		i = 0
-		total = len(self.files)
-		while i < total:
-			if "index." in self.files[i]:
-				self.settings['FILE_INDEX'] = self.files[i]
-				del self.files[i]
-				break
-			i += 1
-
-		self.format_from, self.format_to = check_synonyms(self.format_from, self.format_to)
-
-		# make base pandoc command
-		self.command.append(self.settings['PANDOC'])
-		self.command += self._cmdFromToOut('f', self.format_from)
-		self.command.append('--standalone')  # complete html --standalone
-
-		# Exclude: do not treat right now or already done
-		exclude = ("FORMAT_TO", "FORMAT_FROM", "SOURCE", "OUTPUT_PATH", "MERGE",
-			"OUTPUT_FLAT", "SLIDES", "BOOK", "HTML_VER", "PANDOC", "FILE_INDEX")
-
-		# Add the options
-		for key, val in self.settings.items():
-			if key in exclude:
-				continue
-			self.command += translate_argsPandoc(key, val)
-
-		# and run!
-		self.run()
-
-	def _cmdFromToOut(self, way, markup, outputpath=None):
-		""" Create from/to/output (way param) command. returns the command (list)
-		way is a char string: f, t, o 
-		"""
-
-		makeme = ["-" + way]
-
-		if way in ['f', 't']:
-			if markup == 'markdown':
-				extensions = ""
-				for tmp in self.settings['EXTENSIONS_EXTRA']:
-					if tmp.startswith("-"):
-						extensions += tmp
-					else:
-						if not extensions:
-							extensions += tmp
-						else:
-							extensions += "+" + tmp
-				makeme += ["markdown+" + extensions]
-
-			elif markup == "slides":
-				makeme.append(self.settings['SLIDES'])
-
-			elif markup == 'html' and way == 't':
-				makeme.append(self.settings['HTML_VER'])
-			else:
-				makeme.append(markup)
-		
-		else:
-			# complete extension
-			if markup not in ['html', 'slides', 'markdown']:
-				ext = markup
-			else:
-				if markup == "markdown":
-					ext = "md"
-				else:
-					ext = "html"
-
-			complete_path = outputpath + "." + ext
-
-			makeme.append(complete_path)
-
-			path_mkdir(path_get(complete_path))
-
-		return makeme
-
-	def run(self):
-		"""Start the program !"""
-
-		merge = self.settings['MERGE']
-		book  = self.settings['BOOK']
-
-		# File or files in folder / list
-		if not merge and not book:
-			msg("Parsing files individually ... \n")
-			self._parseIndividually()
-
-		if merge:
-			msg("Parsing files and merging ... \n")
-			self._parseMerge()
-
-		if book:
-			if "html" not in self.format_to:
-				msg("Book only works for HTML")
-				exit()
-
-			if len(self.format_to) > 1 and "html" in self.format_to:
-				answer = msg_cli_yesno("  Only HTML is being converted.")
-				if not answer:
-					exit()
-
-			if len(self.files) < 1:
-				msg("Feed me more files to make something pretty :) ")
-				exit()
-
-			# check if there is an output path, if not use
-			# current working ONLY if source is not current working directory
-			if not self.output:
-				if not self.input == os.getcwd():
-					self.output = os.getcwd()
-				else:
-					msg("How can I put this... You haven't specified an output directory and the source is the \n current running directory.")
-					msg("Sorry, this is out of my league; check and run again")
-					exit()
-
-			if not self.format_from == 'markdown':
-				msg("Not using markdown; no goodies for you.") 
-
-			msg("Parsing files and making book ... \n")
-			self._parseBook()
-
-	def _parseIndividually(self):
-		"""Parses file individually """
-
-		for filey in self.files:
-			newcommand = list(self.command)
-			path       = self._getOutputPath(filey)
-			msg("Converting: " + path_getFilename(filey))
-
-			for ext in self.format_to:
-
-				cmd_to  = self._cmdFromToOut('t', ext)
-				cmd_out = self._cmdFromToOut('o', ext, path) 
-				newcommand += cmd_to + cmd_out
-
-				self._processOneFile(filey, newcommand, ext)
-
-	def _parseMerge(self):
-		""" pandoc already has a merge command when specified multiple files. 
-		Special treatment for markdown input to html output"""
-
-		if not self.output:
-			self.output = os.getcwd()
-
-		name = path_lastDir(self.input)
-
-		meta_name        = "--metadata=title:" + name
-		
-		for ext in self.format_to:
-			command_base = list(self.command)
-
-			command_base += self._cmdFromToOut('t', ext)
-			command_base += self._cmdFromToOut('o', ext, os.path.join(self.output, name)) 
-			command_base += [meta_name]
-
-			self._processOneFile(self.files, command_base, ext)
-
-	def _processOneFile(self, filey, cmd, ext_to):
-		"""Process one file separatelly (for merge and individually)
-		:filey     one file or file list 
-		:cmd       command starting point 
-		:ext_to    current extension in format to
-		"""
-
-		this_cmd = list(cmd)
-
-		if not ext_to == 'html' or (ext_to == 'html' and not self.format_from == 'markdown'):
-			if isinstance(filey, list):
-				this_cmd += filey
-			else:
-				this_cmd += [filey] 
-
-			run_subprocess(this_cmd)
-		else:
-			cmd_special = list(this_cmd)
-			#merge 
-			if isinstance(filey, list):
-				# join  all texts
-				all_texts = list()
-				for this_file in filey:
-					with cmd_open_write(this_file, 'r') as tmp:
-						all_texts += tmp.readlines()
-			# individual
-			else:
-				with cmd_open_write(filey, 'r') as tmp:
-					all_texts = tmp.readlines()
-
-			all_texts, toc = if_special_elements(all_texts, self.settings['TOC_TAG'])
-			if toc:
-				cmd_special.append('--toc')
-
-			all_texts = "".join(all_texts)
-			run_subprocess(cmd_special, True, all_texts)		
-
-	def _parseBook(self):
-		"""Make a book with navigation between files """
-
-		if "--toc" in self.command:
-			self.command.remove("--toc")
-
-		index_file = "noindex."
-		# if we have a navigation file, have that as the file order (only markdown)
-		if self.settings['FILE_INDEX'] and os.path.exists(self.settings['FILE_INDEX']) and self.format_from == 'markdown':
-			index_file = self.settings['FILE_INDEX']
-
-		self.settings['FILE_INDEX'] = index_file
-
-		msg("Scanning files, hold on...")
-		self._dbInit()
-
-		index_title = self.db_files['index']['title']
-		self.command.append('--variable=project-title:' + index_title)
-
-		if self.settings['TEMPLATE_PANDY']:
-			#just in case
-			for index in range(len(self.command)):
-				if self.command[index].startswith("--template"):
-					del self.command[index]
-					break 
-
-		# process files 
-		totalFiles = len(self.files)
-		for i in range(0, totalFiles):
-
-			if 'index.' in self.db_files[self.files[i]]['path_input']:
-				continue
-
-			current = self.db_files[self.files[i]]
-			msg("Processing: " + path_getFilename(current['path_input']))
-			current['text'] = self._parseBody(current['text'])
-
-			prev = self.db_files[self.files[i - 1]]
-			if 'index.' in prev['path_input'] or i == 0:
-				prev = dict()
-				prev['real_output'] = ""
-				prev['title']       = ""
-
-			if (i + 1) < totalFiles:
-				nextt = self.db_files[self.files[i + 1]]
-			else: 
-				nextt = dict() 
-				nextt['real_output'] = ""
-				nextt['title']       = ""		
-
-			newcommand = list(self.command)
-			path_mkdir(path_get(current['real_output']))
-
-			proj_index = '<a href="' + current['index_url'] +'">' +  index_title + "</a>"
-			newcommand.append('--variable=project-index:' + proj_index)
-
-			book_navigation    = self._bookNavigation(current, prev, nextt)
-			sidebar_navigation = self.makeNavigationLinks(href_active=current['output'])
-
-			if self.settings['NAV_SIDEBAR']:
-				newcommand.append('--variable=side_navigation:' + sidebar_navigation)
-
-			if self.settings['USE_NAV']:
-				newcommand.append('--variable=book_navigation:' + book_navigation)
-
-			self.finallySave(newcommand, current, book_nav=book_navigation, sidebar=sidebar_navigation, 
-				            projindex=proj_index, pagetitle=current['title'])
-
-		msg("Processing: index")
-
-		index_cmd = list(self.command)
-
-		if "--toc" in index_cmd:
-			index_cmd.remove("--toc")
-
-		index_cmd.append('--metadata=title:' + index_title)
-
-		self.finallySave(index_cmd, self.db_files['index'], projindex=self.db_files['index']['title'])
-
-	def finallySave(self, command, current_file, **kwargs):
-		""" (book) Save according to template option 
-
-		:command       current state of command 
-		:current file  current file properties/dict 
-		:**kwargs      key=value for builtintpl (book_nav, sidebar, projindex, pagetitle)
-		"""
-
-		local_cmd = list(command)
-
-		if not self.settings['TEMPLATE_PANDY']:
-			local_cmd += ['-o', current_file['real_output']]
-			run_subprocess(local_cmd, True, current_file['text'])
-		else: 
-			trying = run_subprocess(local_cmd, True, current_file['text'])
-			this_text = builtintpl(str(trying, encoding='utf-8'), **kwargs)
-
-			save(current_file['real_output'], this_text)			
-
-	def _getOutputPath(self, filepath, strip_root=False):
-		"""Get output path"""
-
-		cooking = ""
-		
-		if not self.output:
-			return path_delExtension(filepath)
-
-		if self.settings['OUTPUT_FLAT'] or (not self.settings['OUTPUT_FLAT'] and filepath == self.input):
-			cooking = path_delExtension(path_getFilename(filepath))
-		else:
-			cooking = path_delExtension(filepath)[len(self.input) + 1:]
-
-		if strip_root:
-			return cooking
-
-		return os.path.join(self.output, cooking)
-
-	def _bookNavigation(self, prop_current, prop_prev, prop_next):
-		""" Makes the navigation links """
-
-		navPre   = ""
-		navNext  = ""
-		navIndex = ""
-
-		use_titles = self.settings['NAV_TITLE']
-		link_tpl = '<li><a href="{ref}">{title}</a></li>'
-
-		navIndex = link_tpl.format(ref=prop_current['index_url'], title="index")
-
-		if prop_prev['real_output']:
-			prev_path = path_relative_to(prop_prev['real_output'], prop_current['real_output'])
-
-			navLink = prop_prev['title'] if use_titles else 'previous'	
-			navPre = link_tpl.format(ref=prev_path, title="&lt; " + navLink)
-
-		if prop_next['real_output']:
-			next_path = path_relative_to(prop_next['real_output'], prop_current['real_output'])
-
-			navLink = prop_next['title'] if use_titles else 'next'
-			navNext = link_tpl.format(ref=next_path, title=navLink + " &gt;")
-
-		return '<ul class="booknav">' + navPre + navIndex + navNext + '</ul>'
-
-	def _dbInit(self):
-		"""Init dbfiles with properties """
-
-		self.db_files['index'] = {
-			'title': "Index", 'path_input' :self.settings['FILE_INDEX'],
-			'real_output' : os.path.join(self.output, "index.html"),
-		     }
-
-		ref_tpl = "[{thefile}]: {future_html}"
-
-		for the_savior in self.files:
-
-			props = self._fileMetadata(the_savior)
-			self.db_files[the_savior] = props 
-
-			# create references, with and without extension and prepare string 
-			# only for markdown, but memory is inexpensive
-			tmp_output       = self.db_files[the_savior]['output']
-			tmp_file         = path_getFilename(the_savior)
-			tmp_file_extless = path_delExtension(tmp_file)
-			key_name         = tmp_file_extless + "|" + tmp_file
-			tmp = ""
-
-			self.references_list[key_name] = dict()
-			self.references_list[key_name]['output'] = tmp_output
-			self.references_list[key_name]['title']  = self.db_files[the_savior]['title']
-
-			tmp =  "\n\n" + ref_tpl.format(thefile=tmp_file, future_html=tmp_output)
-			tmp += "\n\n" + ref_tpl.format(thefile=tmp_file_extless, future_html=tmp_output)
-			self.references_all += tmp
-			
-		if os.path.exists(self.settings['FILE_INDEX']):
-			props = self._fileMetadata(self.settings['FILE_INDEX'])
-			self.db_files['index'].update(props)
-			self._fileOrderByIndex()
-			self.db_files['index']['text'] = self._parseBody(self.db_files['index']['text'])
-		else:
-			self.db_files['index']['text'] = self.makeNavigationLinks(isIndex=True)
-
-
-	def _fileOrderByIndex(self):
-		"""Order list of files from custom index"""
-
-		index_text = self.db_files['index']['text']
-
-		extensions = "|".join(ACCEPTED_MD_EXTENSIONS)
-
-		# gather internal and wikilinks (returned sub list items are different in position)
-		links_internal = extractMdLinks(index_text, extension=extensions, style='inline') 
-		links_wiki     = extractMdLinks(index_text, extension=extensions, style='wiki') 
-		
-		# join both list, getting only filename
-		tmp_links = list()
-
-		for wiki in links_wiki:
-			tmp_links.append(wiki[0])
-
-		for internal in links_internal:
-			tmp_links.append(internal[1])
-
-		# order, delete duplicates and overwrite original listing
-		self.files = orderListFromList(self.files, tmp_links)
-
-		tmp = list()
-		[tmp.append(h) for h in self.files if h not in tmp]
-
-		self.files = tmp		
-
-	def _fileMetadata(self, filepath):
-		"""for book. Get file properties: output path, input path, md title """
-
-		properties = {'real_output' : '', 'path_input' : '', 'toc':'', 
-		             'title' : '', 'text': '', 'index_url': ''}
-
-		properties['path_input']  = filepath
-		properties['real_output'] = self._getOutputPath(filepath) + ".html"
-		properties['output']      = self._getOutputPath(filepath, strip_root=True) + ".html"
-		properties['title']       = properties['output']
-		properties['index_url']   = path_relative_to(
-				            os.path.join(self.output, 'index.html'), properties['real_output'])
-
-		# Magic begins! extract TOC
-		cmd = list() 
-		cmd.append(self.settings['PANDOC'])
-		cmd.append('--toc')
-		cmd.append('--standalone')
-
-		with cmd_open_write(filepath, 'r') as tmp:
-			cmd_text = tmp.readlines()
-
-		# save for later
-		properties['text'] = cmd_text
-
-		if self.format_from == 'markdown':
-			tmp = findTitleMd(text_lines=cmd_text)
-			if tmp:
-				properties['title'] = tmp
-
-		cmd_text = "".join(cmd_text)
-		minimum = run_subprocess(cmd, True, cmd_text)
-		minimum = str(minimum, encoding='utf8')
-
-		#remove new lines to not break pandoc
-		minimum = minimum.splitlines()
-		minimum = "".join(minimum)
-		
-		properties['toc'] = getTOC(minimum) 
-		
-		return properties
-
-	def _parseBody(self, text_lines):
-		"""Parse properly the text """
-
-		cmd_text = text_lines
-
-		if not self.format_from == 'markdown':
-			cmd_text = "".join(cmd_text)
-		else:
-			cmd_text, _ = if_special_elements(cmd_text, self.settings['TOC_TAG'])
-			cmd_text, _ = parse_wikilinks(cmd_text, this_references=self.references_list)
-			cmd_text = "".join(cmd_text)
-			cmd_text += "\n\n" + self.references_all
-
-		return cmd_text
-
-	def makeNavigationLinks(self, href_active=None, isIndex=False):
-		"""make the whole book navigation: 
-
-		:href_selected    item to apply active class and insert toc 
-		"""
-
-		final = ""
-		anchor_tpl = '<a href="{href}">{title}</a>'
-
-		for i in range(0, len(self.files)):
-			current = self.db_files[self.files[i]]
-
-			if current == "index":
-				continue			
-			
-			title = current['title']
-			href  = current['output']
-			
-			info_active = ""
-			info_toc    = ""
-
-			if not isIndex:
-				real_href = path_relative_to(href, href_active)
-
-				if href == href_active:
-					info_active = " class='active'"
-					info_toc = current['toc']
-			else:
-				real_href = href
-				info_toc = current['toc'].replace('<a href="#', '<a href="' + real_href + "#")
-
-			anchor = anchor_tpl.format(href=real_href, title=title)
-			li = "<li{active}>" + anchor + "{toc}</li>"
-			li = li.format(active=info_active, toc=info_toc)
-			
-			final += li
-
-		return "<ul>" + final + "</ul>"
-
-
-
-
-if __name__ == '__main__':
-
-	if sys.version_info[0] < 3:
-		print(" Sorry, only python 3")
-		exit()
-
-	args = get_args()
-
-	print ("\n  ------------------ STARTING... ---------------------------\n ")
-	CONFIG = prepare_args(args)
-
-	# steady, ready, go!
-	Pandy(CONFIG)
-	
-	print ("\n  ------------------ DONE! :) ------------------------------")
-
-# History 
-
-# 2017-08-21:  version 2.0.3 (released)
-#              misc fixes/bugs
-#              fixes for css
-# 2014-02-18:  wikilinks fixes
-# 2014-02-16:  Version 2.0 (released)
-#              updated tests
-#              fix references creation: only add found
-#              Add built-in template
-#              book should work with any file format. On markdown you get goodies.
-#              args: proper list for format-to option
-#                    -> in settings, use space separated list
-#              .ini now parsed with configparser. Values in .ini must not have quotes
-#              fixes
-#              clean up
-#  
-# 2014-02-15:  complete ref list added
-#              wikilinks: use a ref "database" to search (instead of files)
-#              fixes
-#  
-# 2014-02-14:  if found, use beautifulsoup
-#              new syntax for wikilinks [:file][title]
-#              fixes for merging
-#              Change whole navigation handling
-#              fix index creation (toc) when subfolders
-#              fix sidebar navigation when subfolders
-#              fix wikilinks (reference)
-#              find title in md and not in html
-#              fixes
-#              clean up
-# 
-# 2014-02-13:  source also accept a .ini (no force source and use only from config)
-#              option to exclude toc from sidebar navigation
-#              auto discover index
-#              Navigations in own pandoc variables
-#              check duplicates from custom index (while adding them to process)
-#              if custom index has title, use it as project title
-#              new wiki links: like md reference links but inverted -> [file][title]
-#              no required: format to/from (so can use .ini)
-#              book only for markdown
-#              list all titles (and toc) in index
-#              New way for handling files in book
-#              chg db_files format
-#              Remove toc for index
-#              fixes
-#  
-# 2014-02-12:  rewriting. fixes
-#              order files according to custom index
-#              navigation: pages titles in sidebar, next-prev
-#              sidebar -> highlight active
-#              nav_pre according to index
-#              read .ini automatically in folder where runs/source
-#              remove some methods/cleanup
-#              args take precedence over ini, which take precedence over default
-#              wikilinks without file| prefix. Must use markdown extension
-#              wikilinks in any file (not only index) (book)
-#  
-# 2014-02-11: ini fixes
-#             option to hide navigation in book
-#             modify command options
-#             
-# 2014-02-11: version 1.9 (released)
-#             only python 3
-#             fixes for book
-# 
-# 2014-01-30: prints file being converted
-#             Filter extensions for converting, only html (hardcoded)
-# 
-# 2014-01-23: add titles in sidebar for navigation
-# 
-# 2014-01-21: version 1.8.1 (released)
-#             new syntax for admonition
-# 
-# 2013-12-10: version 1.8 (released)
-#             code refactoring
-#             Less call to globals/obvious params
-#             wikiLinks: if md link has no title and it's an existing file, use the filename as title 
-#             Book: warn if no output path (defaults to current dir) and source dir is the running one
-#             minor fixes
-#             remove object creation to get file properties -> now dict
-#             code refactoring, now using a class
-#             config dict takes precedence over args
-#
-# 2013-12-09: less calls to globals
-#             changes to args
-#             + processing messages
-#             no more tmp files
-#             + more tests
-#             modified test findH1
-#             change findH1 method
-#             Fix merging
-#             merge (HTML): now can parse metadata block and have toc for full document
-#             Book: include toc ONLY on selected file
-#             book: fix having title twice in file when declared with meta-block
-#             fix titles in book: add them, if not found add the filename (no ext)
-#
-# 2013-12-08: fixing nasty bugs
-#             Fix finding H1s
-#             code fixing / rewriting, less call to globals
-#             + config file support (ini without sections)
-#
-# 2013-12-06: Clean up code
-#             default config in dictionary
-#             minor fix for admonitions
-#             add simple tests / debug
-#             Finish admonition parsing
-#
-# 2013-12-05: version 1.5 (released)
-#             rewritten and to include cool stuff
-#             + admonition parsing
-#             + Abbreviations parsing markdown -> html
-#             + warning when book also have other output formatting & html
-#             + warning custom index with wiki links only for markdown
-#             + more formats for input and output
-#             fix: formats_to: no duplicates
-#             fix: --nav only for book
-#             fix: add html5 output default, can change to 'html'
-#             fix: when merging: add <title>
-#
-# 2013-11-10: Added: merge files in directory -> end up with one output
-#
-# 2013-07-25: CHG data dir path
-#
-# 2013-07-21: version 1.0
-#             Add folder (recursive) support
-#             Add pandy script: "wrapper" for Pandoc.
+#! python3
+# -*- coding: utf-8 -*-
+
+# "Wrapper" for Pandoc (python 3): pandy [file/folder] [options]
+# tested for pandoc 1.19.2.1
+
+"""
+	Basically takes a file/folder, input the markup to convert from, the output markup and run it through pandoc.
+
+	More explained:
+	From a file/folder/.list/.ini, input the "from" markup and the output format, which can be a list separated with spaces. Formats are stripped down to the most common ones:
+
+		from: docbook, html, json, latex, markdown, markdown_github, markdown_mmd, markdown_phpextra, markdown_strict, mediawiki, mw, opml, rst, textile
+		output: all the above +  asciidoc, beamer, docx (or doc), epub, epub3, fb2, html5, odt, opendocument (or opendoc), pdf, plain, rtf, slides (or slide)
+
+		 All "markdown"s can be entered as "md". So: markdown -> md; markdown_github -> md_github; etc
+		 
+		 And these markdown extensions are automatically added: 'link_attributes', 'hard_line_breaks'
+
+	You can input some options of pandoc but with different names:
+
+	--from , -f           Convert from this format
+	--to, -t              Convert to this format (can be a space separated list)
+	--output, -o          Output folder
+	--self                self contained file
+	--header FILE         Header file. Included as it is (raw, verbatim)
+	--footer FILE         Footer file. Included as it is (raw, verbatim)
+	--index FILE          Custom index file for book. Can use wiki links
+	--html4               Use html4 output instead of html5
+	--merge, -m           Merge files.
+	--volume-size KB      (merge) Split in volumes of at most KB of sources, converted in parallel, with a front page linking them
+	--volume-files N      (merge) Split in volumes of at most N files
+	--slides              Slides format.
+	--bib FILE            Use bibliography file
+	--css FILE            External CSS
+	--highlight           Highlight style. 
+	--highlight-no        No highlight
+	--tpl FILE            Template file.
+	--toc                 include TOC
+	--depth               TOC depth.
+	--hide                e-mail obfuscation
+	--sections            Wrap sections in <sections>, attach identifiers instead of titles
+	--pandoc PANDOC       Pandoc path. Default: pandoc
+	--data-dir FOLDER     Data directory
+	
+	If you merge and use output, you must only specify the folder. It takes the name from the parent folder/source 
+
+	As well as some of my own:
+	
+	--flat                Don't keep folder structure
+	--book, -b            Make a book with navigation (next/prev) and index
+	--no-nav, -nn         (For book) disable book navigation
+	--nav-title, -nt      (For book) use titles in book navigation
+	--no-side, -ns        (For book) Disable sidebar navigation
+	--no-side-toc, -nst   (For book) disable TOC in sidebar (keep in doc)
+	--side-shared         (For book) sidebar in one shared pandy-nav.HASH.js (rendered by the browser), not in every page
+	--search              (For book) search box in the sidebar, with a prebuilt index (in search/, loaded by parts)
+	--index-split N       (For book, without custom index) the generated index split by folders: one index page for each (linked from the index of its parent), in pages of N files at most. The sidebar comes from one shared .js then (as --side-shared)
+	--chunked             (For book, markdown) all the pages rendered by one pandoc (chunkedhtml, pandoc >= 3) instead of one each, with pandy's template
+	--config FILE         Use a configuration file (option=key values)
+	--tpl-pandy           (For book) Pandy's embebed template: simple and not so ugly
+	--tpl-pandy-css       (For book) With --tpl-pandy: CSS in a shared pandy.HASH.css instead of inside every page
+	--metrics FILE        Write Prometheus metrics (node_exporter textfile) at the end of the run
+	--jobs N, -j N        Conversions running at the same time (longest ones first)
+	--lane-heavy N        Heavy formats (epub, docx, odt, fb2) converting at the same time, so quick ones don't wait. Default: half of --jobs
+	--lane-latex N        PDF (LaTeX) conversions at the same time. Default: 1
+	--lane-latex-memory MB  Memory for all the PDF conversions together: fewer at the same time and each one limited to its share
+	--keep-going, -k      Don't stop at the first failure: convert the rest, then a summary (with pandoc's errors) and exit with error
+	--retry-failed        Only convert the files that failed (or were skipped) in the last run
+	--timeout SECONDS     Kill pandoc if a conversion takes longer (the file is reported)
+	--limit-memory MB     Memory (address space) for each pandoc. Not on Windows
+	--limit-cpu SECONDS   CPU time for each pandoc. Not on Windows
+	--cache FOLDER        Keep pandoc's outputs in FOLDER by a hash of the input, options, pandoc version and the files they use (template, CSS, images...). Shared by projects, branches and runs. Default: $PANDY_CACHE_DIR
+	--cache-size MB       Size of the cache, the least recently used go first. Default: 1024
+	--fast-md             (Individually, markdown to HTML) simple files (paragraphs, headings, one level lists, emphasis, code, links) rendered by pandy in the page pandoc makes, without starting pandoc for each. Anything else still goes to pandoc
+	--dry-run             Only print the build plan and its estimated critical path
+	--projects INI [INI ...]  Build many projects (.ini files, or folders with them) at once, sharing the --jobs workers (and lanes, from the command line). Lines start with the project: [name]. Metrics: one file, a source label per project
+	--check               Don't convert, only report broken links, duplicated titles, files not in the custom index (book) and files with the same output. No pandoc, exits with error if there are problems. For pre-commit hooks
+	--shard i/N           Convert only slice i of N (by a stable hash of the paths). Writes a manifest in the output. Book: only the TOCs of its pages (and index) go through pandoc
+	--shard-merge N       Check that the manifests and outputs of the N shards (copied to one output) are complete
+
+	If you use markdown and convert to HTML, there're some goodies for you. You can have abbreviations, as PHP Markdown Extra:
+
+	Some text with an ABBR and a REF. Ignore REFERENCE and ref.
+	*[ABBR]: Abbreviation
+	*[REF]: Abbreviation Reference
+
+	admonitions with my own markup 
+
+	[class/type:optional title]
+	  * markdown
+	  * super
+	  * content
+
+    The "class/type" would be something like "information", "danger", "tip", "hint", "hungry", "duck", "yay" ...
+	  
+	You can also include a tag for toc ([TOC]) to have that file with a toc instead of remembering to enter --toc. (It just adds it automatically after searching the file, no magic here)
+	
+	Book converts all files to HTML and adds navigation links. Useful to make simple documentation. 
+	
+	If you use markdown you have more goodies: create your own index (as index.md) and have "wikiLinks". Wikilinks can be in any file as [:filename][optional title] where filename can have extension or not, and if you don't include a title, it finds the file title. The order of the files in the index affect the sidebar navigation. With this you can create cooler documentation or use it as a poor's man/simple wiki.
+
+	If you wish to create your own template for book, pandy adds some variables for you to include: 
+
+	  * ``side_navigation`` the sidebar navigation 
+	  * ``book_navigation`` book navigation (previous/index/next)
+	  * ``project-index`` link to index. Useful if you have subfolders 
+	  * ``project-title`` Index title. Useful if you create your own index with a title
+	
+	If you don't like setting the options in the CLI, or having a script, you can create your configuration in a key=value file (like ini). Example: myconfiguration.ini contains:
+
+	PANDOC_DATA_DIR = C:\Program Files\Pandoc
+	TEMPLATE = github.html
+	HIGHLIGHT = zenburn
+
+	Specify the configuration file with --config (the extension doesn't matter, and INI headers are ignored. Don't worry) or just have a settings.ini where you run pandy.
+
+"""
+
+import sys
+import argparse
+import subprocess
+import os
+import codecs
+import re
+import time
+import hashlib
+import json
+import threading
+import functools
+import concurrent.futures
+import heapq
+import sqlite3
+
+drinkSoup = False
+try:
+	from bs4 import BeautifulSoup
+	drinkSoup = True 
+except ImportError:
+	# Dale, hacemela mas dificil
+	pass
+
+limitMe = False
+try:
+	import resource
+	limitMe = True
+except ImportError:
+	# windows: no rusage/rlimits
+	pass
+
+
+# ==============================
+# ==== info & pandoc config ====
+# ==============================
+
+__version__ = "2.0.3"
+_MY_USAGE = ''' %(prog)s [source] [options] '''
+# must replace the lists inside. This is just to have a bit of order.
+_MY_DESCRIPTION = '''
+ [format_from] can be 
+ {{ _FORMATS_BOTHWAYS }}
+
+ All "markdown"s can be entered as "md". So: markdown -> md; markdown_github -> md_github; etc 
+
+   
+ [format_to] include above formats plus: 
+ {{ _FORMATS_OUTPUT }}
+
+ Choose the slide format with --slides. 
+'''
+
+# pandoc's formats. Filtered to remove some that will never be used (by me)
+# Includes some synonyms
+_FORMATS_BOTHWAYS = [
+	'docbook', 'html', 'json', 'latex',
+	'markdown', "md",
+	'markdown_github', "md_github",
+	'markdown_mmd', "md_mmd",
+	'markdown_phpextra', "md_phpextra",
+	'markdown_strict', "md_strict",
+	'mediawiki', "mw", 'opml', 'rst', 'textile',
+	]
+_FORMATS_OUTPUT   = [
+	'odt', 'opendocument', 'opendoc', 'docx', 'doc',
+	'asciidoc', 'beamer', 'plain', 'rtf', 
+	'epub', 'epub3', 'fb2', 'html5',
+	'pdf', #[*for pdf output, use latex or beamer and -o FILENAME.pdf] 
+	"slides", "slide", #options slides in another list
+	"dokuwiki"
+	]
+
+_HIGHLIGHT_OPTIONS = ('pygments', 'kate', 'monochrome', 'espresso', 'zenburn',
+                     'haddock', 'tango')
+_SLIDES_OPTIONS    = ('dzslides', 'slidy', 'reveal', 'slideous', 's5')
+
+_COMMANDS_COMPLETE = {
+	'HIGHLIGHT_NO' : "--no-highlight",
+	'TOC'          : "--toc",
+	'SELF_CONTAINED' : "--self-contained",
+	'EMAIL_HIDE'   : "--email-obfuscation=references",
+	'CSS'          : "--css=",
+	'TOC_DEPTH'    : "--toc-depth=" ,
+	'SECTIONS'     : "--section-divs",
+	'BIBLIOGRAPHY' : "--bibliography=",
+	'TEMPLATE'     : "--template=",
+	'PANDOC_DATA_DIR' : "--data-dir=",
+	'HIGHLIGHT'    : "--highlight-style=",
+	'FILE_HEADER'  : "--include-before-body=",
+	'FILE_FOOTER'  : "--include-after-body=",
+	'CSL'          : "--csl=",
+	'RAW_HTML'     : "--parse-raw"
+
+	}
+
+EXTENSIONS_EXTRA  = ('link_attributes', 'hard_line_breaks', 'raw_html', '-markdown_in_html_blocks')
+
+# =======================
+# ==== configuration ====
+# =======================
+
+DEFAULT_INI_NAME = "settings.ini"
+
+_DEFAULT_CONFIG = {
+	'PANDOC': 'pandoc', # pandoc path
+	'PANDOC_DATA_DIR': "", # empty for default
+	'TEMPLATE': '',
+	'HIGHLIGHT': 'pygments',
+	'HIGHLIGHT_NO': False,
+	'SLIDES': 'dzslides', 
+	'TEMPLATE_PANDY': False,
+	'TEMPLATE_PANDY_CSS': False, # pandy's template: CSS in a shared file (not in every page)
+	
+	'SOURCE': os.getcwd(),
+	'OUTPUT_PATH': os.getcwd(),
+	'OUTPUT_FLAT': False,
+	'CONFIG_FILE' : DEFAULT_INI_NAME,
+	
+	'FORMAT_FROM': 'md',
+	'FORMAT_TO': ['html'],
+	
+	'TOC': False,
+	'TOC_DEPTH': 3,
+	'SECTIONS': False,
+	'SELF_CONTAINED': False,
+	'CSS_EXTERNAL': '',
+	'FILE_FOOTER': '',
+	'FILE_HEADER': '',
+	
+	'MERGE': False,
+	'MERGE_VOLUME_SIZE': 0,  #merge, split in volumes of at most this KB of sources. 0: one volume
+	'MERGE_VOLUME_FILES': 0, #merge, split in volumes of at most this amount of files. 0: one volume
+	'BOOK': False,
+	'FILE_INDEX': '',
+	'USE_NAV': True, 
+	'NAV_TITLE': False,  #book, use title navigation
+	'NAV_SIDEBAR': True,  #book, sidebar with titles
+	'NAV_SIDEBAR_TOC': True, #book, have current toc in sidebar
+	'NAV_SIDEBAR_SHARED': False, #book, sidebar data in one shared .js, rendered by the browser
+	'SEARCH_INDEX': False, #book, client side search (prebuilt index in search/)
+	'BOOK_CHUNKED': False, #book, all pages rendered by one pandoc (chunkedhtml, pandoc >= 3)
+	'INDEX_SPLIT': 0,  #book without custom index: one index per folder, with at most this files per page. 0: one index
+
+	'EMAIL_HIDE': False, # e-mail obfuscation (default none, true = references)
+	'BIBLIOGRAPHY': '',
+	'HTML_VER': 'html5', # Output html5 instead of html4 (html)
+	'TOC_TAG': '[TOC]',
+	'EXTENSIONS_EXTRA': EXTENSIONS_EXTRA, # markdown extensions always added
+
+	'METRICS_FILE': '', # prometheus textfile (node_exporter) written at the end of the run
+	'JOBS': 1,          # conversions running at the same time
+	'LANE_HEAVY': 0,    # heavy formats (FORMAT_LANES) at the same time. 0: half of JOBS
+	'LANE_LATEX': 1,    # pdf (LaTeX) conversions at the same time
+	'LANE_LATEX_MEMORY': 0, # MB for all the LaTeX conversions together. 0: no budget
+	'DRY_RUN': False,   # only print the build plan
+	'SHARD': '',        # "i/N": convert only the i-th of N slices (other machines do the rest)
+	'SHARD_MERGE': 0,   # N: check the manifests of the N shards, convert nothing
+	'CHECK': False,     # only check links, titles, index and outputs; no pandoc
+	'KEEP_GOING': False,   # a failure doesn't stop the rest (summary and error at the end)
+	'RETRY_FAILED': False, # only the files that failed last time (FAILED_NAME)
+	'TIMEOUT': 0,       # seconds for each pandoc; killed after. 0: no limit
+	'LIMIT_MEMORY': 0,  # MB of memory (address space) for each pandoc. 0: no limit
+	'LIMIT_CPU': 0,     # CPU seconds for each pandoc. 0: no limit
+	'CACHE_DIR': os.environ.get('PANDY_CACHE_DIR', ''), # outputs kept by content, shared by projects and runs (ConversionCache)
+	'CACHE_SIZE': 1024, # MB of the cache, least recently used out first. 0: no limit
+	'FAST_MD': False,   # individually, to html: simple markdown rendered by pandy (fastmd_render), not pandoc
+	}
+
+# for wiki links mostly
+ACCEPTED_MD_EXTENSIONS = ('md', 'txt', 'mdown', 'markdown')
+
+HTML_CSS = """
+    *           { margin: 0; padding: 0; }
+    html, body  { color: black; }
+
+    body {
+        padding: 0px 25px; 
+        margin: -1px auto;
+        font: 14px "Noto Sans", "Segoe UI", "Open Sans", "Dejavu Sans", arial, sans-serif; 
+        line-height: 1.8em;
+        color: #3A3A3A;
+        background-color: #f2f2f2;
+    }
+
+    .jp, [lang=jp] {font-family: "Noto Sans CJK JP", "DejaVu Sans", "Open Sans", sans-serif; }
+
+    p { margin: 1em 0; }
+
+    a {text-decoration: none; border-bottom: 1px solid; color: #4183c4; }
+    a:hover, a:active { color: #75A837; }
+
+    blockquote {
+        margin: 14px 0; padding: 0.7em 11px;
+        color: #555;
+        font-style: italic;
+        border-left: 10px solid #838383;
+    }
+
+    img {
+        display:          block;
+        background-color: #F3F3F2;
+        border:           1px solid #D9D9D7;
+        margin:           0px auto;   padding: 5px;
+    }
+
+    ins { color:#008000; }
+    del { color:#ACACAC; }
+
+    hr { border: 0; height: 1px; background: #333; }
+
+    sup, sub, a.footnote-ref, span.citation {
+        height:         0;
+        line-height:    1;
+        vertical-align: super;
+        position:       relative;
+    }
+	 
+    sub            {vertical-align: sub; top: -1px; }
+    a.footnote-ref { font-size: 1em; }
+    span.citation { font-size: 0.74em; }
+
+    abbr { border-bottom: 1px dotted }
+
+    h1,h2,h3,h4,h5,h6 { margin: 1.5em 0px 1em; padding: 4px 0; border-bottom: 1px solid #e0e0e0; }
+    h1 { font-size: 2em;}
+    h2 { font-size: 1.571em; }
+    h3 { font-size: 1.429em; }
+    h4 { font-size: 1.286em; }
+    h5 { font-size: 1.143em; color: #4d4d4d;}
+    h6 { font-size: 1em; color: #666; }
+    h1.title { margin:0 }
+
+    ul, ol  { margin: 21px 0 0px 30px; list-style-position: outside; }
+    li      { margin: 7px 0 }
+    ul      { list-style-type: disc; }
+    ol      { list-style-type: decimal-leading-zero; }
+
+    dl, dt, dd { margin: 0; }
+    dl { padding: 0px 1em 10px; }
+    dt { padding: 5px 0 5px; font-weight: bold; line-height: normal; }
+    dd { padding: 0 10px 20px 3em; }
+
+    /* based on 
+	 http://icant.co.uk/csstablegallery/tables/50.php (Blaugrana).   DEAD! 
+	 http://www.csslab.cl/csstablegallery/   previews are DEAD as well as some links 
+	 probably works: https://web.archive.org/web/20130829004021/http://icant.co.uk:80/csstablegallery/tables/50.php
+	 */
+    table { 
+        padding: 0; margin: 0 auto 2em auto;
+        border-spacing: 0; border-collapse: collapse;
+        min-width: 50%;
+        border: 1px solid;
+    }
+    th, caption {color: #444; font-weight: bold;text-align: center;}
+    td, th {padding: .6em .4em; vertical-align: top; border: 1px solid #779; }
+    th, tfoot td {border: 1px solid #361; background: #e0e5cf; }
+    tr { background: #cfe0e5 }
+    tr:nth-of-type(odd){background:#e5cfe0;}
+    tr:nth-of-type(odd) td, tr:nth-of-type(odd) th {border-color:#977;}
+
+    pre, code {
+        border:         1px solid #ccc;
+        font-size:      12px;    
+        background-color:#eee;
+    }
+
+    pre  { margin: 5px 0 0; padding: 6px 5px; white-space: pre; overflow: auto; }
+    code { font-family:    Consolas, "Liberation Mono", Courier, monospace; margin: 0 2px; padding: 2px 5px; /*white-space: nowrap;*/ }
+
+    pre code { border: none }
+
+    #TOC    { margin-top: 30px; background-color: #e5efdf; border: 1px solid #cedec4;}
+    #TOC a  { margin: 0 15px !important; }
+    #TOC ul {
+        margin: 1px 0 0 15px !important;    
+        padding: 0 0 0 1px !important;
+        display: block;
+        line-height: 20px;
+        list-style: none;
+    }
+    #TOC ul li  { border-left: 1px solid; position: relative; margin:0 !important; }
+    #TOC ul > #TOC li { padding-bottom: 10px !important;}
+    #TOC ul li:before {
+        content: '';
+        width: 14px;
+        position: absolute;
+        border-bottom: 1px solid;
+        left: 0px;
+        top: 10px;
+    }
+    #TOC ul li:last-child {border-left:none;}
+    #TOC ul li:last-child:before {border-left:1px solid; height: 10px; margin-top:-10px !important; }
+    #TOC ul li, #TOC ul li:before, #TOC ul li:last-child:before {border-color: #7A7A7A; }
+    .admonition p   { margin: 0.5em 1em 0.5em 1em; padding: 0;}
+    .admonition pre { margin: 0.4em 1em 0.4em 1em;}
+    .admonition ul, .admonition ol { margin: 0.1em 0.5em 0.5em 3em;   padding: 0;}
+
+    .admonition {
+        margin: 2em; padding: 0;
+        font-size:        0.9em;
+        border:           1px solid #c2c2c2;
+        background-color: #e9e9e9;
+    }
+
+    .admonition p.admonition-title {
+        margin:     0;
+        padding:    0.1em 0 0.1em 0.5em;
+        font-size:  1.1em;
+        font-weight: bold;
+        color:      #fff;
+        border-bottom: 1px solid #c2c2c2;
+        background-color: #999; 
+    }
+
+    .admonition.error, .admonition.caution, .admonition.danger
+    {border-color: #900000; background-color: #ffe9e9;}
+
+    .error p.admonition-title, .caution p.admonition-title, .danger p.admonition-title
+    {background-color: #b04040; border-color: #900000;}
+
+    .admonition.hint
+    {background-color: #ECFAE3;  border-color: #609060;}
+
+    .hint p.admonition-title
+    {background-color: #70A070; border-color: #609060;}
+
+    .admonition.note, .admonition.tip, .admonition.warning
+    {border-color:#e2ba54; background-color:#fcfce1;}
+
+    .note p.admonition-title, .tip p.admonition-title, .warning p.admonition-title
+    {background-color: #f1d170; border-color:#e2ba54;}
+
+    .admonition.info, .admonition.attention, .admonition.important
+    {background-color: #e8edfc; border-color: #94A7BF;}
+
+    .info p.admonition-title, .attention p.admonition-title, .important p.admonition-title
+    {background-color: #7088A0; border-color: #94A7BF;}
+
+    mark {background-color: #e7d600; padding: 0.2em;}
+    mark.second {background-color: #f08333;}
+
+    .bookbar {padding: 10px; border: 1px solid #ccc; border-width: 1px 0; overflow: auto}
+    .bookbar li {display: inline-block;}
+    .bookbar ul {margin: 0}
+    .breadcrumbs {float: left;}
+    .breadcrumbs li:after {content: "\\0BB \\020" /* » */; padding-left: 0.6em;}
+    .breadcrumbs li:last-child:after {content: ""}
+    .booknav {float:right;}
+    .booknav li {padding: 0 1.0em;}
+
+    #content {display: table-row;}
+
+    #sidebar {display: table-cell; width: 240px; font-size: small; background-color: #eeeeee;}
+    #sidebar ul ul {margin: 5px 0px 0px 5px;}
+    #sidebar ul ul li {margin-left: 10px;}
+    #sidebar ul {list-style: decimal;}
+    #sidebar ul ul {list-style: lower-alpha;}
+    #sidebar ul ul ul {list-style: lower-roman;}
+    #sidebar li.active > a {font-weight: bold}
+
+    #content-body {padding: 20px; font-size: 16px;}
+
+    #footer {padding: 10px; font-size: small; }
+"""
+
+HTML_BEFORE = """
+	<div id="wrapper">
+	{bookbar}
+
+	<div id="content">
+
+	<div id="sidebar">
+	{side_navigation}
+	</div>
+
+	<div id="content-body">
+"""
+
+HTML_BOOKBAR = """
+	<div class="bookbar">
+		<ul class="breadcrumbs">
+			<li>{projectindex}</li>
+			<li class="active">{pagetitle}</li>
+		</ul>
+
+		{book_navigation}
+	</div>
+"""
+
+HTML_AFTER = """
+	</div> <!-- contentbody -->
+	</div> <!-- content -->
+
+	{bookbar}
+
+	<div id="footer">
+	</div>
+
+	</div> <!-- wrapper -->
+"""
+
+
+# front page of a merge in volumes (see merge_frontPage)
+HTML_VOLUMES = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8" />
+<title>{title}</title>
+</head>
+<body>
+<h1>{title}</h1>
+<ul>
+{volumes}
+</ul>
+</body>
+</html>
+"""
+
+# chunked book (see chunks_source): every page after a marker heading, pandoc's 
+# output of each chunk split in CHUNK_PARTS, and the page made again
+CHUNK_MARKER = "pandy-page-{0}"
+CHUNK_FOUND  = re.compile(r'id="pandy-page-(\d+)"')
+CHUNK_PARTS  = ('head', 'before', 'body', 'after')
+CHUNK_SPLIT  = re.compile(r'<!--pandy-(?:before|body|after)-->')
+CHUNK_HEADING = re.compile(r'(<(?:section\b[^>]*?\bid="([^"]*)"[^>]*>\s*<h[1-6]|h[1-6]\b[^>]*?\bid="([^"]*)")[^>]*>)(.*?)(</h[1-6]>)', re.DOTALL)
+
+CHUNK_TEMPLATE = """$for(css)$<link rel="stylesheet" href="$css$" />
+$endfor$$if(highlighting-css)$<style type="text/css">
+$highlighting-css$
+</style>
+$endif$$for(header-includes)$$header-includes$
+$endfor$$if(math)$$math$
+$endif$<!--pandy-before-->$for(include-before)$$include-before$
+$endfor$<!--pandy-body-->$body$<!--pandy-after-->$for(include-after)$$include-after$
+$endfor$"""
+
+HTML_CHUNK_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8" />
+<meta name="generator" content="pandoc" />
+<title>{title}</title>
+{head}
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+HTML_CHUNK_TITLE = """<header id="title-block-header">
+<h1 class="title">{title}</h1>
+</header>
+"""
+
+# sidebar, rendered in the browser from a shared file (see navigation_js)
+HTML_NAV_SHARED = """<nav id="pandy-nav" data-root="{root}" data-active="{active}">""" \
+                  """<noscript><a href="{root}index.html">index</a></noscript></nav>""" \
+                  """<script src="{src}"></script>"""
+
+NAV_JS = """
+(function () {
+	var nav = document.getElementById("pandy-nav");
+	if (!nav) { return; }
+
+	var root   = nav.getAttribute("data-root") || "";
+	var active = nav.getAttribute("data-active");
+	var html   = "";
+
+	for (var i = 0; i < PANDY_NAV.length; i++) {
+		var item = PANDY_NAV[i], isActive = (item[0] === active);
+
+		html += "<li" + (isActive ? " class='active'" : "") + ">" +
+		        "<a href=\\"" + (isActive ? "" : root + item[0]) + "\\">" + item[1] + "</a>" +
+		        (isActive ? item[2] : "") + "</li>";
+	}
+
+	nav.innerHTML = "<ul>" + html + "</ul>";
+})();
+"""
+
+HTML_SEARCH = """<div id="pandy-search" data-root="{root}">""" \
+              """<input type="search" placeholder="search" /><ul></ul></div>""" \
+              """<script src="{root}search/pandy-search.js"></script>"""
+
+SEARCH_JS = """
+(function () {
+	var box = document.getElementById("pandy-search");
+	if (!box) { return; }
+
+	var root    = box.getAttribute("data-root") || "";
+	var input   = box.getElementsByTagName("input")[0];
+	var results = box.getElementsByTagName("ul")[0];
+	var loaded  = {};
+
+	function load(name, done) {
+		if (loaded.hasOwnProperty(name)) { return done(loaded[name]); }
+
+		var request = new XMLHttpRequest();
+		request.open("GET", root + "search/" + name);
+		request.onload = function () {
+			loaded[name] = (request.status === 200 || request.status === 0) ? JSON.parse(request.responseText) : {};
+			done(loaded[name]);
+		};
+		request.onerror = function () { loaded[name] = {}; done(loaded[name]); };
+		request.send();
+	}
+
+	function shard(word) { return word.charCodeAt(0).toString(16) + ".json"; }
+
+	function search(query) {
+		var words = query.toLowerCase().split(/[\\s.,;:!?'"()\\[\\]{}<>\\/\\\\|*#`~=+-]+/).filter(function (w) { return w; });
+		if (!words.length) { results.innerHTML = ""; return; }
+
+		load("docs.json", function (docs) {
+			var scores = null, pending = words.length;
+
+			words.forEach(function (word) {
+				load(shard(word), function (postings) {
+					var found = {};
+					for (var term in postings) {
+						if (term.indexOf(word) !== 0) { continue; }
+						var list = postings[term];
+						for (var i = 0; i < list.length; i += 2) {
+							found[list[i]] = (found[list[i]] || 0) + list[i + 1];
+						}
+					}
+
+					// all words must be there
+					if (scores === null) { scores = found; }
+					else {
+						for (var doc in scores) {
+							if (found.hasOwnProperty(doc)) { scores[doc] += found[doc]; } else { delete scores[doc]; }
+						}
+					}
+
+					if (--pending) { return; }
+
+					var ids = Object.keys(scores).sort(function (a, b) { return scores[b] - scores[a]; });
+					results.innerHTML = ids.slice(0, 20).map(function (id) {
+						return "<li><a href=\\"" + root + docs[id][0] + "\\">" + docs[id][1] + "</a></li>";
+					}).join("");
+				});
+			});
+		});
+	}
+
+	input.addEventListener("input", function () { search(input.value); });
+})();
+"""
+
+
+# =======================
+# == methods: system ====
+# =======================
+
+def path_mkdir(path):
+	""" make tree dirs from path """
+
+	try:
+		os.makedirs(path)
+	except OSError:
+		pass
+
+def path_get(thefile):
+	""" Get path from file """
+
+	return os.path.dirname(thefile)
+
+def path_getFilename(file_path):
+	""" Get filename from path"""
+
+	return os.path.basename(file_path)
+
+def path_delExtension(file_path):
+	""" Delete the extension from path """
+
+	path, _ = os.path.splitext(file_path)
+	return path
+
+def path_lastDir(path):
+	""" Parent folder name """
+
+	return os.path.split(path)[1]
+
+def path_relative_to(this_path, root, index=False):
+	"""Gets the relative path of this_path from root """
+
+	if index:
+		return os.path.relpath(this_path, root)
+		
+	# Delete first "folder" (..\)
+	return os.path.relpath(this_path, root)[3:]
+
+def save(path, text):
+	""" Saves file using it properties. Only if the content changed 
+	(keeps mtime for rsync/caches). Returns True if written
+	"""
+
+	return save_ifChanged(path, text.encode('utf-8-sig'))
+
+def save_ifChanged(path, data):
+	"""Write bytes to path, only if they differ from the current content. 
+	Returns True if written
+	"""
+
+	if os.path.isfile(path) and os.path.getsize(path) == len(data):
+		with open(path, 'rb') as current:
+			if current.read() == data:
+				return False
+
+	tmp_path = path_temporal(path)
+	with open(tmp_path, 'wb') as tmp:
+		tmp.write(data)
+
+	os.replace(tmp_path, path)
+	return True
+
+def path_temporal(path):
+	"""A free temporal path next to path, keeping its extension (pandoc 
+	guesses formats from it)
+	"""
+
+	folder, name = os.path.split(os.path.abspath(path))
+	_, ext = os.path.splitext(name)
+
+	while True:
+		tmp_path = os.path.join(folder, "." + name + "." + os.urandom(4).hex() + ".tmp" + ext)
+
+		# created here (not mkstemp) to keep the umask permissions
+		try:
+			with open(tmp_path, 'xb'):
+				return tmp_path
+		except FileExistsError:
+			continue
+
+def replace_ifChanged(tmp_path, path):
+	"""Move tmp_path over path if their content differs; if not, delete 
+	tmp_path (path keeps its mtime). Returns True if replaced
+	"""
+
+	import filecmp
+
+	if os.path.isfile(path) and filecmp.cmp(tmp_path, path, shallow=False):
+		os.remove(tmp_path)
+		return False
+
+	os.replace(tmp_path, path)
+	return True
+
+def files_get(path, only_exts=None, exclude_files=None):
+	""" Get a list of files in dir. Returns list 
+
+	:param:only_exts   tuple to include only selected extensions (mainly for html pages 
+		               saved locally (which has folders > images ) )
+	:param:exclude_files tuple to exclude files, mainly to exclude custom index 
+	""" 
+
+	theFiles = list()
+
+	if os.path.isfile(path):
+		if os.path.exists(path):
+			theFiles.append(path)
+	else:
+		for root, subFolders, files in os.walk(path):
+			for filename in files:
+				filePath = os.path.join(root, filename)
+
+				if os.path.exists(filePath):
+					if only_exts and filePath.endswith(only_exts):
+						theFiles.append(filePath)
+					else:
+						if exclude_files and filePath in exclude_files:
+							continue
+						theFiles.append(filePath)
+
+	return theFiles	
+
+def files_list(path, only_exts=None, exclude_files=None):
+	"""Gets the files from the .list (returns list). If not a .list, calls files_get"""
+
+	if path.endswith(".list"):
+		fileList = list()
+		cmd      = cmd_open_write(path, 'r')
+			
+		with cmd as listFiles:
+			for line in listFiles:
+				line = line.strip()
+
+				if os.path.exists(line):
+					fileList.append(line)
+		return fileList
+	
+	return files_get(path, only_exts, exclude_files)
+
+def cmd_open_write(path, mode):
+	""" Create the open/write command according to python version 
+	mode is: 'r' for read and 'w' for write
+	"""
+
+	return codecs.open(path, mode, encoding='utf-8-sig')
+
+def cmd_open_bytes(path):
+	"""The file as it is (bytes), see text_lines """
+
+	with open(path, 'rb') as tmp:
+		return tmp.read()
+
+def text_lines(data):
+	"""bytes to lines, as cmd_open_write(path, 'r').readlines() """
+
+	return codecs.decode(data, 'utf-8-sig').splitlines(True)
+
+def cmd_open_file(path):
+	""" Opens file and returns text """
+
+	with cmd_open_write(path, 'r') as readme:
+		return readme.read()
+
+def get_ini(filepath, keys_upper=False, space_list=None):
+	"""Read ini without headers (ignores them). Return dict
+
+	:keys_upper: if key (options) are returned as uppercase. 
+	:space_list  a list/tuple of keys that (the value) is a space separated list
+	"""
+
+	# lets be nice and convert to lowercase
+	[z.lower() for z in space_list]
+
+	import configparser
+	config = configparser.ConfigParser(empty_lines_in_values=False)
+
+	# config parser doesnt parse ini without section, fake it
+	dummy_section_name = "sexysettings"
+	dummy_file = "[" + dummy_section_name + "]\n"
+	
+	with open(filepath) as dumb:
+	    dummy_file += dumb.read()
+
+	config.read_string(dummy_file, source=filepath)
+	
+	config = config[dummy_section_name]
+
+	tmp_options  = dict()
+	for key, value in list(config.items()):
+
+		#Convert booleans, ints, lists
+		if value.isnumeric():
+			value = int(value)
+		elif value.startswith("[") and value.endswith("]"):
+			value = value[1:len(value)-1]
+			value = value.split(",")
+		else:
+			# booleans can accept true/false, yes/no
+			try:
+				config.getboolean(key)
+			except ValueError:
+				pass
+			else:
+				value = config.getboolean(key)
+
+		if key.lower() in space_list:
+			# must do checking for string only
+			value = value.split()
+
+		if keys_upper:
+			key = key.upper()
+		
+		tmp_options[key] = value	
+
+	return tmp_options
+
+
+# =========================
+# == methods: commands ====
+# =========================
+
+# shell=True because Windows/Python is crazy sometimes and cant find .exe in path. 
+# Thank you <http://stackoverflow.com/questions/3022013>
+# Only on Windows: elsewhere, with a list, the shell gets only its first item
+SUBPROCESS_SHELL = (os.name == 'nt')
+
+def run_subprocess(command, output=False, text=None, stream=None, limits=None):
+	""" run the cmd (list) 
+	normally -> like check_call
+	if output activated: returns the output to string -> like check_output
+	if also text: to interact (str is encoded to utf-8, bytes go as they are)
+	if stream: the output goes to stream(chunk) while it comes, nothing is kept
+	limits: dict, see popen_limited. After 'timeout' seconds the process is 
+	        killed and subprocess.TimeoutExpired raised
+	stderr is kept for the errors (.stderr); if everything was fine it's shown
+	Through a shell only on Windows, see SUBPROCESS_SHELL
+	"""
+
+	shell  = SUBPROCESS_SHELL
+	limits = limits or dict()
+
+	if text is not None and not isinstance(text, bytes):
+		text = text.encode('utf-8')
+
+	if stream:
+		return run_subprocessStream(command, text, stream, shell, limits)
+
+	stdin  = subprocess.PIPE if (output and text) else None
+	stdout = subprocess.PIPE if output else None
+
+	tmp = popen_limited(command, limits, stdin=stdin, stdout=stdout, stderr=subprocess.PIPE, shell=shell)
+
+	try:
+		result, errors = tmp.communicate(text if stdin else None, timeout=limits.get('timeout') or None)
+	except subprocess.TimeoutExpired:
+		tmp.kill()
+		_, errors = tmp.communicate()
+		raise subprocess.TimeoutExpired(command, limits['timeout'], stderr=errors)
+
+	run_subprocessDone(tmp, command, result, errors)
+
+	return result if output else tmp.returncode
+
+def run_subprocessDone(process, command, result, errors):
+	"""Raise CalledProcessError (with stderr) if it failed, if not show the 
+	warnings (stderr) 
+	"""
+
+	if process.returncode:
+		raise subprocess.CalledProcessError(process.returncode, command, result, errors)
+
+	if errors:
+		sys.stderr.write(str(errors, encoding='utf-8', errors='replace'))
+
+def popen_limited(command, limits, **kwargs):
+	"""subprocess.Popen with resource limits (where the platform has them): 
+	limits['memory'] address space in MB, limits['cpu'] CPU seconds
+	"""
+
+	rlimits = list()
+	if limitMe:
+		if limits.get('memory'):
+			rlimits.append((resource.RLIMIT_AS, int(limits['memory'] * 1024 * 1024)))
+		if limits.get('cpu'):
+			rlimits.append((resource.RLIMIT_CPU, int(limits['cpu'])))
+
+	def set_limits(pid=None):
+		for which, value in rlimits:
+			if pid is None:
+				resource.setrlimit(which, (value, value))
+			else:
+				resource.prlimit(pid, which, (value, value))
+
+	# prlimit (linux) from here: preexec_fn isn't safe with threads (our workers)
+	later = rlimits and hasattr(resource, 'prlimit')
+	if rlimits and not later:
+		kwargs['preexec_fn'] = set_limits
+
+	tmp = subprocess.Popen(command, **kwargs)
+
+	if later:
+		try:
+			set_limits(tmp.pid)
+		except ProcessLookupError:
+			pass # already done
+
+	return tmp
+
+def run_subprocessStream(command, text, stream, shell, limits):
+	"""run_subprocess with stream. stdin is written from another thread, so 
+	pandoc never waits for us to read while we wait for it to read
+	"""
+
+	import tempfile
+
+	stdin  = subprocess.PIPE if text is not None else None
+	stderr = tempfile.TemporaryFile() # a pipe would need another reader
+	tmp    = popen_limited(command, limits, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr, shell=shell)
+
+	def feed():
+		try:
+			tmp.stdin.write(text)
+		except (BrokenPipeError, OSError):
+			pass # pandoc died, the return code says why
+		finally:
+			tmp.stdin.close()
+
+	feeder = None
+	if text is not None:
+		feeder = threading.Thread(target=feed, daemon=True)
+		feeder.start()
+
+	killed = threading.Event()
+
+	def kill():
+		killed.set()
+		tmp.kill()
+
+	timer = None
+	if limits.get('timeout'):
+		timer = threading.Timer(limits['timeout'], kill)
+		timer.start()
+
+	try:
+		for chunk in iter(functools.partial(tmp.stdout.read, STREAM_CHUNK), b''):
+			stream(chunk)
+	finally:
+		tmp.stdout.close()
+		if feeder:
+			feeder.join()
+		tmp.wait()
+		if timer:
+			timer.cancel()
+
+		stderr.seek(0)
+		errors = stderr.read()
+		stderr.close()
+
+	if killed.is_set() and tmp.returncode < 0:
+		raise subprocess.TimeoutExpired(command, limits['timeout'], stderr=errors)
+
+	run_subprocessDone(tmp, command, None, errors)
+
+STREAM_CHUNK = 64 * 1024
+
+@functools.lru_cache()
+def pandoc_version(pandoc):
+	"""Version of pandoc as tuple of ints, ex: (2, 19, 2). (0,) if unknown """
+
+	try:
+		output = subprocess.check_output([pandoc, '--version'], shell=SUBPROCESS_SHELL)
+	except (OSError, subprocess.CalledProcessError):
+		return (0,)
+
+	found = re.search(r'(\d+(?:\.\d+)+)', str(output, encoding='utf-8', errors='replace'))
+	if not found:
+		return (0,)
+
+	return tuple(int(number) for number in found.group(1).split("."))
+
+def pandoc_variablesFile(variables, folder):
+	"""Save template variables (raw html) as a metadata file for pandoc 
+	(--metadata-file, pandoc >= 2.3) instead of huge --variable args. 
+
+	:variables  dict name: html
+	returns the file path (in folder, named by content)
+	"""
+
+	# metadata is markdown: keep the html as it is
+	metadata = dict()
+	for key, value in variables.items():
+		metadata[key] = "```{=html}\n" + value + "\n```\n"
+
+	# json is yaml too
+	data = json.dumps(metadata, ensure_ascii=True, sort_keys=True).encode('utf-8')
+	path = os.path.join(folder, hashlib.sha1(data).hexdigest() + ".json")
+
+	if not os.path.exists(path):
+		save_ifChanged(path, data)
+
+	return path
+
+def translate_synonyms(word):
+	"""Translate the synonyms to complete words"""
+
+	if word == "md" or word.startswith("md"):
+		word = word.replace("md", "markdown")
+		return word
+
+	if word == 'slide':
+		return "slides"
+
+	if word == 'mw':
+		return "mediawiki"
+
+	if word == 'doc':
+		return 'docx'
+
+	if word == 'opendoc':
+		return 'opendocument'
+
+	return word
+
+def output_extension(markup):
+	"""Extension of the output file for the (translated) format """
+
+	if markup == "markdown":
+		return "md"
+
+	if markup in ('html', 'slides'):
+		return "html"
+
+	return markup
+
+def translate_argsPandoc(myarg, value):
+	""" translate my arguments to pandoc's """
+
+	if myarg in _COMMANDS_COMPLETE and value:
+		pandoc_arg = _COMMANDS_COMPLETE[myarg]
+
+		if isinstance(value, bool):
+			return [pandoc_arg]
+		else:
+			return [pandoc_arg + str(value)]
+
+	return ""
+
+def msg_cli_yesno(msg):
+	"""Message for cli when answering y/n questions. 
+	msg contains the message without the "Continue (y/n)"
+	Returns boolean 
+	"""
+
+	answer = ""
+	while (not answer.lower() == 'y' and not answer.lower() == 'n'):
+		answer = input(msg + " Continue? (y/n) ")
+
+	if answer == 'y':
+		return True 
+	return False
+
+def check_synonyms(format_from, format_to):
+	"""Translate synonyms, return modified values """
+
+	format_from = translate_synonyms(format_from)
+	format_to = list(format_to)
+	
+	i = 0
+	while i < len(format_to):
+		format_to[i] = translate_synonyms(format_to[i])
+		i += 1
+
+	format_to = list(set(format_to)) # no duplicates
+
+	return format_from, format_to
+
+# ========================
+# == methods: metrics ====
+# ========================
+
+def stats_new():
+	"""Empty counters for one run. Filled by Pandy, written by metrics_write 
+
+	files:     {(result, format): amount}. result: converted, skipped, failed
+	bytes:     {format: bytes written}. Only outputs that changed are written
+	durations: {mode: seconds}. mode: individually, merge, book_scan, ...
+	lanes:     {lane: queue times}, see plan_queues
+	"""
+
+	return {'files': dict(), 'bytes': dict(), 'durations': dict(), 'lanes': dict(), 
+	        'pandoc_launches': 0, 'pandoc_killed': 0, 'pandoc_saved': 0, 'cache_hits': 0, 'cache_misses': 0, 'fast_md': 0, 
+	        'outputs_changed': 0, 'outputs_unchanged': 0, 
+	        'start': time.time(), 'success': True}
+
+def stats_peakRSS():
+	"""Peak resident set size in bytes: (this process, biggest child). 
+	(0, 0) if the platform can't tell
+	"""
+
+	if not limitMe:
+		return 0, 0
+
+	# linux reports KB, mac bytes
+	multiplier = 1 if sys.platform == 'darwin' else 1024
+
+	mine     = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * multiplier
+	children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * multiplier
+
+	return mine, children
+
+def metrics_labels(labels):
+	"""Labels dict to prometheus {key="value"} string (escaped, sorted) """
+
+	if not labels:
+		return ""
+
+	escaped = list()
+	for key in sorted(labels):
+		value = str(labels[key]).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+		escaped.append(key + '="' + value + '"')
+
+	return "{" + ",".join(escaped) + "}"
+
+def metrics_text(stats, labels):
+	"""Prometheus text exposition of stats (see stats_new) 
+
+	:stats     the run counters 
+	:labels    dict. common labels for all samples (source, format)
+	returns string 
+	"""
+
+	return metrics_textRuns([(stats, labels)])
+
+def metrics_textRuns(runs):
+	"""Prometheus text exposition of many runs in one file (--projects): 
+	each family once, the samples of every run with its labels
+
+	:runs   list of (stats, labels), see metrics_text
+	returns string 
+	"""
+
+	runs = [(labels, metrics_families(stats)) for stats, labels in runs]
+
+	lines = list()
+	for number, (name, kind, helpme, _) in enumerate(runs[0][1]):
+		lines.append("# HELP " + name + " " + helpme)
+		lines.append("# TYPE " + name + " " + kind)
+
+		for labels, families in runs:
+			for extra, value in families[number][3]:
+				tmp = dict(labels)
+				tmp.update(extra)
+
+				if isinstance(value, float):
+					value = round(value, 6)
+				lines.append(name + metrics_labels(tmp) + " " + str(value))
+
+	return "\n".join(lines) + "\n"
+
+def metrics_families(stats):
+	"""The metrics of one run: list of (name, type, help, [(extra labels, value)]) """
+
+	families = list()
+
+	samples = list()
+	for (result, fmt), amount in sorted(stats['files'].items()):
+		samples.append(({'result': result, 'format': fmt}, amount))
+	families.append(('pandy_files', 'gauge', 'Files handled in the last run, by result and output format', samples))
+
+	families.append(('pandy_outputs', 'gauge', 'Outputs of the last run, by if their content changed', 
+		            [({'state': 'changed'}, stats['outputs_changed']), 
+		             ({'state': 'unchanged'}, stats['outputs_unchanged'])]))
+
+	families.append(('pandy_pandoc_launches', 'gauge', 'Pandoc processes started in the last run', 
+		            [({}, stats['pandoc_launches'])]))
+	families.append(('pandy_pandoc_killed', 'gauge', 'Pandoc processes killed after the timeout in the last run', 
+		            [({}, stats['pandoc_killed'])]))
+	families.append(('pandy_pandoc_saved', 'gauge', 'Pandoc processes not started in the last run: identical sources, output copied', 
+		            [({}, stats['pandoc_saved'])]))
+	families.append(('pandy_fast_md', 'gauge', 'Markdown files rendered by pandy, without pandoc, in the last run', 
+		            [({}, stats['fast_md'])]))
+	families.append(('pandy_cache', 'gauge', 'Conversions found in the cache (hit) or converted and kept (miss) in the last run', 
+		            [({'result': 'hit'}, stats['cache_hits']), ({'result': 'miss'}, stats['cache_misses'])]))
+
+	samples = [({'mode': 'total'}, stats['durations'].get('total', 0))]
+	for mode, seconds in sorted(stats['durations'].items()):
+		if mode == 'total':
+			continue
+		samples.append(({'mode': mode}, seconds))
+	families.append(('pandy_duration_seconds', 'gauge', 'Wall clock time of the last run, total and by mode', samples))
+
+	samples, waits = list(), list()
+	for lane, queue in sorted(stats['lanes'].items()):
+		samples.append(({'lane': lane}, queue['jobs']))
+		waits += [({'lane': lane, 'stat': 'sum'}, queue['queue_seconds']), 
+		          ({'lane': lane, 'stat': 'max'}, queue['queue_max'])]
+	families.append(('pandy_lane_jobs', 'gauge', 'Jobs run in the last run, by lane (see FORMAT_LANES)', samples))
+	families.append(('pandy_lane_queue_seconds', 'gauge', 'Time ready jobs waited for a worker, by lane', waits))
+
+	samples = list()
+	for fmt, amount in sorted(stats['bytes'].items()):
+		samples.append(({'format': fmt}, amount))
+	families.append(('pandy_bytes_written', 'gauge', 'Bytes of output written in the last run', samples))
+
+	rss_mine, rss_children = stats_peakRSS()
+	families.append(('pandy_peak_rss_bytes', 'gauge', 'Peak resident memory of pandy and of its biggest pandoc child', 
+		            [({'process': 'pandy'}, rss_mine), ({'process': 'pandoc'}, rss_children)]))
+
+	families.append(('pandy_last_run_success', 'gauge', '1 if the last run finished without errors', 
+		            [({}, 1 if stats['success'] else 0)]))
+	families.append(('pandy_last_run_timestamp_seconds', 'gauge', 'Unix time when the last run finished', 
+		            [({}, round(time.time(), 3))]))
+
+	return families
+
+def metrics_write(path, runs):
+	"""Write the metrics textfile. Atomic (tmp + rename), so node_exporter 
+	never reads a half written file
+
+	:runs   list of (stats, labels), see metrics_textRuns
+	"""
+
+	path_mkdir(path_get(os.path.abspath(path)))
+	tmp_path = path + ".tmp." + str(os.getpid())
+
+	with open(tmp_path, 'w', encoding='utf-8', newline='\n') as tmp:
+		tmp.write(metrics_textRuns(runs))
+
+	os.replace(tmp_path, path)
+
+
+# ===========================
+# == methods: build plan ====
+# ===========================
+
+DURATIONS_NAME = ".pandy-durations.json" # historical job durations, next to the output
+FAILED_NAME    = ".pandy-failed.list"     # files that failed in the last run, for --retry-failed
+
+# slow output formats get their own lanes (limited workers), so they don't 
+# keep the quick ones waiting. The rest: LANE_DEFAULT
+FORMAT_LANES = {'epub': 'heavy', 'epub2': 'heavy', 'epub3': 'heavy', 'docx': 'heavy', 'odt': 'heavy', 
+                'fb2': 'heavy', 'pdf': 'latex'}
+LANE_DEFAULT = 'light'
+LATEX_JOB_MEMORY = 512 # MB a LaTeX conversion is supposed to need (LANE_LATEX_MEMORY)
+
+class Job(object):
+	"""A node of the build plan. action() runs once all deps are done
+
+	:name      stable id, also the key for the historical durations
+	:kind      scan, toc, order, page, index (book), convert, merge
+	:action    callable without arguments
+	:deps      list of jobs that must finish before
+	:input, format, output   informative (plan listing)
+	:lane      from the format (FORMAT_LANES), see plan_run
+	:same      the job doing the same work, this one takes its result (see plan_dedupe)
+	"""
+
+	def __init__(self, name, kind, action, deps=None, input=None, ext_to='', output=''):
+		self.name     = name
+		self.kind     = kind
+		self.action   = action
+		self.deps     = list(deps) if deps else list()
+		self.input    = input
+		self.format   = ext_to
+		self.output   = output
+		self.estimate = 1.0       # seconds, see plan_estimate
+		self.priority = 0.0       # estimate + longest chain after it, see plan_priorities
+		self.state    = 'pending' # pending, running, done, failed, skipped
+		self.lane     = FORMAT_LANES.get(ext_to, LANE_DEFAULT)
+		self.ready    = None      # when all its deps were done (queue time: start - ready)
+		self.same     = None
+		self.start    = None
+		self.end      = None
+		self.error    = None
+
+	def duration(self):
+		"""Seconds it took, None if it didn't run """
+
+		if self.start is None or self.end is None:
+			return None
+		return self.end - self.start
+
+	def __repr__(self):
+		return "<Job " + self.name + ">"
+
+def durations_load(path):
+	"""Historical durations (dict name: seconds). Empty if missing/broken """
+
+	try:
+		with open(path, encoding='utf-8') as tmp:
+			return json.load(tmp)
+	except (OSError, ValueError):
+		return dict()
+
+def durations_save(path, jobs):
+	"""Add the durations of the finished jobs to the file in path """
+
+	durations = durations_load(path)
+
+	for job in jobs:
+		if job.state == 'done':
+			durations[job.name] = round(job.duration(), 4)
+
+	path_mkdir(path_get(os.path.abspath(path)))
+	tmp_path = path + ".tmp." + str(os.getpid())
+
+	with open(tmp_path, 'w', encoding='utf-8') as tmp:
+		json.dump(durations, tmp, sort_keys=True, indent=0)
+
+	os.replace(tmp_path, path)
+
+def failed_load(path):
+	"""Files that failed (see failed_save). Empty if there is no list """
+
+	try:
+		with open(path, encoding='utf-8') as tmp:
+			return [line.strip() for line in tmp if line.strip()]
+	except OSError:
+		return list()
+
+def failed_save(path, jobs):
+	"""Save the input files of the failed and skipped jobs, one per line 
+	(all the files of a merge). Nothing failed: no file. Returns the list
+	"""
+
+	files = list()
+	for job in jobs:
+		if job.state not in ('failed', 'skipped') or not job.input:
+			continue
+
+		for filey in ([job.input] if isinstance(job.input, str) else job.input):
+			if os.path.isfile(filey) and os.path.abspath(filey) not in files:
+				files.append(os.path.abspath(filey))
+
+	if files:
+		path_mkdir(path_get(os.path.abspath(path)))
+		save_ifChanged(path, ("\n".join(files) + "\n").encode('utf-8'))
+	elif os.path.exists(path):
+		os.remove(path)
+
+	return files
+
+def plan_estimate(jobs, durations):
+	"""Set job.estimate from the historical durations. Unknown jobs get the 
+	average of their kind (or 1 second if nothing is known)
+	"""
+
+	by_kind = dict()
+	for job in jobs:
+		if job.name in durations:
+			by_kind.setdefault(job.kind, list()).append(durations[job.name])
+
+	for job in jobs:
+		if job.name in durations:
+			job.estimate = durations[job.name]
+		elif job.kind in by_kind:
+			job.estimate = sum(by_kind[job.kind]) / len(by_kind[job.kind])
+		else:
+			job.estimate = 1.0
+
+def plan_dedupe(jobs, key):
+	"""Jobs with the same key(job) do the same work: the first one runs, the 
+	others wait for it (deps) and take its result (job.same). key() returning 
+	None: the job is unique. Returns the duplicated jobs
+	"""
+
+	first, duplicated = dict(), list()
+
+	for job in jobs:
+		tmp = key(job)
+		if tmp is None:
+			continue
+
+		if tmp not in first:
+			first[tmp] = job
+			continue
+
+		job.same = first[tmp]
+		job.deps.append(job.same)
+		duplicated.append(job)
+
+	return duplicated
+
+def file_digests(paths):
+	"""sha1 of the files that could be identical to another one (same size); 
+	the rest aren't read. Returns dict path: hexdigest
+	"""
+
+	by_size = dict()
+	for path in paths:
+		try:
+			by_size.setdefault(os.path.getsize(path), list()).append(path)
+		except OSError:
+			pass
+
+	digests = dict()
+	for same_size in by_size.values():
+		if len(same_size) < 2:
+			continue
+
+		for path in same_size:
+			digests[path] = hashlib.sha1(cmd_open_bytes(path)).hexdigest()
+
+	return digests
+
+def file_linkOrCopy(source, path):
+	"""Put a copy of source in path (hardlink if possible: outputs are always 
+	replaced, never written in place, so the copies never change together). 
+	Only if the content differs. Returns True if replaced
+	"""
+
+	import shutil
+
+	tmp_path = path_temporal(path)
+	os.remove(tmp_path)
+
+	try:
+		os.link(source, tmp_path)
+	except OSError:
+		shutil.copyfile(source, tmp_path)
+
+	return replace_ifChanged(tmp_path, path)
+
+def plan_sorted(jobs):
+	"""Jobs in topological order (deps first). Raises ValueError on cycles """
+
+	pending = {job: len(job.deps) for job in jobs}
+	children = plan_children(jobs)
+
+	result = [job for job in jobs if not job.deps]
+
+	for job in result: # grows while walked
+		for child in children[job]:
+			pending[child] -= 1
+			if not pending[child]:
+				result.append(child)
+
+	if len(result) != len(jobs):
+		raise ValueError("Build plan has a cycle")
+
+	return result
+
+def plan_children(jobs):
+	"""Dict job: list of jobs depending on it """
+
+	children = {job: list() for job in jobs}
+	for job in jobs:
+		for dep in job.deps:
+			children[dep].append(job)
+
+	return children
+
+def plan_priorities(jobs):
+	"""Set job.priority: its estimate plus the longest chain of estimates after 
+	it. Ready jobs with highest priority run first (longest job first)
+	"""
+
+	children = plan_children(jobs)
+
+	for job in reversed(plan_sorted(jobs)):
+		after = [child.priority for child in children[job]]
+		job.priority = job.estimate + (max(after) if after else 0)
+
+def plan_criticalPath(jobs):
+	"""Longest chain of estimates. Returns (list of jobs, seconds) """
+
+	if not jobs:
+		return list(), 0
+
+	plan_priorities(jobs)
+	children = plan_children(jobs)
+
+	current = max(jobs, key=lambda job: job.priority)
+	total = current.priority
+	path = [current]
+
+	while children[current]:
+		current = max(children[current], key=lambda job: job.priority)
+		path.append(current)
+
+	return path, total
+
+def plan_runJob(job):
+	"""Run one job (in a worker), keeping times and error """
+
+	job.start = time.time()
+	try:
+		job.action()
+	except Exception as error:
+		job.error = error
+	finally:
+		job.end = time.time()
+
+	return job
+
+def plan_lanes(settings):
+	"""Workers for each lane (see FORMAT_LANES) and the memory limit (MB) 
+	for each LaTeX conversion from the budget (0: none). Returns (dict, int)
+	"""
+
+	workers = max(1, int(settings['JOBS']))
+	latex   = max(1, int(settings['LANE_LATEX']))
+	memory  = 0
+
+	budget = int(settings['LANE_LATEX_MEMORY'] or 0)
+	if budget:
+		each   = int(settings['LIMIT_MEMORY'] or 0) or LATEX_JOB_MEMORY
+		latex  = max(1, min(latex, budget // each))
+		memory = budget // latex
+
+	lanes = {'heavy': int(settings['LANE_HEAVY']) or max(1, workers // 2), 'latex': latex}
+
+	return lanes, memory
+
+def plan_queues(jobs):
+	"""Time the jobs waited for a worker, by lane: 
+	{lane: {'jobs': amount, 'queue_seconds': total, 'queue_max': longest}}
+	"""
+
+	queues = dict()
+	for job in jobs:
+		if job.ready is None or job.start is None:
+			continue
+
+		waited = max(0.0, job.start - job.ready)
+		lane = queues.setdefault(job.lane, {'jobs': 0, 'queue_seconds': 0.0, 'queue_max': 0.0})
+		lane['jobs'] += 1
+		lane['queue_seconds'] += waited
+		lane['queue_max'] = max(lane['queue_max'], waited)
+
+	return queues
+
+def plan_run(jobs, workers=1, stop_on_error=True, lanes=None):
+	"""Run the build plan with a pool of workers. Ready jobs are taken by 
+	priority (longest chain first). Jobs depending on a failed one are skipped.
+
+	:stop_on_error   stop starting jobs after the first failure and raise it
+	:lanes           dict lane: max jobs of it running at the same time (see 
+	                 plan_lanes). Other lanes: all the workers
+	returns list of failed jobs
+	"""
+
+	plan_priorities(jobs)
+	lanes = lanes or dict()
+
+	children = plan_children(jobs)
+	order    = {job: number for number, job in enumerate(jobs)} # ties: plan order
+	waiting  = {job: len(job.deps) for job in jobs}              # deps not done yet
+	ready    = dict() # lane: heap of (-priority, order, job)
+	busy     = dict() # lane: jobs running
+	running  = dict()
+	failed   = list()
+
+	def release(job, now):
+		job.ready = now
+		heapq.heappush(ready.setdefault(job.lane, list()), (-job.priority, order[job], job))
+
+	def skip(job):
+		stack = list(children[job])
+		while stack:
+			child = stack.pop()
+			if child.state == 'pending':
+				child.state = 'skipped'
+				stack.extend(children[child])
+
+	def next_lane():
+		best = None
+		for lane, heap in ready.items():
+			if not heap or busy.get(lane, 0) >= lanes.get(lane, workers):
+				continue # its lane is full, maybe the next one can go
+			if best is None or heap[0] < ready[best][0]:
+				best = lane
+		return best
+
+	now = time.time()
+	for job in jobs:
+		if not job.deps:
+			release(job, now)
+
+	with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+		while True:
+			while len(running) < workers and not (stop_on_error and failed):
+				lane = next_lane()
+				if lane is None:
+					break
+
+				job = heapq.heappop(ready[lane])[2]
+				if job.state != 'pending':
+					continue
+
+				job.state = 'running'
+				running[pool.submit(plan_runJob, job)] = job
+				busy[lane] = busy.get(lane, 0) + 1
+
+			if not running:
+				break
+
+			finished, _ = concurrent.futures.wait(running, 
+				                return_when=concurrent.futures.FIRST_COMPLETED)
+
+			now = time.time()
+			for future in finished:
+				job = running.pop(future)
+				busy[job.lane] -= 1
+				future.result() # SystemExit and friends go up
+
+				if job.error is not None:
+					job.state = 'failed'
+					failed.append(job)
+					skip(job)
+					continue
+
+				job.state = 'done'
+				for child in children[job]:
+					waiting[child] -= 1
+					if not waiting[child] and child.state == 'pending':
+						release(child, now)
+
+	if stop_on_error and failed:
+		for job in jobs:
+			if job.state == 'pending':
+				job.state = 'skipped'
+
+	if failed and stop_on_error:
+		raise failed[0].error
+
+	return failed
+
+
+# =======================
+# == methods: search ====
+# =======================
+
+SEARCH_FOLDER = "search"
+SEARCH_WEIGHT_TITLE   = 10
+SEARCH_WEIGHT_HEADING = 5
+
+def search_terms(text, headings=None, title=""):
+	"""Words and their weight (dict) for the search index. Markdown links 
+	targets, references and html tags are not words.
+
+	:text      text (str)
+	:headings  list of headings (str), weight more
+	:title     the title, weights the most
+	"""
+
+	text = re.sub(r'\]\([^)]*\)', '] ', text)                  # [title](target)
+	text = re.sub(r'^\s*\[[^\]]+\]:.*$', ' ', text, flags=re.M)  # [ref]: target
+	text = re.sub(r'<[^>]+>', ' ', text)                         # tags
+
+	terms = dict()
+
+	def add(words, weight):
+		for word in re.findall(r'\w+', words.lower()):
+			if len(word) < 2:
+				continue
+			terms[word] = terms.get(word, 0) + weight
+
+	add(text, 1)
+	add(" ".join(headings or []), SEARCH_WEIGHT_HEADING)
+	add(title, SEARCH_WEIGHT_TITLE)
+
+	return terms
+
+def search_shard(term):
+	"""Shard file name for the term: its first letter (same in SEARCH_JS) """
+
+	return format(ord(term[0]), 'x') + ".json"
+
+class SearchIndex(object):
+	"""Prebuilt search index for the book: the pages (docs.json) and the 
+	postings split in shards by first letter, so the browser only loads 
+	what it searches. Filled with add(), in the book order
+	"""
+
+	def __init__(self):
+		self.docs     = list()  # [href, title]
+		self.postings = dict()  # term: [doc id, weight, doc id, weight, ...]
+
+	def add(self, href, title, terms):
+		"""Add a page. terms: dict word: weight (see search_terms) """
+
+		doc_id = len(self.docs)
+		self.docs.append([href, title])
+
+		for term in sorted(terms):
+			self.postings.setdefault(term, list()).extend([doc_id, terms[term]])
+
+	def shards(self):
+		"""Dict shard name: {term: postings} """
+
+		shards = dict()
+		for term, postings in self.postings.items():
+			shards.setdefault(search_shard(term), dict())[term] = postings
+
+		return shards
+
+	def write(self, folder):
+		"""Save docs, shards and the script in folder. Old shards are removed """
+
+		path_mkdir(folder)
+
+		def dump(data):
+			return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+		shards = self.shards()
+		for name, postings in shards.items():
+			save_ifChanged(os.path.join(folder, name), dump(postings))
+
+		save_ifChanged(os.path.join(folder, "docs.json"), dump(self.docs))
+		save_ifChanged(os.path.join(folder, "pandy-search.js"), SEARCH_JS.encode('utf-8'))
+
+		for name in os.listdir(folder):
+			if name.endswith(".json") and name != "docs.json" and name not in shards:
+				os.remove(os.path.join(folder, name))
+
+
+# ==============================
+# == methods: project index ====
+# ==============================
+
+INDEX_DB_NAME    = ".pandy-index.sqlite" # book file properties between runs, next to the output
+INDEX_DB_VERSION = 1                     # change when the stored properties change
+INDEX_DB_FIELDS  = ('title', 'toc', 'links', 'terms')
+
+class ProjectIndex(object):
+	"""Properties of the book files (title, TOC, links, search terms) kept 
+	between runs in a SQLite file, keyed by path, mtime, size and hash: 
+	unchanged files aren't read nor sent to pandoc again.
+
+	Loaded at once with load() and written with save() at the end of the 
+	run (scans run in threads, a sqlite connection can't be shared)
+	"""
+
+	def __init__(self, path, version):
+		self.path    = path
+		self.version = str(INDEX_DB_VERSION) + " " + version  # pandoc, input format...
+		self.records = dict()  # path: (mtime, size, hash, properties)
+		self.changed = set()
+		self.lock    = threading.Lock()
+
+	def load(self):
+		"""Read the records. A missing, broken or old file is just empty """
+
+		self.records = dict()
+
+		if not os.path.exists(self.path):
+			return
+
+		try:
+			db = sqlite3.connect(self.path)
+			try:
+				version = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+				if not version or version[0] != self.version:
+					return
+
+				for path, mtime, size, digest, data in db.execute(
+					    "SELECT path, mtime, size, hash, properties FROM files"):
+					self.records[path] = (mtime, size, digest, json.loads(data))
+			finally:
+				db.close()
+		except (sqlite3.Error, ValueError):
+			self.records = dict()
+
+	def fresh(self, path, stat):
+		"""Properties if the file didn't change (same mtime and size), or None """
+
+		record = self.records.get(path)
+		if record and record[0] == stat.st_mtime and record[1] == stat.st_size:
+			return dict(record[3])
+
+		return None
+
+	def same(self, path, digest):
+		"""Properties if the content is the same (touched file), or None """
+
+		record = self.records.get(path)
+		if record and record[2] == digest:
+			return dict(record[3])
+
+		return None
+
+	def put(self, path, stat, digest, properties):
+		"""Store the INDEX_DB_FIELDS of properties for the file """
+
+		data = dict((key, properties[key]) for key in INDEX_DB_FIELDS if key in properties)
+		record = (stat.st_mtime, stat.st_size, digest, data)
+
+		with self.lock:
+			if self.records.get(path) != record:
+				self.records[path] = record
+				self.changed.add(path)
+
+	def update(self, path, properties):
+		"""put() for a file already there, with new properties (same file) """
+
+		record = self.records.get(path)
+		if record:
+			self.put(path, os.stat(path), record[2], dict(record[3], **properties))
+
+	def save(self):
+		"""Write the changed records; forget the deleted files """
+
+		gone = [path for path in self.records if not os.path.exists(path)]
+		if not self.changed and not gone:
+			return
+
+		path_mkdir(path_get(self.path))
+
+		db = sqlite3.connect(self.path)
+		try:
+			with db:
+				db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+				db.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime REAL, "
+					       "size INTEGER, hash TEXT, properties TEXT)")
+
+				version = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+				if not version or version[0] != self.version:
+					db.execute("DELETE FROM files")
+					db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self.version,))
+					self.changed = set(self.records)
+
+				db.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in gone])
+				db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", 
+					[(path,) + self.records[path][:3] + (json.dumps(self.records[path][3]),) 
+					 for path in sorted(self.changed) if path not in gone])
+		finally:
+			db.close()
+
+		for path in gone:
+			del self.records[path]
+
+		self.changed = set()
+
+
+# ======================
+# == methods: cache ====
+# ======================
+
+# options whose value is a file read by pandoc: in the key by content, not path 
+# (except --css, the path ends in the html as it is)
+CACHE_FILE_OPTIONS = ('--template=', '--css=', '--bibliography=', '--csl=', '--include-before-body=', 
+                      '--include-after-body=', '--include-in-header=', '--metadata-file=', '--reference-doc=')
+CACHE_KEEP_PATH    = ('--css=',)
+# not found as they are, pandoc looks for them in its data dir (see cache_findFile)
+CACHE_DATA_FOLDERS = {'--template=': 'templates', '--csl=': 'csl'}
+CACHE_IMAGES       = re.compile(br'!\[[^\]]*\]\(\s*<?([^)\s>]+)')
+
+def cache_fileDigest(path):
+	"""sha1 of the file content, None if it can't be read """
+
+	try:
+		return hashlib.sha1(cmd_open_bytes(path)).hexdigest()
+	except OSError:
+		return None
+
+def cache_dataDirs(command):
+	"""pandoc's user data dirs for command: --data-dir, or the default ones """
+
+	for item in command:
+		if item.startswith('--data-dir='):
+			return [item[len('--data-dir='):]]
+
+	if os.name == 'nt':
+		return [os.path.join(os.environ.get('APPDATA', ''), 'pandoc')]
+
+	xdg = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+	return [os.path.join(xdg, 'pandoc'), os.path.join(os.path.expanduser('~'), '.pandoc')]
+
+def cache_findFile(command, option, value):
+	"""The file pandoc reads for option=value, None if not found: the path, 
+	if not there in the data dir (CACHE_DATA_FOLDERS). Templates without 
+	extension get the one of the output format, as pandoc does
+	"""
+
+	if os.path.isfile(value):
+		return value
+
+	if option not in CACHE_DATA_FOLDERS:
+		return None
+
+	names = [value]
+	if option == '--template=' and not os.path.splitext(value)[1]:
+		for number, item in enumerate(command[:-1]):
+			if item in ('-t', '--to'):
+				writer = re.split(r'[+-]', command[number + 1])[0]
+				names.append(value + "." + ("html" if writer.startswith("html") else writer))
+
+	for folder in cache_dataDirs(command):
+		for name in names:
+			path = os.path.join(folder, CACHE_DATA_FOLDERS[option], name)
+			if os.path.isfile(path):
+				return path
+
+	return None
+
+def cache_imageDigests(data, folders):
+	"""Digests of the local images of a markdown text (they're embedded in 
+	docx, epub, --self...), looked for in folders (as pandoc's resource path)
+	"""
+
+	digests = list()
+	for found in sorted(set(CACHE_IMAGES.findall(data))):
+		image = str(found, encoding='utf-8', errors='replace')
+		if "://" in image or image.startswith("data:"):
+			continue
+
+		for folder in folders:
+			digest = cache_fileDigest(os.path.join(folder, image))
+			if digest:
+				digests.append(image + ":" + digest)
+				break
+
+	return digests
+
+class ConversionCache(object):
+	"""pandoc's outputs kept by a hash of everything that makes them (see key), 
+	shared by projects, branches and runs. Many processes can share it: files 
+	are written to a temporal and renamed. When it's over max_size the least 
+	recently used (mtime, touched on hits) go first (see evict)
+	"""
+
+	def __init__(self, folder, max_size, version):
+		self.folder   = folder
+		self.max_size = max_size # bytes, 0: no limit
+		self.version  = version  # pandoc's
+
+	def key(self, command, inputs=(), text=None):
+		"""Hash of the command (without output), the content of the inputs, 
+		text (stdin), the files in CACHE_FILE_OPTIONS (also from the data dir), 
+		the images and pandoc's version. Paths don't matter (other checkouts hit), file names do 
+		(pandoc may use them, as the default title)
+		"""
+
+		digest = hashlib.sha1(("pandoc " + self.version + "\0").encode('utf-8'))
+
+		for item in command:
+			if item in inputs:
+				data = cmd_open_bytes(item)
+				images = cache_imageDigests(data, ('.', path_get(os.path.abspath(item))))
+				item = "<input " + path_getFilename(item) + " " + hashlib.sha1(data).hexdigest() + " " + " ".join(images) + ">"
+			else:
+				for option in CACHE_FILE_OPTIONS:
+					value = item[len(option):]
+					found = item.startswith(option) and cache_findFile(command, option, value)
+					if found:
+						item = option + (value if option in CACHE_KEEP_PATH else "") + "<" + str(cache_fileDigest(found)) + ">"
+						break
+
+			digest.update(item.encode('utf-8') + b"\0")
+
+		if text is not None:
+			data = text if isinstance(text, bytes) else text.encode('utf-8')
+			digest.update(b"<stdin>\0" + data + b"\0" + " ".join(cache_imageDigests(data, ('.',))).encode('utf-8'))
+
+		return digest.hexdigest()
+
+	def path(self, key):
+		"""Where the output of key is kept """
+
+		return os.path.join(self.folder, key[:2], key[2:])
+
+	def open(self, key):
+		"""The kept output (binary file, touched: recently used), None if missing """
+
+		path = self.path(key)
+		try:
+			os.utime(path)
+			return open(path, 'rb')
+		except OSError:
+			return None # never kept, or just evicted (other process)
+
+	def copy(self, key, path):
+		"""Copy the output of key to path. False if it's not kept """
+
+		import shutil
+
+		kept = self.open(key)
+		if not kept:
+			return False
+
+		with kept, open(path, 'wb') as tmp:
+			shutil.copyfileobj(kept, tmp)
+
+		return True
+
+	def put(self, key, path, move=False):
+		"""Keep the file in path as the output of key """
+
+		import shutil
+
+		final = self.path(key)
+		path_mkdir(path_get(final))
+		tmp_path = path_temporal(final)
+
+		if move:
+			shutil.move(path, tmp_path)
+		else:
+			shutil.copyfile(path, tmp_path)
+
+		os.replace(tmp_path, final)
+
+	def evict(self):
+		"""Delete the least recently used outputs until it's under max_size. 
+		Returns the amount deleted
+		"""
+
+		if not self.max_size:
+			return 0
+
+		entries, total = list(), 0
+		for root, _, files in os.walk(self.folder):
+			for name in files:
+				path = os.path.join(root, name)
+				try:
+					stat = os.stat(path)
+				except OSError:
+					continue
+
+				entries.append((stat.st_mtime, stat.st_size, path))
+				total += stat.st_size
+
+		deleted = 0
+		for _, size, path in sorted(entries):
+			if total <= self.max_size:
+				break
+
+			try:
+				os.remove(path)
+			except OSError:
+				continue # in use (windows) or already gone
+
+			total -= size
+			deleted += 1
+
+		return deleted
+
+
+# =======================
+# == methods: shards ====
+# =======================
+
+SHARD_MANIFEST = ".pandy-shard-{0}-of-{1}.json"
+SHARD_KINDS    = ('convert', 'merge', 'page', 'index') # jobs that are split, the rest run everywhere
+SHARD_NEEDED   = ('toc',) # jobs only in the shards with a job that needs them (see shard_jobs)
+
+class ShardsIncomplete(Exception):
+	"""--shard-merge: the shards didn't do the whole plan (see shard_check) """
+
+def shard_parse(value):
+	"""'i/N' to (i, N), 1 <= i <= N. Raises ValueError """
+
+	number, total = [int(tmp) for tmp in value.split("/")]
+
+	if total < 1 or not 1 <= number <= total:
+		raise ValueError("Shard must be i/N with 1 <= i <= N: " + value)
+
+	return number, total
+
+def shard_of(name, total):
+	"""Shard (1 to total) of the job name. Stable across machines and runs """
+
+	digest = hashlib.sha1(name.encode('utf-8')).hexdigest()
+	return int(digest, 16) % total + 1
+
+def shard_jobs(jobs, number, total):
+	"""The jobs of shard number (of total): its SHARD_KINDS, the SHARD_NEEDED 
+	that they (or other jobs there) need, and all the others
+	"""
+
+	mine = [job for job in jobs if job.kind not in SHARD_KINDS + SHARD_NEEDED 
+	        or job.kind in SHARD_KINDS and shard_of(job.name, total) == number]
+
+	kept, pending = set(id(job) for job in mine), list(mine)
+	while pending:
+		for dep in pending.pop().deps:
+			if dep.kind in SHARD_NEEDED and id(dep) not in kept:
+				kept.add(id(dep))
+				pending.append(dep)
+
+	return [job for job in jobs if id(job) in kept]
+
+def shard_outputs(job):
+	"""Files the job writes """
+
+	return [job.output] if job.output else []
+
+def shard_planHash(jobs, folder):
+	"""Fingerprint of the whole plan; all shards must have the same (the 
+	SHARD_NEEDED jobs don't count: only shards plan them)
+	"""
+
+	names = sorted(" ".join([job.name] + [os.path.relpath(tmp, folder) for tmp in shard_outputs(job)]) 
+	               for job in jobs if job.kind not in SHARD_NEEDED)
+	return hashlib.sha1("\n".join(names).encode('utf-8')).hexdigest()
+
+def shard_writeManifest(folder, shard, plan_hash, jobs):
+	"""Save what this shard had to do and what it did (for shard_check). 
+	Outputs relative to the folder: the machines may have different paths
+	"""
+
+	done = dict()
+	for job in jobs:
+		if job.kind in SHARD_KINDS:
+			outputs = [os.path.relpath(tmp, folder) for tmp in shard_outputs(job) if os.path.exists(tmp)]
+			done[job.name] = {'state': job.state, 'outputs': outputs}
+
+	manifest = {'shard': shard[0], 'total': shard[1], 'plan': plan_hash, 'jobs': done}
+
+	path = os.path.join(folder, SHARD_MANIFEST.format(shard[0], shard[1]))
+	data = json.dumps(manifest, sort_keys=True, indent=0).encode('utf-8')
+
+	path_mkdir(folder)
+	save_ifChanged(path, data)
+
+	return path
+
+def shard_check(folder, total, jobs):
+	"""Check the manifests of all the shards against the whole plan (jobs). 
+	Returns list of problems (str); empty: complete
+	"""
+
+	plan_hash = shard_planHash(jobs, folder)
+	expected  = set(job.name for job in jobs if job.kind in SHARD_KINDS)
+	problems  = list()
+	done      = set()
+
+	for number in range(1, total + 1):
+		path = os.path.join(folder, SHARD_MANIFEST.format(number, total))
+
+		try:
+			with open(path, encoding='utf-8') as tmp:
+				manifest = json.load(tmp)
+		except (OSError, ValueError):
+			problems.append("Shard {0}/{1}: no manifest".format(number, total))
+			continue
+
+		if manifest['plan'] != plan_hash:
+			problems.append("Shard {0}/{1}: made from a different plan (files/settings)".format(number, total))
+
+		for name, job in sorted(manifest['jobs'].items()):
+			if job['state'] != 'done':
+				problems.append("Shard {0}/{1}: {2} {3}".format(number, total, name, job['state']))
+				continue
+
+			done.add(name)
+			for output in job['outputs']:
+				if not os.path.exists(os.path.join(folder, output)):
+					problems.append("Missing output: " + output)
+
+	for name in sorted(expected - done):
+		problems.append("Not done: " + name)
+
+	return problems
+
+
+# ================================
+# == methods: special parsing ====
+# ================================
+
+def if_special_elements(text, toc_tag):
+	"""read text (as list) and process trough specials 
+	(admonitions, abbreviations, TOC tag, internallinks)
+	returns: text (as list) and hasTOC (bool)
+	"""
+	
+	hasTOC, text = find_TOCinFile(text, toc_tag)
+	text = parse_admonitions(text)
+	text = parse_abbreviations(text)
+	text = parse_internalLinks(text)
+
+	return text, hasTOC
+
+SPECIAL_ADMONITION   = re.compile(rb'^\[[^\[\r\n]*\][ \t]*\r?$', re.MULTILINE)
+SPECIAL_ABBREVIATION = re.compile(rb'^\*\[[^\]\r\n]+\]:', re.MULTILINE) # bytes: \w is ascii only
+
+def if_special_markers(data, toc_tag):
+	"""Quick look at the raw file (bytes): could if_special_elements change 
+	anything? If not, the file can go to pandoc as it is, without decoding. 
+	Better a false yes (slower) than a false no
+	"""
+
+	if data.startswith(codecs.BOM_UTF8):
+		data = data[len(codecs.BOM_UTF8):]
+
+	if toc_tag and toc_tag.encode('utf-8') in data:
+		return True
+
+	extensions = "|".join(ACCEPTED_MD_EXTENSIONS).encode('utf-8')
+
+	return bool(SPECIAL_ADMONITION.search(data) or SPECIAL_ABBREVIATION.search(data) 
+		        or re.search(rb'\]\(.+?\.(?:' + extensions + rb')\)', data))
+
+def parse_abbreviations(text):
+	""" Find if file has abbreviations, if it does: parse as HTML. 
+	text: list (as just opened)
+	returns parsed text list 
+
+	abbreviations format as PHP Markdown Extra:
+
+    Some text with an ABBR and a REF. Ignore REFERENCE and ref.
+    *[ABBR]: Abbreviation
+    *[REF]: Abbreviation Reference
+
+    should be: Some text with an <abbr title="Abbreviation">ABBR</abbr> and a <abbr 
+            title="Abbreviation Reference">REF</abbr>. Ignore REFERENCE and ref.
+	"""
+
+	p = re.compile(r'\*\[(\w+)\]:\s+(\S.+)')
+
+	newtext = []
+	defs = {}
+
+	for line in text:
+		m = p.match(line)
+		if m:
+			abrr = m.group(1).strip()
+			title = m.group(2).strip()
+			defs[abrr] = title
+		else:
+			newtext.append(line)
+
+	newtext = "<<<<SPLITMEOVERHERE>>>>".join(newtext)
+	for key, value in defs.items():
+		newtext = re.sub(r'\s'+key+r'([\s\.,:;\?!]{1}?)', 
+			             r' <abbr title="'+value+'">'+key+'</abbr>\\1', 
+			             newtext)
+
+	newtext = newtext.split("<<<<SPLITMEOVERHERE>>>>")
+
+	return newtext
+
+def parse_admonitions(text):
+	""" Find and parse my admonitions. 
+	Input text: as list (just after open)
+	returns parsed text as list
+
+	Syntax:
+	[class/type:optional title]
+      * markdown
+      * super
+      * content
+    
+	would be translated as div:
+	<div class="admonition class/type">
+	<p class="admonition-title"> Optional title </p>
+      * markdown
+      * super
+      * content
+	</div>
+    """
+
+	new_test = list()
+	admon_start = False
+
+	for line in text:
+		tmp_line = line.rstrip()
+
+		if tmp_line.count("[") == 1 and tmp_line.startswith("[") and tmp_line.endswith("]"):
+			if admon_start:
+				# close previous
+				new_test.append("</div>")
+
+			admon_start = True
+
+			tmp_line = tmp_line[1:len(tmp_line)-1]
+            
+			if ":" in tmp_line:
+				admon_type, admon_title = tmp_line.split(':')
+			else:
+				admon_type = tmp_line
+				admon_title = None
+
+			new_str = '<div class="admonition ' + admon_type + '">'
+			new_test.append(new_str)
+
+			if admon_title:
+				new_test.append('<p class="admonition-title">' + admon_title + '</p>')
+
+			continue 
+
+		if (tmp_line.startswith("\t") or tmp_line.startswith ("  ") or not tmp_line) and admon_start:
+			if tmp_line:
+				#remove first set of whitespace
+				if tmp_line.startswith("\t"):
+					tmp_line = line.replace("\t", "", 1)
+				else:
+					tmp_line = re.sub(r'^\s{2,4}(.+)', '\\1', line)
+			else:
+				tmp_line = "\n"
+
+			new_test.append(tmp_line)
+
+		else:
+			if admon_start:
+				new_test.append("</div>")
+
+			new_test.append(line)
+			admon_start = False
+
+	return new_test
+
+def find_TOCinFile(text, placeholder, replace_with='<!-- TOCatized -->'):
+	""" automatically check if text (as list) has the TOC tag. Replaces 
+	placeholder with another string. Returns boolean and text (as list) 
+	only for occurence
+	"""
+
+	for index in range(len(text)):
+		if text[index].startswith(placeholder):
+			text[index] = text[index].replace(placeholder, replace_with)
+			return True, text 
+
+	return False, text 
+
+def parse_internalLinks(text):
+	""" Process "internal links": [nicetitle](file.md) to [nicetitle](file.html)
+	Markdown file opened before as list  
+	return  text 
+	No guessing of title
+
+	ex: wikilinks
+	"""
+
+	extensions = "|".join(ACCEPTED_MD_EXTENSIONS)
+
+	# harvest all links first 
+	links = extractMdLinks(text, extension=extensions)
+
+	for link in links:
+		link_new = path_delExtension(link[1]) + ".html"
+		title_new = link[0]
+
+		link.append(title_new)
+		link.append(link_new)
+
+	# replace in file
+	textNew = "<<<<SPLITMEOVERHERE>>>>".join(text)
+	link_tpl = "[{title}]({link})"
+
+	for link in links:
+		find_me    = link_tpl.format(title=link[0], link=link[1])
+		replace_me = link_tpl.format(title=link[2], link=link[3])
+
+		textNew = textNew.replace(find_me, replace_me)
+
+	return textNew.split("<<<<SPLITMEOVERHERE>>>>")
+
+def parse_wikilinks(text, list_files=None, this_references=None):
+	"""Parse wikilinks (reference links but inverted): [:filename][title]
+	[:filename] can have extension or not.
+	[title] is optional. If blank: searches title
+
+	:text             text as list
+	:list_files       dict. files: any key and holding (minimum):
+	                      path_input, title, output ("future path")
+	:this_references  dict. use this as reference list (do not search in files)
+	                    key: ref id. ex. filenames, can be joined (search w/ "in")
+	                    value['output']: output path ("future path"/html)
+	                    value['title']: file future title 
+
+	return processed text (list) and references (list) of the file
+	"""
+
+	# prefere this_references 
+	if list_files and this_references:
+		list_files = None 
+
+	extensions = "|".join(ACCEPTED_MD_EXTENSIONS)
+	links = extractMdLinks(text, extension=extensions, style='wiki')
+
+	references = list()
+	ref_tpl    = "[{thefile}]: {future_html}"
+	new_links  = list() #filename, title_old and title_new. Later text replacement
+
+	search_in_prop = False
+	listing = this_references
+	if list_files is not None:
+		listing = list_files
+		search_in_prop = True 
+
+	for link in links:
+		filename    = link[0]
+		title_old   = link[1]
+		future_path = ""
+		title_new   = title_old
+
+		for key in listing:
+			look_here = key
+			if search_in_prop:
+				look_here = listing[key]['path_input']
+
+			if filename in look_here:
+				future_path = listing[key]['output']
+					
+				if not title_old:
+					title_new = listing[key]['title']
+
+				# create ref
+				tmp = ref_tpl.format(thefile=filename, future_html=future_path)
+				if not tmp in references:
+					references.append(tmp)
+
+				tmp = [filename, title_old, title_new]
+				if not tmp in new_links:
+					new_links.append([filename, title_old, title_new])
+
+				break 				
+
+	# replace in text 
+	newtext     = "<<<<SPLITMEOVERHERE>>>>".join(text)
+	search_tpl  = "[:{filename}][{title}]"
+	replace_tpl = "[{title}][{filename}]"
+
+	for link in new_links:
+		filename  = link[0]
+		title_old = link[1]
+		title_new = link[2]
+
+		newtext = newtext.replace(
+			search_tpl.format(filename=filename, title=title_old), 
+			replace_tpl.format(filename=filename, title=title_new))
+
+	newtext = newtext.split("<<<<SPLITMEOVERHERE>>>>")
+
+	return newtext, references
+
+def extractMdLinks(text, extension="md", style='inline'):
+	"""Extract markdown links in text with extension. 
+	:text list 
+	:extension the allowed extension
+	:referencestyle    for [][] links 
+	:return a nested list. 
+	             normal: holder(title, link)
+	             reference: holder(title, id_link)
+	:style      style of links. Options: inline | reference | wiki | all or both
+	"""
+
+	list_links = list()
+
+	expr_normal    = "\[(.+?)?\]\((.+?\.(" + extension + "))\)"
+	expr_wiki = "\[:(.+?[\.(" + extension + ")]?)\]\[(|.+?)\]"
+	expr_reference = "\[(.+?[\.(" + extension + ")]?)\]\[(|.+?)\]"
+	# all = inline + reference
+	expr_all = "\[\:?(.+?[\.(" + extension + ")]?)\](?:\[(|.+?)\]|\((.+?[\.(" + extension + ")]?)\))"
+
+	if style == "reference":
+		expr = r'' + expr_reference
+	elif style == "wiki":
+		expr = r'' + expr_wiki
+	elif style == "inline":
+		expr = r'' + expr_normal
+	elif style in ('all', 'both'):
+		expr = r'' + expr_all
+
+	for line in text:
+		matches = re.findall(expr, line)
+		for m in matches:
+			title = m[0].strip()
+			if not style == 'all':
+				link  = m[1].strip()
+			else:
+				link  = m[2].strip()
+
+			if [title, link] not in list_links:
+				list_links.append([title, link])
+
+	return list_links
+
+def findTitleMd(filepath=None, text_lines=None):
+	"""Find title in markdown file. All posibilities (% , title: # and =====)
+	Metadata (% or title:) in the first lines wins over headers. Reads the 
+	file line by line and stops as soon as it knows: only the beginning 
+	of big files is read. 
+	:filepath   path to open file 
+	:text_lines   text in list
+	"""
+
+	if filepath:
+		with cmd_open_write(filepath, 'r') as tmp:
+			return findTitleLines(tmp)
+
+	return findTitleLines(text_lines or [])
+
+def findTitleLines(lines):
+	"""findTitleMd over any iterable of lines (file, list) """
+
+	max_meta = 30 #max lines to look for metadata title
+
+	heading  = None  # first header: only if there is no metadata title
+	previous = ""
+	in_yaml  = False
+	in_fence = False
+
+	def unquote(value):
+		value = value.strip()
+		if len(value) > 1 and value[0] in ("'", '"') and value[-1] == value[0]:
+			value = value[1:-1]
+		return value.strip()
+
+	for number, line in enumerate(lines):
+		stripped = line.rstrip()
+
+		if in_yaml:
+			# YAML front matter: only its title, never headers (# is a comment)
+			if stripped in ("---", "..."):
+				in_yaml = False
+			elif line.startswith("title:"):
+				title = unquote(line[6:])
+				if title not in ("", "|", ">", "|-", ">-"):
+					return title
+				in_yaml = 'title'   # title in the next (indented) line
+			elif in_yaml == 'title' and line.startswith((" ", "\t")) and stripped:
+				return unquote(line)
+			previous = ""
+			continue
+
+		if number == 0 and stripped == "---":
+			in_yaml = True
+			continue
+
+		if number <= max_meta:
+			if line.startswith("% "):
+				return line[1:].strip()
+
+			if line.startswith("title: "):
+				return unquote(line[7:])
+
+		if stripped.startswith(("```", "~~~")):
+			in_fence = not in_fence
+		elif heading is None and not in_fence:
+			if line.startswith("# "):
+				heading = line[2:].strip()
+			elif line.startswith("=======") and previous.strip():
+				heading = previous.strip()
+
+		if heading is not None and number >= max_meta:
+			# nothing found. I'm doing extra work for you, ok? Next time use metadata
+			return heading
+
+		previous = line
+
+	return heading or False
+
+# ==============================
+# == methods: fast markdown ====
+# ==============================
+
+# the markdown fastmd_render knows (anything else: pandoc). Lines starting 
+# with something else than text, headings or list items, and text with 
+# html, smart punctuation, escapes, math, citations, images, footnotes...
+FASTMD_HEADING   = re.compile(r'^(#{1,6}) +(.*?)(?: +#+)? *$')
+FASTMD_BULLET    = re.compile(r'^[-*+] +(\S.*)$')
+FASTMD_ORDERED   = re.compile(r'^(\d+)\. +(\S.*)$')
+FASTMD_LINE_NO   = re.compile(r'^(?:[\s>|:%=~`\[<!\d(]|[-*+_](?! )|[-*+] *$|#\.|[a-zA-Z]+[.)](?: |$))')
+FASTMD_TEXT_NO   = re.compile(r'[_\\<>&"\'$@^~|{}\[\]]|--|\.\.\.|!\[|  ')
+FASTMD_LINK      = re.compile(r'\[([^\[\]]+)\]\(([A-Za-z0-9./:?#=&%+,;_~-]+)\)')
+FASTMD_CODE      = re.compile(r'`([^`\s](?:[^`]*[^`\s])?)`')
+FASTMD_STRONG    = re.compile(r'\*\*(\S(?:[^*]*\S)?)\*\*')
+FASTMD_EMPHASIS  = re.compile(r'\*(\S(?:[^*]*\S)?)\*')
+
+# _fastPage: what pandoc makes of this file is the page for all
+FASTMD_PROBE_NAME = "pandy-fast-probe"
+FASTMD_PROBE_TEXT = "pandyfastprobebody\n"
+FASTMD_PROBE_BODY = "<p>pandyfastprobebody</p>"
+
+def fastmd_render(lines):
+	"""The html body (as pandoc's, with EXTENSIONS_EXTRA) of a simple 
+	markdown: paragraphs, ATX headings, one level lists, emphasis, inline 
+	code and links. None if there is anything else (pandoc then)
+
+	:lines   the file (list, as text_lines)
+	"""
+
+	blocks, current = list(), list()
+	for line in lines + [""]:
+		line = line.rstrip("\r\n").rstrip(" ")
+		if line:
+			current.append(line)
+		elif current:
+			blocks.append(current)
+			current = list()
+
+	html, identifiers = list(), set()
+	while blocks:
+		block = blocks.pop(0)
+
+		heading = FASTMD_HEADING.match(block[0])
+		if heading:
+			text = fastmd_inline(heading.group(2))
+			if not text:
+				return None
+
+			level = str(len(heading.group(1)))
+			ident = fastmd_identifier(text, identifiers)
+			html.append('<h' + level + ' id="' + ident + '">' + text + '</h' + level + '>')
+
+			if len(block) > 1:
+				blocks.insert(0, block[1:])
+			continue
+
+		for kind, pattern, tag in (('ul', FASTMD_BULLET, '<ul>'), ('ol', FASTMD_ORDERED, '<ol type="1">')):
+			items = [pattern.match(line) for line in block]
+			if not items[0]:
+				continue
+
+			if not all(items) or (kind == 'ol' and items[0].group(1) != "1"):
+				return None
+
+			if html and html[-1] in ('</ul>', '</ol>'):
+				return None # blank lines between items: loose list (<p> in them)
+
+			html.append(tag)
+			for item in items:
+				text = item.group(item.lastindex)
+				if not fastmd_plain(text):
+					return None # a block in the item (nested list, heading...)
+
+				text = fastmd_inline(text)
+				if text is None:
+					return None
+				html.append("<li>" + text + "</li>")
+			html.append("</" + kind + ">")
+			break
+		else:
+			texts = list()
+			for line in block:
+				if not fastmd_plain(line):
+					return None
+
+				texts.append(fastmd_inline(line))
+				if texts[-1] is None:
+					return None
+
+			# hard_line_breaks
+			html.append("<p>" + "<br />\n".join(texts) + "</p>")
+
+	return "\n".join(html)
+
+def fastmd_plain(line):
+	"""If the line is only text for pandoc: it doesn't start other block 
+	(lists, fancy_lists too as a) i. (1) #., headings, quotes, code...)
+	"""
+
+	return not (FASTMD_LINE_NO.match(line) or FASTMD_HEADING.match(line) or FASTMD_BULLET.match(line))
+
+def fastmd_inline(text):
+	"""Inline html of a line: code, links, strong, emphasis. None if there is 
+	any other markdown there
+	"""
+
+	result = list()
+	for number, part in enumerate(re.split(r'(`[^`]*`)', text)):
+		if number % 2:
+			code = FASTMD_CODE.fullmatch(part)
+			if not code or "  " in part:
+				return None
+			result.append("<code>" + code.group(1).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;") + "</code>")
+			continue
+
+		if "`" in part:
+			return None
+
+		# links out of the way (\0number\0) while the rest is checked
+		links = list()
+		def link(found):
+			links.append(found)
+			return "\0" + str(len(links) - 1) + "\0"
+
+		part = FASTMD_LINK.sub(link, part)
+		part = FASTMD_STRONG.sub(r'<strong>\1</strong>', part)
+		part = FASTMD_EMPHASIS.sub(r'<em>\1</em>', part)
+
+		if "*" in part or FASTMD_TEXT_NO.search(re.sub(r'</?(?:strong|em)>', '', part)):
+			return None
+
+		for index, found in enumerate(links):
+			label = fastmd_inline(found.group(1))
+			if label is None or found.group(2).startswith("mailto:"):
+				return None
+
+			anchor = '<a href="' + found.group(2).replace("&", "&amp;") + '">' + label + '</a>'
+			part = part.replace("\0" + str(index) + "\0", anchor)
+
+		result.append(part)
+
+	return "".join(result)
+
+def fastmd_identifier(heading, identifiers):
+	"""pandoc's auto_identifiers of a heading (its html): lowercase letters, 
+	numbers, _-. and hyphens for spaces, from the first letter. Repeated: -1, -2...
+
+	:identifiers   set of the ones already used in the document
+	"""
+
+	import html
+
+	text = html.unescape(re.sub(r'<[^>]+>', '', heading)).lower()
+	text = "".join(char for char in text if char.isalnum() or char in "_-." or char.isspace())
+	text = "-".join(text.split())
+
+	while text and not text[0].isalpha():
+		text = text[1:]
+	text = text or "section"
+
+	ident, number = text, 0
+	while ident in identifiers:
+		number += 1
+		ident = text + "-" + str(number)
+	identifiers.add(ident)
+
+	return ident
+
+
+# =============================
+# == methods: Args/options ====
+# =============================
+
+class InputExist(argparse.Action):
+	""" Custom action for args, check if input exists """
+
+	def __call__(self, parser, namespace, values, option_string=None):
+		if values is not None and not os.path.exists(values):
+			parser.error('Source file or folder doesn\'t exist')
+
+		setattr(namespace, self.dest, values)
+
+def get_args():
+	""" Args parsing and translation to nice configs"""
+
+	parser = argparse.ArgumentParser(add_help=False, usage=_MY_USAGE 
+		        , description=help_replaceStringFormats(_MY_DESCRIPTION, 
+		        	            ['{{ _FORMATS_OUTPUT }}', '{{ _FORMATS_BOTHWAYS }}'])
+		        , formatter_class=argparse.RawTextHelpFormatter) 
+
+	required = parser.add_argument_group(' Required')
+	required.add_argument("source", action=InputExist, nargs='?', 
+		    help="file, folder, .list or config file (.ini). Not with --projects")
+	
+	option_file = parser.add_argument_group(' Options:\n\n file related')
+	option_file.add_argument("--from", '-f', metavar="", choices= _FORMATS_BOTHWAYS, help="Convert from this")
+	option_file.add_argument("--to", '-t', nargs='*', choices= _FORMATS_BOTHWAYS + _FORMATS_OUTPUT, 
+		    metavar="", help="Convert to this (can be a space separated list)")
+	option_file.add_argument("--output", "-o", help="Output folder", metavar="FOLDER")
+	option_file.add_argument("--flat", action='store_true', help="Don't keep folder structure")
+	option_file.add_argument("--self", help="self contained file", action='store_true')	
+	option_file.add_argument("--header", metavar="FILE", 
+		    help="Header file. Included as it is (raw, verbatim)")
+	option_file.add_argument("--footer", metavar="FILE", 
+		    help="Footer file. Included as it is (raw, verbatim)")
+	option_file.add_argument("--html4", action="store_true", 
+		    help="Use html4 output instead of html5")
+	option_file.add_argument("--slides", choices=_SLIDES_OPTIONS, metavar="",
+		    help="Slides format. Options: " + ", ".join(_SLIDES_OPTIONS) + ". Default: %(default)s",  
+		    default=_DEFAULT_CONFIG['SLIDES'])
+	option_file.add_argument("--bib", help="Use bibliography file", metavar="FILE")
+	option_file.add_argument("--csl", help="CSL file", metavar="FILE")
+	option_file.add_argument("--parse-raw", help="RAW_HTML", action="store_true")
+
+	exclusive = option_file.add_mutually_exclusive_group()
+	exclusive.add_argument("--merge", "-m", action="store_true", help="Merge files")
+	option_file.add_argument("--volume-size", type=int, metavar="KB", 
+		    help="(With --merge) split in volumes of at most KB of sources, converted in parallel")
+	option_file.add_argument("--volume-files", type=int, metavar="N", 
+		    help="(With --merge) split in volumes of at most N files")
+	exclusive.add_argument("--book", "-b",  action="store_true", 
+		    help="Make a book with navigation (next/prev) and index")
+
+	style = parser.add_argument_group(' styling')
+	style.add_argument("--css", help="External CSS", metavar="FILE")
+
+	style.add_argument("--highlight", choices=_HIGHLIGHT_OPTIONS,  metavar="",
+		    default=_DEFAULT_CONFIG['HIGHLIGHT'], 
+		    help="Highlight style. Options: " + ", ".join(_HIGHLIGHT_OPTIONS) + ". Default: %(default)s")
+	style.add_argument("--highlight-no", help="No highlight", action='store_true')
+	style.add_argument("--tpl", metavar="FILE",
+		    help="Template file. Can enter 'default' for pandoc's default.")
+	style.add_argument("--tpl-pandy", help="Pandy's embebed template: simple and not that ugly", 
+		                              action='store_true')
+	style.add_argument("--tpl-pandy-css", action='store_true', 
+		    help="(With --tpl-pandy) CSS in a shared file instead of inside every page")
+
+	other = parser.add_argument_group(' other')
+	other.add_argument("--toc", help="include TOC", action='store_true')
+	other.add_argument("--depth", type=int, choices=[1, 2, 3, 4, 5, 6], metavar="",
+		    help="TOC depth. Choices: 1, 2, 3, 4, 5, 6. Default: %(default)s", 
+		    default=_DEFAULT_CONFIG['TOC_DEPTH'])
+	other.add_argument("--hide", action='store_true', 
+		    help="e-mail obfuscation (default none, true = references)")
+	other.add_argument("--sections", action='store_true', 
+		    help="Wrap sections in <sections>, attach identifiers instead of titles")
+	other.add_argument("--config", metavar="FILE", 
+		    help="Use a configuration file (option=key values)")
+	other.add_argument("--metrics", metavar="FILE", 
+		    help="Write Prometheus metrics (textfile collector) at the end of the run")
+	other.add_argument("--jobs", "-j", type=int, metavar="N", default=_DEFAULT_CONFIG['JOBS'], 
+		    help="Conversions running at the same time. Default: %(default)s")
+	other.add_argument("--lane-heavy", type=int, metavar="N", 
+		    help="Heavy formats (epub, docx, odt, fb2) converting at the same time. Default: half of --jobs")
+	other.add_argument("--lane-latex", type=int, metavar="N", 
+		    help="PDF (LaTeX) conversions at the same time. Default: %(default)s", default=_DEFAULT_CONFIG['LANE_LATEX'])
+	other.add_argument("--lane-latex-memory", type=int, metavar="MB", 
+		    help="Memory for all the PDF (LaTeX) conversions together")
+	other.add_argument("--keep-going", "-k", action="store_true", 
+		    help="Don't stop at the first failure: convert the rest, then summary and error")
+	other.add_argument("--retry-failed", action="store_true", 
+		    help="Only convert the files that failed in the last run")
+	other.add_argument("--timeout", type=float, metavar="SECONDS", 
+		    help="Kill pandoc if a conversion takes longer, and report the file")
+	other.add_argument("--limit-memory", type=int, metavar="MB", 
+		    help="Memory (address space) for each pandoc. Not on Windows")
+	other.add_argument("--limit-cpu", type=int, metavar="SECONDS", 
+		    help="CPU time for each pandoc. Not on Windows")
+	other.add_argument("--cache", metavar="FOLDER", 
+		    help="Keep the outputs by content in FOLDER, shared by projects and runs. Default: $PANDY_CACHE_DIR")
+	other.add_argument("--cache-size", type=int, metavar="MB", 
+		    help="Size of the cache, least recently used out first. Default: %(default)s", default=_DEFAULT_CONFIG['CACHE_SIZE'])
+	other.add_argument("--fast-md", action="store_true", 
+		    help="Simple markdown files (paragraphs, headings, lists, emphasis, code, links) to HTML without pandoc")
+	other.add_argument("--dry-run", action="store_true", 
+		    help="Only print the build plan and its estimated critical path")
+	other.add_argument("--check", action='store_true', 
+		    help="Don't convert: report broken links, duplicated titles, files out of the index and outputs collisions")
+	other.add_argument("--shard", metavar="i/N", 
+		    help="Convert only slice i of N (other machines do the rest). Writes a manifest")
+	other.add_argument("--shard-merge", type=int, metavar="N", 
+		    help="Check that the manifests and outputs of the N shards are complete")
+	other.add_argument("--projects", nargs='+', metavar="INI", 
+		    help="Build many projects (.ini files, or folders with them) sharing the --jobs workers")
+
+	other.add_argument("--no-nav", "-nn", action="store_true", 
+		    help="(For book) disable book navigation")
+	other.add_argument("--nav-title", "-nt", action="store_true", 
+		    help="(For book) use titles in book navigation")
+	other.add_argument("--no-side", "-ns", action="store_true", 
+		    help="(For book) Disable sidebar navigation")
+	other.add_argument("--no-side-toc", "-nst", action="store_true", 
+		    help="(For book) disable TOC in sidebar (keep in doc)")
+	other.add_argument("--side-shared", action="store_true", 
+		    help="(For book) sidebar in one shared .js file (rendered by the browser), not in every page")
+	other.add_argument("--search", action="store_true", 
+		    help="(For book) search box in the sidebar, with a prebuilt index")
+	other.add_argument("--index-split", type=int, metavar="N", 
+		    help="(For book, without custom index) one index page per folder, N files per page at most")
+	other.add_argument("--chunked", action="store_true", 
+		    help="(For book) all pages rendered by one pandoc (chunkedhtml, pandoc >= 3), with pandy's template")
+			 
+	pandoc = parser.add_argument_group(' Pandoc')
+	pandoc.add_argument("--pandoc",   default=_DEFAULT_CONFIG['PANDOC'], 
+		    help="Pandoc path. Default: %(default)s")
+	pandoc.add_argument("--data-dir", default="", help="Data directory", metavar="FOLDER")
+
+	nocateg = parser.add_argument_group(' Last but not least')
+	nocateg.add_argument("--help", "-h", help="show this help message and exit", action="help") 
+	nocateg.add_argument('--version', action='version', version='%(prog)s ' + __version__)
+
+	arg_dict = vars(parser.parse_args())
+	if arg_dict['source'] is None and not arg_dict['projects']:
+		parser.error('Source file or folder is required (or --projects)')
+
+	if arg_dict['to'] is not None:
+		arg_dict['to'] = set(arg_dict['to'])
+
+	#convert those ugly names to the nice ones
+	argsToSettings = {
+		'output': 'OUTPUT_PATH',
+		'flat': 'OUTPUT_FLAT',
+		'self': 'SELF_CONTAINED',
+		'css': 'CSS_EXTERNAL',
+		'tpl': 'TEMPLATE',
+		'hide': 'EMAIL_HIDE',
+		'bib': 'BIBLIOGRAPHY',
+		'nav_title': 'NAV_TITLE',
+		'data_dir': 'PANDOC_DATA_DIR',
+		'html4': 'HTML_VER',
+		'header': 'FILE_HEADER',
+		'footer': 'FILE_FOOTER',
+		'depth' : 'TOC_DEPTH',
+		'no_side' : 'NAV_SIDEBAR',
+		'no_nav' : 'USE_NAV',
+		'config' : 'CONFIG_FILE',
+		'no_side_toc' : 'NAV_SIDEBAR_TOC',
+		'side_shared' : 'NAV_SIDEBAR_SHARED',
+		'search' : 'SEARCH_INDEX',
+		'chunked' : 'BOOK_CHUNKED',
+		'index_split' : 'INDEX_SPLIT',
+		'from': 'FORMAT_FROM',
+		'to': 'FORMAT_TO',
+		'tpl_pandy': "TEMPLATE_PANDY",
+		'tpl_pandy_css': "TEMPLATE_PANDY_CSS",
+		'metrics': 'METRICS_FILE',
+		'jobs': 'JOBS',
+		'dry_run': 'DRY_RUN',
+		'lane_heavy': 'LANE_HEAVY',
+		'lane_latex': 'LANE_LATEX',
+		'lane_latex_memory': 'LANE_LATEX_MEMORY',
+		'keep_going': 'KEEP_GOING',
+		'retry_failed': 'RETRY_FAILED',
+		'timeout': 'TIMEOUT',
+		'limit_memory': 'LIMIT_MEMORY',
+		'limit_cpu': 'LIMIT_CPU',
+		'cache': 'CACHE_DIR',
+		'cache_size': 'CACHE_SIZE',
+		'fast_md': 'FAST_MD',
+		'projects': 'PROJECTS',
+		'shard': 'SHARD',
+		'check': 'CHECK',
+		'shard_merge': 'SHARD_MERGE',
+
+		#convert to upper
+		'pandoc': 'PANDOC',
+		'highlight': 'HIGHLIGHT',
+		'slides': 'SLIDES',
+		'source': 'SOURCE',
+		'sections': 'SECTIONS',
+		'toc': 'TOC',
+		'merge': 'MERGE',
+		'volume_size': 'MERGE_VOLUME_SIZE',
+		'volume_files': 'MERGE_VOLUME_FILES',
+		'book': 'BOOK',
+		'highlight_no': 'HIGHLIGHT_NO',
+		'csl': "CSL",
+		'parse_raw' : 'RAW_HTML',
+		}
+
+	settings_args = dict()
+
+	def toggleBool(val):
+		if val:
+			return False 
+		return True 
+
+	# transfer & translate
+	for key, val in arg_dict.items():
+		if key == "html4":
+			val = 'html' if val else 'html5'
+
+		if key in ('no_nav', 'no_side_toc', 'no_side'):
+			val = toggleBool(val)
+
+		settings_args[argsToSettings[key]] = val 
+
+	if settings_args['SOURCE'] == ".":
+		settings_args['SOURCE'] = os.getcwd()
+
+	return settings_args
+
+def prepare_args(arg_dict):
+	""" Prepares the args to a nice config dictionary. Also reads .ini """
+	
+	settings_final = dict(_DEFAULT_CONFIG)
+
+	if arg_dict['SOURCE'].endswith(".ini"):
+		settings_final['CONFIG_FILE'] = arg_dict['SOURCE']
+		del arg_dict['SOURCE']
+
+	# complete missing options. default <- .ini <- args 
+	# read ini and replace default
+	if os.path.exists(settings_final['CONFIG_FILE']):
+		settings_file = get_ini(settings_final['CONFIG_FILE'], True, space_list=('format_to','extensions_extra'))
+		settings_final.update(settings_file)
+
+	#remove config option (just because)
+	del settings_final['CONFIG_FILE']
+
+	# now args
+	# remove default values from arg_dic -> not overwrite
+	for key, val in _DEFAULT_CONFIG.items():
+		if key in arg_dict and arg_dict[key] == val:
+			del arg_dict[key]
+
+	#Take care of specials
+	for key, val in list(arg_dict.items()):
+		if val is None:
+			del arg_dict[key]
+
+	settings_final.update(arg_dict)
+
+	# Check option belonging, replace special keys, etc 
+	# if pdf, warn that needs latex 
+	if "pdf" in settings_final['FORMAT_TO']:
+		answer = msg_cli_yesno("  To convert to PDF needs LaTeX installed (and in PATH)")
+		if not answer:
+			exit()
+
+	if settings_final['TEMPLATE'] == "NONE":
+		settings_final['TEMPLATE'] = ""
+
+	if settings_final['SOURCE'].endswith(".list") and not settings_final['OUTPUT_FLAT']:
+		msg("Keeping folder structure with .list not supported. Skipping option")
+		settings_final['OUTPUT_FLAT'] = True 
+
+	#Special belonging if not book, just to clean up
+	if not settings_final['BOOK']:
+		if (settings_final['NAV_TITLE'] or settings_final['NAV_SIDEBAR'] 
+			or settings_final['USE_NAV']):
+
+			settings_final['NAV_TITLE']   = False
+			settings_final['NAV_SIDEBAR'] = False
+			settings_final['USE_NAV']     = False
+
+	if settings_final['TEMPLATE_PANDY'] and settings_final['TEMPLATE']:
+		msg("How cute, but you have to specify only one. Disabling pandy's")
+		settings_final['TEMPLATE_PANDY'] = False 
+
+	return settings_final
+
+# ============
+# == Misc ====
+# ============
+
+def getTOC(html):
+	"""Returns the TOC list as str (splitting from <body>) """
+
+	if drinkSoup:
+		soup = BeautifulSoup(html)
+		soup = soup.body
+
+		toc = soup.find(id='TOC')
+		if toc:
+			toc = toc.extract()
+			toc = toc.ul
+			return str(toc)
+
+		return ''
+
+	else:		
+		text = html.split("<body>")[1]
+		text = text.split("</body>")[0]
+
+		if not '<div id="TOC">' in text:
+			return ''
+
+		text = text.split('<div id="TOC">')[1]
+		text_parts = text.split('</div>')
+		toc = text_parts[0]
+		toc = toc.splitlines()
+		toc = [line for line in toc if line]
+		#toc = toc[1:-1] # remove first <ul> and last </ul>
+		return "".join(toc)
+
+def orderListFromList(orderthis, fromthis, bythiscol=None):
+	"""Order a list, based on another by value. 
+
+	:orderthis    list to be ordered 
+	:fromthis     new order list 
+	:bythiscol    "column" number to order by this value set 
+	"""
+
+	tmp_list = list()
+
+	for new_order in fromthis:
+		for item in orderthis:
+			checkthis = new_order
+			if bythiscol is not None:
+				checkthis = new_order[bythiscol]
+
+			#we trust the user that will be no files with same name
+			if checkthis in item:
+				tmp_list.append(item)
+				break 
+
+	return tmp_list
+
+def help_replaceStringFormats(string, placeholders):
+	"""Replaces placeholders in string, with _FORMATS_BOTHWAYS and _FORMATS_OUTPUT
+	
+	string      : complete string 
+	placeholders: list of placeholders; what to replace -> converts to list to join
+
+	returns processed string 
+	"""
+
+	for placeholder in placeholders:
+		tmp = ""
+		# get the list name
+		the_choosen_one = placeholder[3:len(placeholder) - 3] 
+
+		if the_choosen_one == "_FORMATS_OUTPUT":
+			the_list = _FORMATS_OUTPUT
+		else:
+			the_list = _FORMATS_BOTHWAYS
+
+		is_synom = False
+		
+		for item in the_list:
+
+			if the_choosen_one == "_FORMATS_OUTPUT":
+				is_synom = True if item in ["doc", "opendoc", "slide"] else False 
+			else:
+				if item.startswith("md"):
+					continue 
+
+				is_synom = True if item == 'md' else False 
+
+			if is_synom:
+				tmp += " (or " + item + ")"
+			else:
+				tmp += ", " + item
+
+		tmp = tmp[2:] # delete fist ", "
+		string = string.replace(placeholder, tmp)
+
+	return string
+
+def index_folders(outputs):
+	"""Book outputs (relative, "/" separated, in book order) by folder, for 
+	the index split by folders: dict folder ("" the root): {'files': outputs 
+	in it, 'folders': its subfolders, 'total': files in it and below}. All 
+	the parents of a folder are there, even without files
+	"""
+
+	import posixpath
+
+	folders = {"": {'files': list(), 'folders': list(), 'total': 0}}
+
+	def add(folder):
+		if folder not in folders:
+			folders[folder] = {'files': list(), 'folders': list(), 'total': 0}
+			add(posixpath.dirname(folder))['folders'].append(folder)
+		return folders[folder]
+
+	for output in outputs:
+		folder = posixpath.dirname(output)
+		add(folder)['files'].append(output)
+
+		while True:
+			folders[folder]['total'] += 1
+			if not folder:
+				break
+			folder = posixpath.dirname(folder)
+
+	return folders
+
+def index_pageName(number):
+	"""File name of the page number (from 1) of a folder index """
+
+	return "index.html" if number == 1 else "index-{0}.html".format(number)
+
+def merge_volumes(files, max_size=0, max_files=0):
+	"""Split the (ordered) files in volumes of at most max_size bytes (of 
+	sources) and max_files files. A bigger file gets a volume of its own. 
+	0: no limit. Returns list of lists
+	"""
+
+	volumes = [list()]
+	size = 0
+
+	for filey in files:
+		filesize = os.path.getsize(filey)
+		current = volumes[-1]
+
+		full = (max_files and len(current) >= max_files) or (max_size and size + filesize > max_size)
+		if current and full:
+			volumes.append(list())
+			size = 0
+
+		volumes[-1].append(filey)
+		size += filesize
+
+	return volumes
+
+def merge_frontPage(title, volumes, exts):
+	"""HTML front page for a merge in volumes: links to every volume 
+	(in each format) with the first and last file it has.
+
+	:volumes   list of (name of the volume, files)
+	:exts      output extensions
+	"""
+
+	import html
+
+	items = list()
+	for number, (name, files) in enumerate(volumes, 1):
+		links = " ".join('<a href="{0}.{1}">{1}</a>'.format(html.escape(name), ext) for ext in exts)
+		first, last = path_getFilename(files[0]), path_getFilename(files[-1])
+		items.append("<li>Volume {0}: {1} <small>({2} - {3}, {4} files)</small></li>".format(
+			number, links, html.escape(first), html.escape(last), len(files)))
+
+	return HTML_VOLUMES.format(title=html.escape(title), volumes="\n".join(items))
+
+def chunks_source(texts):
+	"""One markdown for pandoc's chunkedhtml: each text (the book pages, in 
+	order) after a marker heading, so every page starts a chunk (see chunks_read)
+	"""
+
+	source = list()
+	for number, text in enumerate(texts):
+		marker = CHUNK_MARKER.format(number)
+		source.append("\n\n# " + marker + " {#" + marker + " .unnumbered}\n\n" + text)
+
+	return "".join(source)
+
+def chunks_metadata(lines):
+	"""The page (lines) without its metadata at the start (pandoc title block 
+	or YAML front matter): in the middle of the book it would be text, or 
+	metadata for the whole book. Returns (lines, if it had)
+	"""
+
+	if lines and lines[0].startswith('%'):
+		end = 1
+		while end < len(lines) and (lines[end].startswith('%') or lines[end][:1] in (' ', '\t') and lines[end].strip()):
+			end += 1
+		return lines[end:], True
+
+	if lines and lines[0].rstrip() == '---':
+		for end in range(1, len(lines)):
+			if lines[end].rstrip() in ('---', '...'):
+				return lines[end + 1:], True
+
+	return lines, False
+
+def chunks_read(folder, outputs=None):
+	"""The pages back from the chunkedhtml output (see chunks_source, 
+	CHUNK_TEMPLATE). Chunks without marker (a heading 1 of the page) go with 
+	the page before. Returns dict number: {part: html} (CHUNK_PARTS)
+
+	:outputs   dict number: output path of the page. Links to the chunks 
+	           (NNN.html#id) go to the pages then, see chunks_links
+	"""
+
+	names = [name for name in os.listdir(folder) if name.endswith(".html")]
+	names.sort(key=lambda name: -1 if name == "index.html" else int(re.sub(r'\D', '', name) or 0))
+
+	pages, chunk_of, current = dict(), dict(), None
+	for name in names:
+		parts = dict(zip(CHUNK_PARTS, CHUNK_SPLIT.split(cmd_open_file(os.path.join(folder, name)), 3)))
+		found = CHUNK_FOUND.search(parts.get('body', ''))
+
+		if found:
+			current = int(found.group(1))
+			parts['body'] = re.sub(r'<h1[^>]*>\s*' + CHUNK_MARKER.format(current) + r'\s*</h1>', '', parts['body'])
+			pages[current] = parts
+		elif current is not None and 'body' in parts:
+			pages[current]['body'] += parts['body']
+		else:
+			continue
+
+		chunk_of[name] = current
+
+	if outputs is not None:
+		chunks_links(pages, chunk_of, outputs)
+
+	return pages
+
+def chunks_ids(body):
+	"""Heading ids of a page as pandoc makes them for the page alone: in one 
+	document for the whole book the repeated ones got -1, -2... (a second 
+	"Introduction" is introduction-1) and the TOCs (of each page) and the 
+	links of the page point to the first. Explicit ids are kept. 
+	Returns (body, dict book id: page id)
+	"""
+
+	identifiers, changed = set(), dict()
+
+	def page_id(match):
+		book_id, text = match.group(2) or match.group(3), match.group(4)
+		if book_id.startswith(CHUNK_MARKER.format("")):
+			return match.group(0)
+
+		auto_id = fastmd_identifier(text, set())
+		if book_id != auto_id and not re.match(re.escape(auto_id) + r'-\d+$', book_id):
+			identifiers.add(book_id)
+			return match.group(0)
+
+		new_id = fastmd_identifier(text, identifiers)
+		if new_id == book_id:
+			return match.group(0)
+
+		changed[book_id] = new_id
+		return match.group(1).replace('id="' + book_id + '"', 'id="' + new_id + '"', 1) + match.group(4) + match.group(5)
+
+	return CHUNK_HEADING.sub(page_id, body), changed
+
+def chunks_links(pages, chunk_of, outputs):
+	"""(see chunks_read) Page ids again (see chunks_ids), and the links that 
+	pandoc made to its chunks (NNN.html#id) to the pages: #id if the page has 
+	it (a link of the page to itself), if not to the output of the other page
+
+	:chunk_of   dict chunk file name: page number
+	"""
+
+	changed = dict()
+	for number, parts in pages.items():
+		parts['body'], changed[number] = chunks_ids(parts['body'])
+
+	for number, parts in pages.items():
+		here = outputs[number]
+		own  = set(re.findall(r'<(?:section|h[1-6])\b[^>]*?\bid="([^"]*)"', parts['body']))
+
+		def page_link(match):
+			name, fragment = match.group(1), match.group(2)
+			if name not in chunk_of:
+				return match.group(0)
+
+			if fragment and fragment[1:] in own:
+				return 'href="' + fragment + '"'
+
+			target = chunk_of[name]
+			if fragment:
+				fragment = "#" + changed[target].get(fragment[1:], fragment[1:])
+
+			if target == number:
+				return 'href="' + (fragment or "#") + '"'
+
+			href = os.path.relpath(outputs[target], os.path.dirname(here)).replace(os.sep, "/")
+			return 'href="' + href + (fragment or "") + '"'
+
+		parts['body'] = re.sub(r'href="(\d+\.html)(#[^"]*)?"', page_link, parts['body'])
+
+def chunks_page(parts, title, header=False):
+	"""Standalone html of one page from its chunk (see chunks_read), 
+	ready for pandy's template
+
+	:header   the title on the page, as pandoc does when the page has it in 
+	          its metadata (see chunks_metadata)
+	"""
+
+	import html
+
+	body = parts.get('before', '') + parts.get('body', '') + parts.get('after', '')
+	if header:
+		body = HTML_CHUNK_TITLE.format(title=html.escape(title)) + body
+
+	return HTML_CHUNK_PAGE.format(title=html.escape(title), head=parts.get('head', ''), body=body)
+
+MSG_CONTEXT = threading.local() # .prefix of the msg() lines of this thread, see msg_prefixed
+
+def msg(message, indent=2):
+	""" Because I always forget to include X spaces in the beginning 
+
+	:message     string message
+	:indent  amount of spaces
+	"""
+
+	prefix = getattr(MSG_CONTEXT, 'prefix', '')
+	if prefix:
+		text = message.lstrip("\n ")
+		message = message[:len(message) - len(text)] + prefix + text
+
+	print(" "*indent + message)
+
+def msg_prefixed(prefix, action):
+	"""action (callable) whose msg() lines start with prefix. Ex: the 
+	project of the line, with many projects in one pool (--projects)
+	"""
+
+	def prefixed(*args, **kwargs):
+		previous = getattr(MSG_CONTEXT, 'prefix', '')
+		MSG_CONTEXT.prefix = prefix
+		try:
+			return action(*args, **kwargs)
+		finally:
+			MSG_CONTEXT.prefix = previous
+
+	return prefixed
+
+def builtintpl(html, book_nav='', sidebar='', projindex='', pagetitle='', css_href=''):
+	"""Custom/embebed template; using pandoc's default. The whole page at 
+	once (str), see TemplateStream
+
+	:css_href   link this stylesheet (see builtintpl_css) instead of inlining HTML_CSS
+	"""
+
+	parts = list()
+	template = TemplateStream(parts.append, book_nav=book_nav, sidebar=sidebar, 
+		                      projindex=projindex, pagetitle=pagetitle, css_href=css_href)
+	template.feed(html.encode('utf-8'))
+	template.close()
+
+	return str(b"".join(parts), encoding='utf-8')
+
+class TemplateStream(object):
+	"""Pandy's template (see builtintpl) on pandoc's output while it comes: 
+	feed() the chunks, close() at the end; write() gets the page. Injects 
+	before </head>, after <body> and before </body>, keeping only enough 
+	bytes to find a tag cut between chunks
+	"""
+
+	def __init__(self, write, book_nav='', sidebar='', projindex='', pagetitle='', css_href=''):
+		if css_href:
+			head = '<link rel="stylesheet" href="' + css_href + '" />'
+		else:
+			head = '<style type="text/css">' + HTML_CSS + "</style>"
+
+		bookbar = HTML_BOOKBAR.format(projectindex=projindex, pagetitle=pagetitle, 
+			           book_navigation=book_nav)
+
+		code_before = HTML_BEFORE.format(bookbar=bookbar, side_navigation=sidebar)
+		code_after  = HTML_AFTER.format(bookbar=bookbar)
+
+		self.write  = write
+		self.buffer = b''
+		self.marks  = [ # tag, code, goes before the tag
+			(b'</head>', head.encode('utf-8'), True), 
+			(b'<body>', code_before.encode('utf-8'), False), 
+			(b'</body>', code_after.encode('utf-8'), True)]
+
+	def feed(self, chunk):
+		self.buffer += chunk
+
+		while self.marks:
+			tag, code, before = self.marks[0]
+			found = self.buffer.find(tag)
+			if found < 0:
+				break
+
+			end = found + len(tag)
+			if before:
+				self.write(self.buffer[:found] + code + tag)
+			else:
+				self.write(self.buffer[:end] + code)
+
+			self.buffer = self.buffer[end:]
+			self.marks.pop(0)
+
+		# what could be the start of the next tag waits for the next chunk
+		keep = len(self.marks[0][0]) - 1 if self.marks else 0
+		if len(self.buffer) > keep:
+			cut = len(self.buffer) - keep
+			self.write(self.buffer[:cut])
+			self.buffer = self.buffer[cut:]
+
+	def close(self):
+		if self.buffer:
+			self.write(self.buffer)
+		self.buffer = b''
+
+def builtintpl_css(folder):
+	"""Save HTML_CSS once in folder, named by its content (pandy.HASH.css) so 
+	browsers can cache it forever. Returns the file path
+	"""
+
+	data = HTML_CSS.encode('utf-8')
+	name = "pandy." + hashlib.sha1(data).hexdigest()[:10] + ".css"
+	path = os.path.join(folder, name)
+
+	path_mkdir(folder)
+	save_ifChanged(path, data)
+
+	return path
+
+def navigation_js(folder, items):
+	"""Save the book navigation once in folder, as pandy-nav.HASH.js: 
+	the data (PANDY_NAV) and the code to render it (NAV_JS). 
+
+	:items   list of [href from root, title, toc html]
+	returns the file path
+	"""
+
+	data = json.dumps(items, ensure_ascii=True, separators=(',', ':'))
+	data = data.replace("</", "<\\/") # no closing script tags, ever
+
+	code = ("var PANDY_NAV = " + data + ";\n" + NAV_JS).encode('utf-8')
+	name = "pandy-nav." + hashlib.sha1(code).hexdigest()[:10] + ".js"
+	path = os.path.join(folder, name)
+
+	path_mkdir(folder)
+	save_ifChanged(path, code)
+
+	return path
+
+
+# ==============
+# == Pandy! ====
+# ==============
+
+class Pandy(object):
+	"""Handles the parsing and related. 
+
+	Also a reusable build session: create it with autorun=False and call 
+	build() as many times as needed. Settings, base command and the file 
+	metadata cache (book) are kept between builds.
+	"""
+
+	def __init__(self, config_dict, autorun=True):
+		""" Preparation, config_dict must been checked and translated before 
+
+		:autorun   run right away (CLI). False to use it as a session: plan()/build()
+		"""
+
+		self.settings        = config_dict
+		self.input           = config_dict['SOURCE']
+		self.output          = config_dict['OUTPUT_PATH']
+		self.format_from     = config_dict['FORMAT_FROM']
+		self.format_to       = config_dict['FORMAT_TO']
+		self.files           = []
+		self.command         = []
+		self.command_base    = []
+		self.db_files        = dict()
+		self.references_list = dict()
+		self.references_all  = ""
+		self.stats           = stats_new()
+		self.lock            = threading.Lock() # stats, from the workers
+		self.limits          = {'timeout': float(self.settings['TIMEOUT'] or 0), # for each pandoc, see popen_limited
+		                        'memory': float(self.settings['LIMIT_MEMORY'] or 0), 
+		                        'cpu': float(self.settings['LIMIT_CPU'] or 0)}
+		self.latex_memory    = 0      # MB for each LaTeX conversion, see plan_lanes
+		self.local           = threading.local() # .ext: format of the worker's conversion
+		self.only_files      = None   # build(paths): convert only these
+		self.css_shared      = ''     # book, pandy's template: shared CSS path
+		self.nav_shared      = ''     # book: shared navigation .js path
+		self.tmp_dir         = ''     # temporal files of the run (metadata files)
+		self.cache_metadata  = dict() # path: (mtime, size, properties)
+		self.index_config    = config_dict['FILE_INDEX']
+		self.shard           = None   # (i, N) see shard_parse
+		self.shard_plan      = None   # shard_planHash of the whole plan
+		self.project_index   = None   # ProjectIndex, book only
+		self.digests         = dict() # individually: path: sha1 of the possibly identical sources
+		self.cache           = None   # ConversionCache (CACHE_DIR)
+		self.chunked         = False  # book rendered by one pandoc (BOOK_CHUNKED)
+		self.chunks          = None   # chunked book: number: parts of the page (see chunks_read)
+		self.fast_pages      = dict() # FAST_MD: command: pandoc's page around the body (see _fastPage)
+		self.index_tree      = dict() # book, INDEX_SPLIT: see index_folders
+		self.index_files     = dict() # book, INDEX_SPLIT: output: file properties
+		self.files_position  = dict() # book: file: its position in self.files (navigation)
+
+		if self.settings['CACHE_DIR']:
+			version = ".".join(str(tmp) for tmp in pandoc_version(self.settings['PANDOC']))
+			self.cache = ConversionCache(self.settings['CACHE_DIR'], int(self.settings['CACHE_SIZE'] or 0) * 1024 * 1024, version)
+
+		if self.settings['SHARD']:
+			try:
+				self.shard = shard_parse(self.settings['SHARD'])
+			except ValueError:
+				msg("Shard must be i/N, where 1 <= i <= N. Ex: 2/4")
+				exit()
+
+		self.format_from, self.format_to = check_synonyms(self.format_from, self.format_to)
+
+		self.discover()
+
+		# make base pandoc command
+		self.command_base.append(self.settings['PANDOC'])
+		self.command_base += self._cmdFromToOut('f', self.format_from)
+		self.command_base.append('--standalone')  # complete html --standalone
+
+		# Exclude: do not treat right now or already done
+		exclude = ("FORMAT_TO", "FORMAT_FROM", "SOURCE", "OUTPUT_PATH", "MERGE",
+			"OUTPUT_FLAT", "SLIDES", "BOOK", "HTML_VER", "PANDOC", "FILE_INDEX")
+
+		# Add the options
+		for key, val in self.settings.items():
+			if key in exclude:
+				continue
+			self.command_base += translate_argsPandoc(key, val)
+
+		self.command = list(self.command_base)
+
+		# and run!
+		if autorun:
+			self.run()
+
+	def discover(self):
+		"""(Re)scan the source: files to convert and index. """
+
+		exts = tuple()
+		if self.format_from == "html":
+			exts = (".html", ".htm")
+
+		self.settings['FILE_INDEX'] = self.index_config
+		self.files = files_list(self.input, only_exts=exts, exclude_files=[DEFAULT_INI_NAME])
+
+		# find index. file
+		i = 0
+		total = len(self.files)
+		while i < total:
+			if "index." in self.files[i]:
+				self.settings['FILE_INDEX'] = self.files[i]
+				del self.files[i]
+				break
+			i += 1
+
+		return self.files
+
+	def plan(self):
+		"""What a build would do, without doing it. Returns the build plan: 
+		list of Job (see _makePlan), with estimates from previous runs
+		"""
+
+		jobs = self._makePlan()
+
+		if self.shard:
+			self.shard_plan = shard_planHash(jobs, path_get(self._durationsPath()))
+			jobs = self._shardJobs(jobs)
+
+		for job in plan_dedupe(jobs, self._convertKey):
+			job.action = functools.partial(self._copyFile, job)
+
+		plan_estimate(jobs, durations_load(self._durationsPath()))
+		plan_priorities(jobs)
+
+		return jobs
+
+	def _convertKey(self, job):
+		"""For plan_dedupe: same source content, same format, same file name 
+		(pandoc may use it, as the default title) => same output. Only the 
+		conversions of individual files
+		"""
+
+		if job.kind != 'convert' or job.input not in self.digests:
+			return None
+
+		return (self.digests[job.input], job.format, path_getFilename(job.input))
+
+	def _shardJobs(self, jobs):
+		"""Only the jobs of this shard (--shard i/N). Metadata jobs (book scan, 
+		without pandoc, and order) run in all shards, so all have the same 
+		titles, order and nav. The TOCs only where pages or index use them
+		"""
+
+		number, total = self.shard
+
+		return shard_jobs(jobs, number, total)
+
+	def build(self, paths=None):
+		"""Rescan the source and convert. 
+
+		:paths   list of source files to convert. None: all of them. 
+		         (book: the whole book is scanned for navigation anyway)
+		returns the stats of this build (see stats_new)
+		"""
+
+		self.discover()
+
+		self.only_files = None
+		if paths is not None:
+			self.only_files = set(os.path.abspath(path) for path in paths)
+
+		self.run()
+
+		return self.stats
+
+	def _wanted(self, filepath):
+		"""If filepath has to be converted in this build (see build()) """
+
+		return self.only_files is None or os.path.abspath(filepath) in self.only_files
+
+	def _cmdFromToOut(self, way, markup, outputpath=None):
+		""" Create from/to/output (way param) command. returns the command (list)
+		way is a char string: f, t, o 
+		"""
+
+		makeme = ["-" + way]
+
+		if way in ['f', 't']:
+			if markup == 'markdown':
+				extensions = ""
+				for tmp in self.settings['EXTENSIONS_EXTRA']:
+					if tmp.startswith("-"):
+						extensions += tmp
+					else:
+						if not extensions:
+							extensions += tmp
+						else:
+							extensions += "+" + tmp
+				makeme += ["markdown+" + extensions]
+
+			elif markup == "slides":
+				makeme.append(self.settings['SLIDES'])
+
+			elif markup == 'html' and way == 't':
+				makeme.append(self.settings['HTML_VER'])
+			else:
+				makeme.append(markup)
+		
+		else:
+			complete_path = outputpath + "." + output_extension(markup)
+
+			makeme.append(complete_path)
+
+			path_mkdir(path_get(complete_path))
+
+		return makeme
+
+	def run(self):
+		"""Start the program ! (and keep the score) """
+
+		self._runStart()
+		jobs = None
+
+		try:
+			jobs = self._prepare()
+			if jobs is not None:
+				lanes, self.latex_memory = plan_lanes(self.settings)
+				failed = plan_run(jobs, self.settings['JOBS'], stop_on_error=not self.settings['KEEP_GOING'], 
+					              lanes=lanes)
+				if failed:
+					self.stats['success'] = False
+					self._printFailed(jobs)
+		except BaseException:
+			self.stats['success'] = False
+			raise
+		finally:
+			self._runFinish(jobs)
+
+	def start(self):
+		"""Start a run whose jobs are run by someone else (many sessions in 
+		one pool, see projects_run): fresh state and the jobs. None if 
+		there's nothing to run. The jobs go to plan_run, then finish(jobs)
+		"""
+
+		self._runStart()
+		return self._prepare()
+
+	def finish(self, jobs, success=True, pooled=False):
+		"""End a run from start(): clean up, save and keep the score 
+
+		:success   if the jobs (and start) went fine
+		:pooled    the durations, cache eviction and metrics are left to the 
+		           pool, once for all its sessions (see projects_finish)
+		"""
+
+		self.stats['success'] = self.stats['success'] and success
+		self._runFinish(jobs, pooled)
+
+	def _runStart(self):
+		"""Fresh state for this run (keeping the caches) """
+
+		import tempfile
+
+		self.stats           = stats_new()
+		self.command         = list(self.command_base)
+		self.db_files        = dict()
+		self.references_list = dict()
+		self.references_all  = ""
+		self.tmp_dir         = tempfile.mkdtemp(prefix="pandy-")
+		self.chunks          = None
+		self.fast_pages      = dict()
+
+	def _runFinish(self, jobs, pooled=False):
+		"""Clean up and keep the score: durations, metrics (not if pooled, see finish) """
+
+		import shutil
+
+		shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+		if jobs is not None and self.shard:
+			shard_writeManifest(path_get(self._durationsPath()), self.shard, self.shard_plan, jobs)
+
+		if jobs and self.project_index:
+			self.project_index.save()
+
+		if jobs is not None:
+			failed_save(self._failedPath(), jobs)
+
+		if jobs:
+			self.stats['lanes'] = plan_queues(jobs)
+			self._printQueues()
+
+		if jobs:
+			self._timedJobs(jobs, {'scan': 'book_scan', 'toc': 'book_scan', 'render': 'book_render', 
+			                       'page': 'book_render', 'index': 'book_index'})
+
+			modes = {'convert': 'individually', 'merge': 'merge', 'scan': 'book', 'toc': 'book', 
+			         'order': 'book', 'render': 'book', 'page': 'book', 'index': 'book'}
+			self._timedJobs(jobs, modes)
+
+			if not pooled:
+				durations_save(self._durationsPath(), jobs)
+
+		self.stats['durations']['total'] = time.time() - self.stats['start']
+
+		if self.stats['outputs_changed'] or self.stats['outputs_unchanged']:
+			msg("\n  Outputs changed: {0}, unchanged: {1}".format(
+				self.stats['outputs_changed'], self.stats['outputs_unchanged']))
+
+		if self.cache:
+			if not pooled:
+				self.cache.evict()
+
+			if self.stats['cache_hits'] or self.stats['cache_misses']:
+				msg("Cache: {0} hit(s), {1} miss(es)".format(self.stats['cache_hits'], self.stats['cache_misses']))
+
+		if self.stats['fast_md']:
+			msg("Fast markdown: {0} file(s) without pandoc".format(self.stats['fast_md']))
+
+		if self.stats['pandoc_saved']:
+			msg("Identical sources: {0} conversion(s) copied, not converted".format(self.stats['pandoc_saved']))
+
+		if self.settings['METRICS_FILE'] and not pooled:
+			metrics_write(self.settings['METRICS_FILE'], [(self.stats, {'source': self.input})])
+
+	def _prepare(self):
+		"""Check the mode and plan. Returns the jobs to run (None: nothing to run) """
+
+		merge = self.settings['MERGE']
+		book  = self.settings['BOOK']
+
+		if book:
+			if "html" not in self.format_to:
+				msg("Book only works for HTML")
+				exit()
+
+			if len(self.format_to) > 1 and "html" in self.format_to:
+				answer = msg_cli_yesno("  Only HTML is being converted.")
+				if not answer:
+					exit()
+
+			if len(self.files) < 1:
+				msg("Feed me more files to make something pretty :) ")
+				exit()
+
+			# check if there is an output path, if not use
+			# current working ONLY if source is not current working directory
+			if not self.output:
+				if not self.input == os.getcwd():
+					self.output = os.getcwd()
+				else:
+					msg("How can I put this... You haven't specified an output directory and the source is the \n current running directory.")
+					msg("Sorry, this is out of my league; check and run again")
+					exit()
+
+			if not self.format_from == 'markdown':
+				msg("Not using markdown; no goodies for you.") 
+
+			self.chunked = self._bookChunked()
+
+			if self._indexSplit() and self.settings['NAV_SIDEBAR']:
+				# the index pages (and pages) don't carry the whole book
+				self.settings['NAV_SIDEBAR_SHARED'] = True
+
+		if merge and not self.output:
+			self.output = os.getcwd()
+
+		if self.settings['CHECK']:
+			self._check()
+			return None
+
+		if self.settings['RETRY_FAILED']:
+			retry = failed_load(self._failedPath())
+			if not retry:
+				msg("Nothing failed last time, nothing to retry")
+				return None
+
+			msg("Retrying {0} file(s) that failed last time".format(len(retry)))
+			self.only_files = set(retry)
+
+		if self.settings['SHARD_MERGE']:
+			self._shardCheck()
+			return None
+
+		if book and not self.project_index:
+			version = ".".join(str(tmp) for tmp in pandoc_version(self.settings['PANDOC']))
+			self.project_index = ProjectIndex(os.path.join(path_get(self._durationsPath()), INDEX_DB_NAME), 
+				                              version + " " + self.format_from)
+			self.project_index.load()
+
+		jobs = self.plan()
+
+		if self.settings['DRY_RUN']:
+			self._printPlan(jobs)
+			return None
+
+		# File or files in folder / list
+		if not merge and not book:
+			msg("Parsing files individually ... \n")
+
+			for filey in self.files:
+				if not self._wanted(filey):
+					for ext in self.format_to:
+						self._count('skipped', ext)
+
+		if merge:
+			msg("Parsing files and merging ... \n")
+
+		if book:
+			msg("Parsing files and making book ... \n")
+			msg("Scanning files, hold on...")
+
+		return jobs
+
+	def _bookChunked(self):
+		"""If the book can be rendered by one pandoc (BOOK_CHUNKED): markdown, 
+		pandoc >= 3 and pandy's template (to put the navigation in the pages)
+		"""
+
+		if not self.settings['BOOK_CHUNKED']:
+			return False
+
+		if not self.format_from == 'markdown':
+			msg("Chunked book only for markdown. Rendering page by page")
+			return False
+
+		if pandoc_version(self.settings['PANDOC']) < (3, 0):
+			msg("Chunked book needs pandoc 3 or newer (chunkedhtml). Rendering page by page")
+			return False
+
+		if self.settings['TEMPLATE']:
+			msg("Chunked book uses pandy's template, not yours. Rendering page by page")
+			return False
+
+		self.settings['TEMPLATE_PANDY'] = True
+		return True
+
+	def _makePlan(self):
+		"""The jobs for this run (see Job). 
+
+		individually: one job per file
+		merge:        one job per format
+		book:         scan each file (title, toc), then order and references, 
+		              then the pages and the index (chunked: after rendering all)
+		"""
+
+		jobs = list()
+
+		if self.settings['MERGE']:
+			name = path_lastDir(self.input)
+			folder = self.output or os.getcwd()
+
+			volumes = merge_volumes(self.files, int(self.settings['MERGE_VOLUME_SIZE']) * 1024, 
+				                    int(self.settings['MERGE_VOLUME_FILES']))
+
+			if len(volumes) == 1:
+				for ext in self.format_to:
+					jobs.append(Job("merge:" + ext, 'merge', functools.partial(self._mergeOne, ext), 
+						        input=list(self.files), ext_to=ext, 
+						        output=os.path.join(folder, name + "." + output_extension(ext))))
+			else:
+				named = list()
+				for number, files in enumerate(volumes, 1):
+					volume = "{0}-vol{1:02d}".format(name, number)
+					named.append((volume, files))
+
+					if not [filey for filey in files if self._wanted(filey)]:
+						continue # --retry-failed: only the volumes that failed
+
+					for ext in self.format_to:
+						jobs.append(Job("merge:{0}:vol{1:02d}".format(ext, number), 'merge', 
+							        functools.partial(self._mergeOne, ext, files, volume, 
+							        	              "{0} ({1}/{2})".format(name, number, len(volumes))), 
+							        input=list(files), ext_to=ext, 
+							        output=os.path.join(folder, volume + "." + output_extension(ext))))
+
+				jobs.append(Job("merge:front", 'merge', functools.partial(self._mergeFront, name, named), 
+					        ext_to='html', output=os.path.join(folder, name + ".html")))
+
+		elif self.settings['BOOK']:
+			# sharded: the scans (all shards) without pandoc, and the TOCs only 
+			# in the shards that use them (see _shardJobs)
+			shallow = bool(self.shard)
+			scans, tocs = list(), dict()
+			for filey in self.files:
+				scans.append(Job("scan:" + self._jobName(filey), 'scan', 
+					         functools.partial(self._bookScan, filey, not shallow), input=filey))
+				if shallow:
+					tocs[filey] = Job("toc:" + self._jobName(filey), 'toc', 
+						              functools.partial(self._bookToc, filey), deps=[scans[-1]], input=filey)
+
+			index_file = self._bookIndexFile()
+			if os.path.exists(index_file):
+				scans.append(Job("scan:" + self._jobName(index_file), 'scan', 
+					         functools.partial(self._bookScan, index_file, not shallow), input=index_file))
+
+			# these take the TOCs of the whole book
+			whole_book = (self.settings['SEARCH_INDEX'] or self.chunked 
+				          or (self.settings['NAV_SIDEBAR'] and self.settings['NAV_SIDEBAR_SHARED']))
+
+			order = Job("order", 'order', self._dbInit, deps=scans + (list(tocs.values()) if whole_book else []))
+			jobs += scans + list(tocs.values()) + [order]
+
+			if self.chunked:
+				# one pandoc for all, pages and index only take their chunk
+				order = Job("chunks", 'render', self._bookChunks, deps=[order], input=index_file, ext_to='html')
+				jobs.append(order)
+
+			for filey in self.files:
+				if not self._wanted(filey):
+					continue
+
+				jobs.append(Job("page:" + self._jobName(filey), 'page', 
+					        functools.partial(self._bookPage, filey), deps=[order] + ([tocs[filey]] if shallow else []), 
+					        input=filey, ext_to='html', output=self._getOutputPath(filey) + ".html"))
+
+			for folder, number, listed in self._indexParts():
+				name = "index" if (folder, number) == ("", 1) else "index:{0}:{1}".format(folder or ".", number)
+				jobs.append(Job(name, 'index', functools.partial(self._bookIndexPart, folder, number), 
+					        deps=[order] + [tocs[filey] for filey in listed if filey in tocs], 
+					        input=index_file, ext_to='html', 
+					        output=os.path.join(self.output, folder, index_pageName(number))))
+
+		else:
+			for filey in self.files:
+				if not self._wanted(filey):
+					continue
+
+				for ext in self.format_to:
+					jobs.append(Job("convert:" + self._jobName(filey) + ":" + ext, 'convert', 
+						        functools.partial(self._convertFile, filey, ext), input=filey, ext_to=ext, 
+						        output=self._getOutputPath(filey) + "." + output_extension(ext)))
+
+			self.digests = file_digests([filey for filey in self.files if self._wanted(filey)])
+
+		return jobs
+
+	def _shardCheck(self):
+		"""--shard-merge N: are the N shards complete? Raises ShardsIncomplete 
+		if not
+		"""
+
+		total = self.settings['SHARD_MERGE']
+		problems = shard_check(path_get(self._durationsPath()), total, self._makePlan())
+
+		if problems:
+			for problem in problems:
+				msg(problem)
+
+			self.stats['success'] = False
+			raise ShardsIncomplete("Shards incomplete: {0} problem(s)".format(len(problems)))
+
+		msg("All {0} shards complete".format(total))
+
+	def _check(self):
+		"""--check: report the problems (see check). The run fails if any 
+		(stats['success'], pandy exits with error). Returns the problems
+		"""
+
+		problems = self.check()
+
+		if problems:
+			for problem in problems:
+				msg(problem)
+
+			msg("Check: {0} problem(s)".format(len(problems)))
+			self.stats['success'] = False
+			return problems
+
+		msg("Check: no problems in {0} files".format(len(self.files)))
+		return problems
+
+	def check(self):
+		"""What a build would get wrong, without pandoc: unresolved links 
+		(wiki and internal), duplicated titles, files not in the custom index 
+		(book) and files with the same output. Returns list of problems (str)
+		"""
+
+		book = self.settings['BOOK']
+		index_file = self.settings['FILE_INDEX'] if book else ''
+		markdown = self.format_from == 'markdown'
+
+		problems   = list()
+		titles     = dict() # title: files
+		outputs    = dict() # output: files
+		references = dict() # same keys as in _dbInit
+		texts      = dict()
+
+		exts = ['html'] if book else [output_extension(ext) for ext in self.format_to]
+		if self.settings['MERGE']:
+			exts = list()
+
+		for filey in self.files:
+			for ext in exts:
+				outputs.setdefault(self._getOutputPath(filey) + "." + ext, list()).append(filey)
+
+			is_md = markdown and os.path.splitext(filey)[1].lstrip(".") in ACCEPTED_MD_EXTENSIONS
+			if not is_md:
+				continue
+
+			texts[filey] = self._fileText(filey)
+			title = findTitleMd(text_lines=texts[filey]) or self._getOutputPath(filey, strip_root=True)
+			titles.setdefault(title.strip(), list()).append(filey)
+
+			tmp_file = path_getFilename(filey)
+			references[path_delExtension(tmp_file) + "|" + tmp_file] = {'output': '', 'title': title}
+
+		if book and os.path.exists(index_file) and markdown:
+			texts[index_file] = self._fileText(index_file)
+
+		extensions = "|".join(ACCEPTED_MD_EXTENSIONS)
+
+		for filey in sorted(texts):
+			_, found = parse_wikilinks(texts[filey], this_references=references)
+
+			for link in extractMdLinks(texts[filey], extension=extensions, style='wiki'):
+				if "[{0}]: ".format(link[0]) not in "\n".join(found):
+					problems.append("Unresolved wikilink in {0}: [:{1}]".format(filey, link[0]))
+
+			for link in extractMdLinks(texts[filey], extension=extensions, style='inline'):
+				target = link[1].split("#")[0]
+				if "://" in target or target.startswith("mailto:"):
+					continue
+
+				if not os.path.exists(os.path.join(path_get(filey), target)):
+					problems.append("Unresolved link in {0}: ({1})".format(filey, link[1]))
+
+		for title in sorted(titles):
+			if len(titles[title]) > 1:
+				problems.append("Duplicated title '{0}': {1}".format(title, ", ".join(sorted(titles[title]))))
+
+		for output in sorted(outputs):
+			if len(outputs[output]) > 1:
+				problems.append("Same output {0}: {1}".format(output, ", ".join(sorted(outputs[output]))))
+
+		if index_file in texts:
+			links = [link[0] for link in extractMdLinks(texts[index_file], extension=extensions, style='wiki')]
+			links += [link[1] for link in extractMdLinks(texts[index_file], extension=extensions, style='inline')]
+
+			ordered = orderListFromList(self.files, links)
+			for filey in self.files:
+				if filey not in ordered:
+					problems.append("Not in the index {0}: {1}".format(index_file, filey))
+
+		return problems
+
+	def _jobName(self, filepath):
+		"""Stable name for the file in jobs: path relative to the source """
+
+		if os.path.isdir(self.input):
+			filepath = os.path.relpath(filepath, self.input)
+		else:
+			filepath = path_getFilename(filepath)
+
+		return filepath.replace(os.sep, "/")
+
+	def _durationsPath(self):
+		"""Where the historical durations are kept: output folder, or the 
+		source one when converting in place
+		"""
+
+		folder = self.output or os.getcwd()
+		if not self.output and not self.settings['MERGE']:
+			folder = self.input if os.path.isdir(self.input) else path_get(os.path.abspath(self.input))
+
+		return os.path.join(folder, DURATIONS_NAME)
+
+	def _printPlan(self, jobs):
+		"""--dry-run: list the jobs and the critical path """
+
+		path, total = plan_criticalPath(jobs)
+		on_path = set(path)
+
+		msg("Build plan: " + str(len(jobs)) + " jobs, " + str(self.settings['JOBS']) + " worker(s)\n")
+
+		for job in plan_sorted(jobs):
+			line = "[{0:8.2f}s] {1}".format(job.estimate, job.name)
+			if job.output:
+				line += " -> " + job.output
+			if job.same:
+				line += " (copy of " + job.same.name + ")"
+			if job in on_path:
+				line += "  *"
+			msg(line, 4)
+
+		msg("")
+		msg("Critical path (*), estimated {0:.2f}s: ".format(total) + " > ".join(job.name for job in path))
+
+	def _printQueues(self):
+		"""How long the jobs waited for a worker, by lane (only if there are 
+		slow lanes; see FORMAT_LANES)
+		"""
+
+		lanes = self.stats['lanes']
+		if not [lane for lane in lanes if lane != LANE_DEFAULT]:
+			return
+
+		summary = list()
+		for lane in sorted(lanes):
+			queue = lanes[lane]
+			summary.append("{0} {1} jobs, waited {2:.2f}s (max {3:.2f}s)".format(
+				lane, queue['jobs'], queue['queue_seconds'], queue['queue_max']))
+
+		msg("\n  Lanes: " + "; ".join(summary))
+
+	def _timedJobs(self, jobs, modes):
+		"""Mode durations from the jobs: wall time from the first start to the 
+		last end of the kinds of each mode. modes: dict kind: mode name
+		"""
+
+		for mode in set(modes.values()):
+			kinds  = [kind for kind in modes if modes[kind] == mode]
+			starts = [job.start for job in jobs if job.kind in kinds and job.start is not None]
+			ends   = [job.end for job in jobs if job.kind in kinds and job.end is not None]
+
+			if starts and ends:
+				self.stats['durations'][mode] = max(ends) - min(starts)
+
+	def _count(self, result, ext_to, amount=1):
+		"""Count files by result (converted, skipped, failed) for the stats """
+
+		key = (result, ext_to)
+		with self.lock:
+			self.stats['files'][key] = self.stats['files'].get(key, 0) + amount
+
+	def _countOutput(self, ext_to, path, changed=True):
+		"""Count a converted file and the bytes written to path (if changed)"""
+
+		self._count('converted', ext_to)
+
+		with self.lock:
+			if not changed:
+				self.stats['outputs_unchanged'] += 1
+				return
+
+			self.stats['outputs_changed'] += 1
+
+		if os.path.exists(path):
+			size = os.path.getsize(path)
+			with self.lock:
+				self.stats['bytes'][ext_to] = self.stats['bytes'].get(ext_to, 0) + size
+
+	def _runPandoc(self, command, output=False, text=None, stream=None):
+		"""run_subprocess, counting the pandoc launches """
+
+		with self.lock:
+			self.stats['pandoc_launches'] += 1
+
+		limits = self.limits
+		ext = getattr(self.local, 'ext', None)
+		if self.latex_memory and FORMAT_LANES.get(ext) == 'latex':
+			# its share of the LaTeX budget
+			limits = dict(limits, memory=min(limits['memory'] or self.latex_memory, self.latex_memory))
+
+		try:
+			return run_subprocess(command, output, text, stream, limits)
+		except subprocess.TimeoutExpired:
+			with self.lock:
+				self.stats['pandoc_killed'] += 1
+			raise
+
+	def _reportFailed(self, what, error):
+		"""Tell which file made pandoc fail, and how (with what pandoc said) """
+
+		msg(self._failedReason(error) + ": " + what)
+
+		if error.stderr:
+			for line in str(error.stderr, encoding='utf-8', errors='replace').splitlines():
+				msg(line, 6)
+
+	def _failedReason(self, error):
+		"""Short reason of a failed job """
+
+		if isinstance(error, subprocess.TimeoutExpired):
+			return "Killed after {0} seconds".format(error.timeout)
+		elif isinstance(error, subprocess.CalledProcessError) and error.returncode < 0:
+			return "Killed (signal {0}, limits?)".format(-error.returncode)
+		elif isinstance(error, subprocess.CalledProcessError):
+			return "Failed (pandoc exit {0})".format(error.returncode)
+
+		return "Failed ({0}: {1})".format(error.__class__.__name__, error)
+
+	def _printFailed(self, jobs):
+		"""Summary of what went wrong (--keep-going) """
+
+		failed  = [job for job in jobs if job.state == 'failed']
+		skipped = [job for job in jobs if job.state == 'skipped']
+
+		msg("\n  Failed: {0}, skipped because of them: {1}, done: {2}".format(
+			len(failed), len(skipped), len(jobs) - len(failed) - len(skipped)))
+
+		for job in failed:
+			msg(job.name + " ... " + self._failedReason(job.error), 4)
+
+			stderr = getattr(job.error, 'stderr', None)
+			if stderr:
+				lines = str(stderr, encoding='utf-8', errors='replace').strip().splitlines()
+				msg(lines[-1] if lines else "", 8)
+
+		msg("Only those again: --retry-failed (list in {0})".format(self._failedPath()), 4)
+
+	def _failedPath(self):
+		"""FAILED_NAME, next to the durations """
+
+		return os.path.join(path_get(self._durationsPath()), FAILED_NAME)
+
+	def _cacheKey(self, command, inputs=(), text=None):
+		"""Key of the conversion in the cache (counting hits and misses), None 
+		without cache
+		"""
+
+		if not self.cache:
+			return None
+
+		return self.cache.key(command, inputs, text)
+
+	def _cacheCount(self, hit):
+		with self.lock:
+			self.stats['cache_hits' if hit else 'cache_misses'] += 1
+
+	def _runPandocTo(self, command, output_path, text=None, inputs=()):
+		"""Run pandoc with output to a temporal file, replacing output_path 
+		only if the result changed. Returns True if replaced
+
+		:inputs   the files of command to convert (for the cache key)
+		"""
+
+		tmp_path = path_temporal(output_path)
+		key = self._cacheKey(command, inputs, text)
+
+		try:
+			if key and self.cache.copy(key, tmp_path):
+				self._cacheCount(True)
+			else:
+				self._runPandoc(command + ['-o', tmp_path], text is not None, text)
+
+				if key:
+					self.cache.put(key, tmp_path)
+					self._cacheCount(False)
+		except BaseException:
+			if os.path.exists(tmp_path):
+				os.remove(tmp_path)
+			raise
+
+		return replace_ifChanged(tmp_path, output_path)
+
+	def _runPandocTemplate(self, command, output_path, text, **kwargs):
+		"""_runPandocTo with pandy's template (TemplateStream) injected while 
+		pandoc writes. Returns True if replaced
+		"""
+
+		tmp_path = path_temporal(output_path)
+		key = self._cacheKey(command, text=text)
+		kept = key and self.cache.open(key)
+
+		try:
+			with open(tmp_path, 'wb') as tmp:
+				tmp.write(codecs.BOM_UTF8) # as save()
+				template = TemplateStream(tmp.write, **kwargs)
+
+				if kept:
+					# pandoc's output, the template goes as always
+					with kept:
+						for chunk in iter(functools.partial(kept.read, STREAM_CHUNK), b''):
+							template.feed(chunk)
+				elif key:
+					raw_path = path_temporal(os.path.join(self.tmp_dir, "page"))
+					with open(raw_path, 'wb') as raw:
+						def feed(chunk):
+							raw.write(chunk)
+							template.feed(chunk)
+
+						self._runPandoc(command, True, text, stream=feed)
+				else:
+					self._runPandoc(command, True, text, stream=template.feed)
+
+				template.close()
+		except BaseException:
+			os.remove(tmp_path)
+			raise
+
+		if key:
+			if not kept:
+				self.cache.put(key, raw_path, move=True)
+			self._cacheCount(bool(kept))
+
+		return replace_ifChanged(tmp_path, output_path)
+
+	def _convertFile(self, filey, ext):
+		"""(job) Parses one file individually, to one format (each format is 
+		its own job, with its own command)
+		"""
+
+		path = self._getOutputPath(filey)
+		msg("Converting: " + path_getFilename(filey) + " (" + ext + ")")
+
+		newcommand = list(self.command) + self._cmdFromToOut('t', ext)
+		cmd_out    = self._cmdFromToOut('o', ext, path) 
+
+		self._processCounting(filey, newcommand, ext, cmd_out[1])
+
+	def _copyFile(self, job):
+		"""(job) The output of an identical source (see plan_dedupe), instead 
+		of converting it again
+		"""
+
+		msg("Copying: " + path_getFilename(job.input) + " (" + job.format + "), same as " + job.same.name)
+
+		path_mkdir(path_get(job.output))
+		changed = file_linkOrCopy(job.same.output, job.output)
+
+		with self.lock:
+			self.stats['pandoc_saved'] += 1
+
+		self._countOutput(job.format, job.output, changed)
+
+	def _mergeOne(self, ext, files=None, name=None, title=None):
+		"""(job) pandoc already has a merge command when specified multiple files. 
+		Special treatment for markdown input to html output
+
+		:files, name, title   for a volume (see merge_volumes): its files, 
+		                      output name and title. Default: all, as the source
+		"""
+
+		files = files or self.files
+		name  = name or path_lastDir(self.input)
+
+		meta_name        = "--metadata=title:" + (title or name)
+		
+		command_base = list(self.command)
+
+		command_base += self._cmdFromToOut('t', ext)
+		command_base += [meta_name]
+		cmd_out = self._cmdFromToOut('o', ext, os.path.join(self.output, name)) 
+
+		self._processCounting(files, command_base, ext, cmd_out[1])
+
+	def _mergeFront(self, name, volumes):
+		"""(job) Front page linking the volumes of the merge """
+
+		path = os.path.join(self.output, name + ".html")
+		exts = [output_extension(ext) for ext in self.format_to]
+
+		changed = save(path, merge_frontPage(name, volumes, exts))
+		self._countOutput('html', path, changed)
+
+	def _processCounting(self, filey, cmd, ext_to, output_path):
+		"""_processOneFile, counting converted/failed files for the stats """
+
+		amount = len(filey) if isinstance(filey, list) else 1
+		self.local.ext = ext_to
+
+		try:
+			changed = self._processOneFile(filey, cmd, ext_to, output_path)
+		except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as error:
+			self._count('failed', ext_to, amount)
+			self._reportFailed(output_path if amount > 1 else filey, error)
+			raise
+
+		self._countOutput(ext_to, output_path, changed)
+		if amount > 1:
+			self._count('converted', ext_to, amount - 1)
+
+	def _processOneFile(self, filey, cmd, ext_to, output_path):
+		"""Process one file separatelly (for merge and individually)
+		:filey     one file or file list 
+		:cmd       command starting point 
+		:ext_to    current extension in format to
+		:output_path  where to save. Only replaced if the content changed
+
+		returns True if output_path changed
+		"""
+
+		this_cmd = list(cmd)
+
+		if not ext_to == 'html' or (ext_to == 'html' and not self.format_from == 'markdown'):
+			if isinstance(filey, list):
+				this_cmd += filey
+			else:
+				this_cmd += [filey] 
+
+			return self._runPandocTo(this_cmd, output_path, inputs=this_cmd[len(cmd):])
+		else:
+			cmd_special = list(this_cmd)
+			files = filey if isinstance(filey, list) else [filey]
+			datas = [cmd_open_bytes(this_file) for this_file in files]
+
+			if not any(if_special_markers(data, self.settings['TOC_TAG']) for data in datas):
+				if self.settings['FAST_MD'] and len(files) == 1:
+					changed = self._fastMarkdown(this_cmd, files[0], datas[0], output_path)
+					if changed is not None:
+						return changed
+
+				# nothing to parse: pandoc reads the files
+				return self._runPandocTo(this_cmd + files, output_path, inputs=files)
+
+			# join all texts (merge)
+			all_texts = list()
+			for data in datas:
+				all_texts += text_lines(data)
+
+			all_texts, toc = if_special_elements(all_texts, self.settings['TOC_TAG'])
+			if toc:
+				cmd_special.append('--toc')
+
+			all_texts = "".join(all_texts)
+			return self._runPandocTo(cmd_special, output_path, all_texts)
+
+	def _fastMarkdown(self, cmd, filey, data, output_path):
+		"""FAST_MD: the file rendered by pandy (fastmd_render) in the page 
+		pandoc makes. Returns True if output_path changed, None if pandoc has 
+		to do it (not simple enough, or options that change the body)
+		"""
+
+		if [arg for arg in cmd if arg == '--toc' or arg.startswith(('--section-divs', '--template'))]:
+			return None
+
+		if tuple(self.settings['EXTENSIONS_EXTRA']) != EXTENSIONS_EXTRA:
+			return None # fastmd_render does the default ones (hard_line_breaks...)
+
+		if self.settings['HTML_VER'] != 'html5':
+			return None # fastmd_render writes html5 (<ol type="1">), html4 is other markup
+
+		body = fastmd_render(text_lines(data))
+		if body is None:
+			return None
+
+		title = path_delExtension(path_getFilename(filey))
+		if re.search(r'[&<>"\']', title):
+			return None # pandoc escapes, maybe not as us
+
+		page = self._fastPage(cmd)
+		if page is None:
+			return None
+
+		with self.lock:
+			self.stats['fast_md'] += 1
+
+		return save_ifChanged(output_path, page.replace(FASTMD_PROBE_NAME, title).replace(FASTMD_PROBE_BODY, body).encode('utf-8'))
+
+	def _fastPage(self, cmd):
+		"""pandoc's page (header, footer, css, title...) for cmd, once per run: 
+		the output of a probe file, its body and name to be replaced. None if 
+		the body can't be found there
+		"""
+
+		key = tuple(cmd)
+		if key not in self.fast_pages:
+			probe = os.path.join(self.tmp_dir, FASTMD_PROBE_NAME + ".md")
+			save_ifChanged(probe, FASTMD_PROBE_TEXT.encode('utf-8'))
+
+			page = str(self._runPandoc(list(cmd) + [probe], True), encoding='utf-8')
+			if page.count(FASTMD_PROBE_BODY) != 1:
+				page = None
+
+			with self.lock:
+				self.fast_pages[key] = page
+
+		return self.fast_pages[key]
+
+	def _bookIndexFile(self):
+		"""The custom index if usable (only markdown), if not "noindex." """
+
+		if self.settings['FILE_INDEX'] and os.path.exists(self.settings['FILE_INDEX']) and self.format_from == 'markdown':
+			return self.settings['FILE_INDEX']
+
+		return "noindex."
+
+	def _bookScan(self, filepath, toc=True):
+		"""(job) Get the file properties for the book (see _dbInit) 
+
+		:toc   False: without pandoc, the TOC later (None until then, see _bookToc)
+		"""
+
+		try:
+			props = self._fileMetadata(filepath, toc)
+		except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as error:
+			self._reportFailed(filepath, error)
+			raise
+
+		if props['toc'] is not None:
+			self._bookTerms(filepath, props)
+
+		self.db_files[filepath] = props
+
+	def _bookToc(self, filepath):
+		"""(job, sharded book) The TOC of a file scanned without it (see 
+		_bookScan), if it wasn't known already
+		"""
+
+		props = self.db_files[filepath]
+		if props['toc'] is not None:
+			return
+
+		stat = os.stat(filepath)
+		data = cmd_open_bytes(filepath)
+
+		try:
+			props['toc'] = self._fileToc(data)
+		except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as error:
+			self._reportFailed(filepath, error)
+			raise
+
+		self._fileMetadataKeep(filepath, stat, hashlib.sha1(data).hexdigest(), props)
+		self._bookTerms(filepath, props)
+
+	def _bookTerms(self, filepath, props):
+		"""Search terms of the file (SEARCH_INDEX), once its TOC is known """
+
+		if self.settings['SEARCH_INDEX'] and 'terms' not in props:
+			headings = re.findall(r'<a [^>]*>(.+?)</a>', props['toc'])
+			props['terms'] = search_terms("".join(self._textOf(props)), headings, props['title'])
+
+			if self.project_index:
+				self.project_index.update(filepath, props)
+
+	def _bookPage(self, filepath):
+		"""(job) Convert one page, with its navigation """
+
+		if filepath not in self.files_position or 'index.' in filepath:
+			# not in the custom index
+			self._count('skipped', 'html')
+			return
+
+		totalFiles = len(self.files)
+		i = self.files_position[filepath]
+		index_title = self.db_files['index']['title']
+
+		current = dict(self.db_files[filepath])
+		msg("Processing: " + path_getFilename(current['path_input']))
+		if self.chunks is None:
+			current['text'] = self._parseBody(self._textOf(current))
+
+		prev = self.db_files[self.files[i - 1]]
+		if 'index.' in prev['path_input'] or i == 0:
+			prev = dict()
+			prev['real_output'] = ""
+			prev['title']       = ""
+
+		if (i + 1) < totalFiles:
+			nextt = self.db_files[self.files[i + 1]]
+		else: 
+			nextt = dict() 
+			nextt['real_output'] = ""
+			nextt['title']       = ""		
+
+		path_mkdir(path_get(current['real_output']))
+
+		proj_index = '<a href="' + current['index_url'] +'">' +  index_title + "</a>"
+
+		book_navigation    = self._bookNavigation(current, prev, nextt)
+		sidebar_navigation = self._sidebarNavigation(current)
+
+		variables = {'project-index': proj_index}
+
+		if self.settings['NAV_SIDEBAR']:
+			variables['side_navigation'] = sidebar_navigation
+
+		if self.settings['USE_NAV']:
+			variables['book_navigation'] = book_navigation
+
+		newcommand = list(self.command) + self._variablesArgs(variables)
+
+		self._bookSave(newcommand, current, book_nav=book_navigation, sidebar=sidebar_navigation, 
+			            projindex=proj_index, pagetitle=current['title'])
+
+	def _bookIndex(self):
+		"""(job) Convert the index """
+
+		msg("Processing: index")
+
+		if 'text' not in self.db_files['index']:
+			# sharded: only now the TOCs are there (see _makePlan)
+			self.db_files['index']['text'] = self._indexRootText()
+
+		index_title = self.db_files['index']['title']
+
+		self._bookSave(self._indexCommand(index_title), self.db_files['index'], projindex=index_title)
+
+	def _indexCommand(self, title):
+		"""Command for an index page (no TOC) """
+
+		index_cmd = list(self.command)
+
+		if "--toc" in index_cmd:
+			index_cmd.remove("--toc")
+
+		index_cmd.append('--metadata=title:' + title)
+
+		return index_cmd
+
+	def _indexSplit(self):
+		"""Files per index page (INDEX_SPLIT), 0 if the index isn't split 
+		(there is a custom one, or not wanted)
+		"""
+
+		if os.path.exists(self._bookIndexFile()):
+			return 0
+
+		return int(self.settings['INDEX_SPLIT'] or 0)
+
+	def _indexParts(self):
+		"""The index pages: list of (folder, page number, files listed in it). 
+		Only ("", 1, all the files) if the index isn't split (no files: custom 
+		index)
+		"""
+
+		per_page = self._indexSplit()
+		if not per_page:
+			return [("", 1, [] if os.path.exists(self._bookIndexFile()) else list(self.files))]
+
+		by_output = dict()
+		for filey in self.files:
+			by_output[self._getOutputPath(filey, strip_root=True).replace(os.sep, "/") + ".html"] = filey
+
+		parts = list()
+		for folder, node in sorted(index_folders(list(by_output)).items()):
+			pages = max(1, -(-len(node['files']) // per_page))
+			for number in range(1, pages + 1):
+				listed = node['files'][(number - 1) * per_page:number * per_page]
+				parts.append((folder, number, [by_output[output] for output in listed]))
+
+		return parts
+
+	def _indexRootText(self):
+		"""The generated index: the first page of the split one, or all the 
+		files with their TOC
+		"""
+
+		if self._indexSplit():
+			return self._indexText("", 1)
+
+		return self.makeNavigationLinks(isIndex=True)
+
+	def _indexText(self, folder, number):
+		"""One page of the index of folder (see index_folders): up links, 
+		its subfolders (first page), its files with their TOC and the pages
+		"""
+
+		import posixpath
+
+		node     = self.index_tree[folder]
+		per_page = self._indexSplit()
+		pages    = max(1, -(-len(node['files']) // per_page))
+
+		href = lambda target: posixpath.relpath(target, folder or ".")
+		link = '<a href="{0}">{1}</a>'
+
+		text = list()
+
+		if folder:
+			up = [link.format(href("index.html"), self.db_files['index']['title'])]
+			parts = folder.split("/")
+			for depth in range(1, len(parts)):
+				up.append(link.format(href("/".join(parts[:depth]) + "/index.html"), parts[depth - 1]))
+			text.append('<p class="pandy-up">' + " / ".join(up + [parts[-1]]) + '</p>')
+
+		if number == 1 and node['folders']:
+			items = list()
+			for sub in node['folders']:
+				items.append("<li>" + link.format(href(sub + "/index.html"), posixpath.basename(sub) + "/") + 
+				             " (" + str(self.index_tree[sub]['total']) + ")</li>")
+			text.append('<ul class="pandy-folders">' + "".join(items) + "</ul>")
+
+		items = list()
+		for output in node['files'][(number - 1) * per_page:number * per_page]:
+			current = self.index_files[output]
+			real_href = href(output)
+			toc = current['toc'].replace('<a href="#', '<a href="' + real_href + "#")
+			items.append("<li>" + link.format(real_href, current['title']) + toc + "</li>")
+		if items:
+			text.append("<ul>" + "".join(items) + "</ul>")
+
+		if pages > 1:
+			numbers = list()
+			for page in range(1, pages + 1):
+				if page == number:
+					numbers.append("<strong>" + str(page) + "</strong>")
+				else:
+					numbers.append(link.format(index_pageName(page), page))
+			text.append('<p class="pandy-pages">' + " ".join(numbers) + "</p>")
+
+		return "\n\n".join(text)
+
+	def _bookIndexPart(self, folder, number):
+		"""(job) Convert a page of the index split by folders (the first one 
+		of the root is the index)
+		"""
+
+		if (folder, number) == ("", 1):
+			return self._bookIndex()
+
+		msg("Processing: index of " + (folder or "/") + " (" + str(number) + ")")
+
+		index_title = self.db_files['index']['title']
+		pages = max(1, -(-len(self.index_tree[folder]['files']) // self._indexSplit()))
+
+		title = folder or index_title
+		if pages > 1:
+			title += " ({0}/{1})".format(number, pages)
+
+		current = {'title': title, 'path_input': self.settings['FILE_INDEX'], 
+		           'real_output': os.path.join(self.output, folder, index_pageName(number)), 
+		           'text': self._indexText(folder, number)}
+		path_mkdir(path_get(current['real_output']))
+
+		root = path_relative_to(os.path.join(self.output, 'index.html'), current['real_output'])
+		projindex = '<a href="' + root + '">' + index_title + "</a>"
+
+		self._bookSave(self._indexCommand(title), current, projindex=projindex, pagetitle=title)
+
+	def _bookSave(self, command, current_file, **kwargs):
+		"""finallySave, counting converted/failed pages for the stats """
+
+		try:
+			changed = self.finallySave(command, current_file, **kwargs)
+		except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as error:
+			self._count('failed', 'html')
+			self._reportFailed(current_file['path_input'], error)
+			raise
+
+		self._countOutput('html', current_file['real_output'], changed)
+
+	def finallySave(self, command, current_file, **kwargs):
+		""" (book) Save according to template option 
+
+		:command       current state of command 
+		:current file  current file properties/dict 
+		:**kwargs      key=value for builtintpl (book_nav, sidebar, projindex, pagetitle)
+
+		returns True if the output changed (only written then)
+		"""
+
+		local_cmd = list(command)
+
+		if self.chunks is not None and 'chunk' in current_file:
+			return self._bookSaveChunk(current_file, **kwargs)
+
+		if not self.settings['TEMPLATE_PANDY']:
+			return self._runPandocTo(local_cmd, current_file['real_output'], current_file['text'])
+		else: 
+			if self.css_shared:
+				kwargs['css_href'] = path_relative_to(self.css_shared, current_file['real_output'])
+
+			return self._runPandocTemplate(local_cmd, current_file['real_output'], current_file['text'], **kwargs)
+
+	def _bookChunks(self):
+		"""(job) Render the whole book with one pandoc (chunkedhtml): the index 
+		and the pages in order, each one after a marker (see chunks_source). 
+		Pages and index only wrap their chunk then (see _bookSaveChunk)
+		"""
+
+		msg("Rendering the book with one pandoc (chunked)...")
+
+		texts = [self.db_files['index']['text']]
+		self.db_files['index']['chunk'] = 0
+
+		for number, filey in enumerate(self.files, 1):
+			lines, header = chunks_metadata(self._textOf(self.db_files[filey]))
+			self.db_files[filey]['chunk'] = number
+			self.db_files[filey]['chunk_header'] = header
+			texts.append(self._parseBody(lines, references=False))
+
+		template = os.path.join(self.tmp_dir, "chunk.html")
+		save_ifChanged(template, CHUNK_TEMPLATE.encode('utf-8'))
+		folder = os.path.join(self.tmp_dir, "chunks")
+
+		command = [arg for arg in self.command if not arg.startswith('--template')]
+		command += ['-t', 'chunkedhtml', '--split-level=1', '--chunk-template=%n.html', 
+		            '--template=' + template, '-o', folder]
+
+		try:
+			self._runPandoc(command, True, chunks_source(texts) + "\n\n" + self.references_all)
+		except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as error:
+			self._reportFailed("the book (chunked)", error)
+			raise
+
+		outputs = {0: self.db_files['index']['real_output']}
+		for filey in self.files:
+			outputs[self.db_files[filey]['chunk']] = self.db_files[filey]['real_output']
+
+		self.chunks = chunks_read(folder, outputs)
+
+	def _bookSaveChunk(self, current_file, **kwargs):
+		"""(chunked book) The page from its chunk, with pandy's template. 
+		Returns True if the output changed
+		"""
+
+		parts = self.chunks.get(current_file['chunk'])
+		if parts is None:
+			raise ValueError("Not in pandoc's chunks: " + current_file['path_input'])
+
+		if self.css_shared:
+			kwargs['css_href'] = path_relative_to(self.css_shared, current_file['real_output'])
+
+		html = chunks_page(parts, current_file['title'], current_file.get('chunk_header'))
+
+		return save(current_file['real_output'], builtintpl(html, **kwargs))
+
+	def _getOutputPath(self, filepath, strip_root=False):
+		"""Get output path"""
+
+		cooking = ""
+		
+		if not self.output:
+			return path_delExtension(filepath)
+
+		if self.settings['OUTPUT_FLAT'] or (not self.settings['OUTPUT_FLAT'] and filepath == self.input):
+			cooking = path_delExtension(path_getFilename(filepath))
+		else:
+			cooking = path_delExtension(filepath)[len(self.input) + 1:]
+
+		if strip_root:
+			return cooking
+
+		return os.path.join(self.output, cooking)
+
+	def _bookNavigation(self, prop_current, prop_prev, prop_next):
+		""" Makes the navigation links """
+
+		navPre   = ""
+		navNext  = ""
+		navIndex = ""
+
+		use_titles = self.settings['NAV_TITLE']
+		link_tpl = '<li><a href="{ref}">{title}</a></li>'
+
+		navIndex = link_tpl.format(ref=prop_current['index_url'], title="index")
+
+		if prop_prev['real_output']:
+			prev_path = path_relative_to(prop_prev['real_output'], prop_current['real_output'])
+
+			navLink = prop_prev['title'] if use_titles else 'previous'	
+			navPre = link_tpl.format(ref=prev_path, title="&lt; " + navLink)
+
+		if prop_next['real_output']:
+			next_path = path_relative_to(prop_next['real_output'], prop_current['real_output'])
+
+			navLink = prop_next['title'] if use_titles else 'next'
+			navNext = link_tpl.format(ref=next_path, title=navLink + " &gt;")
+
+		return '<ul class="booknav">' + navPre + navIndex + navNext + '</ul>'
+
+	def _dbInit(self):
+		"""(job) Init dbfiles with properties, once all files were scanned 
+		(_bookScan): references, order from the index, base command for the book
+		"""
+
+		if "--toc" in self.command:
+			self.command.remove("--toc")
+
+		self.settings['FILE_INDEX'] = self._bookIndexFile()
+
+		self.db_files['index'] = {
+			'title': "Index", 'path_input' :self.settings['FILE_INDEX'],
+			'real_output' : os.path.join(self.output, "index.html"),
+		     }
+
+		ref_tpl = "[{thefile}]: {future_html}"
+
+		for the_savior in self.files:
+
+			# create references, with and without extension and prepare string 
+			# only for markdown, but memory is inexpensive
+			tmp_output       = self.db_files[the_savior]['output']
+			tmp_file         = path_getFilename(the_savior)
+			tmp_file_extless = path_delExtension(tmp_file)
+			key_name         = tmp_file_extless + "|" + tmp_file
+			tmp = ""
+
+			self.references_list[key_name] = dict()
+			self.references_list[key_name]['output'] = tmp_output
+			self.references_list[key_name]['title']  = self.db_files[the_savior]['title']
+
+			tmp =  "\n\n" + ref_tpl.format(thefile=tmp_file, future_html=tmp_output)
+			tmp += "\n\n" + ref_tpl.format(thefile=tmp_file_extless, future_html=tmp_output)
+			self.references_all += tmp
+			
+		if os.path.exists(self.settings['FILE_INDEX']):
+			props = self.db_files.pop(self.settings['FILE_INDEX'])
+			self.db_files['index'].update(props)
+			self._fileOrderByIndex()
+			self.db_files['index']['text'] = self._parseBody(self._textOf(self.db_files['index']))
+		elif self._indexSplit():
+			self.index_files = dict((self.db_files[filey]['output'].replace(os.sep, "/"), self.db_files[filey]) 
+				                    for filey in self.files)
+			self.index_tree = index_folders(list(self.index_files))
+
+		self.files_position = dict((filey, number) for number, filey in enumerate(self.files))
+
+		if 'text' not in self.db_files['index'] and (not self.shard or self.chunked):
+			self.db_files['index']['text'] = self._indexRootText()
+
+		self.command.append('--variable=project-title:' + self.db_files['index']['title'])
+
+		self.css_shared = ''
+		if self.settings['TEMPLATE_PANDY']:
+			#just in case
+			for index in range(len(self.command)):
+				if self.command[index].startswith("--template"):
+					del self.command[index]
+					break 
+
+			if self.settings['TEMPLATE_PANDY_CSS']:
+				self.css_shared = builtintpl_css(self.output)
+
+		if self.settings['SEARCH_INDEX']:
+			search = SearchIndex()
+			for filey in self.files:
+				current = self.db_files[filey]
+				search.add(current['output'].replace(os.sep, "/"), current['title'], current['terms'])
+
+			search.write(os.path.join(self.output, SEARCH_FOLDER))
+
+		self.nav_shared = ''
+		if self.settings['NAV_SIDEBAR'] and self.settings['NAV_SIDEBAR_SHARED']:
+			items = list()
+			for filey in self.files:
+				current = self.db_files[filey]
+				items.append([current['output'].replace(os.sep, "/"), current['title'], current['toc']])
+
+			self.nav_shared = navigation_js(self.output, items)
+
+	def _fileOrderByIndex(self):
+		"""Order list of files from custom index"""
+
+		index_text = self._textOf(self.db_files['index'])
+
+		extensions = "|".join(ACCEPTED_MD_EXTENSIONS)
+
+		# gather internal and wikilinks (returned sub list items are different in position)
+		links_internal = extractMdLinks(index_text, extension=extensions, style='inline') 
+		links_wiki     = extractMdLinks(index_text, extension=extensions, style='wiki') 
+		
+		# join both list, getting only filename
+		tmp_links = list()
+
+		for wiki in links_wiki:
+			tmp_links.append(wiki[0])
+
+		for internal in links_internal:
+			tmp_links.append(internal[1])
+
+		# order, delete duplicates and overwrite original listing
+		self.files = orderListFromList(self.files, tmp_links)
+
+		self.files = list(dict.fromkeys(self.files)) # without duplicates, same order
+
+	def _fileMetadata(self, filepath, toc=True):
+		"""for book. Get file properties: output path, input path, md title 
+		Cached while the file doesn't change: in memory (see build()) and 
+		between runs (see ProjectIndex). 'text' is only there if it was read 
+		(see _fileText)
+
+		:toc   False: no pandoc. If it isn't cached, 'toc' is None (not kept then)
+		"""
+
+		stat = os.stat(filepath)
+		cached = self.cache_metadata.get(filepath)
+		if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+			properties = dict(cached[2])
+			properties['text'] = list(properties['text'])
+			return properties
+
+		properties = self._filePaths(filepath)
+
+		known = self.project_index.fresh(filepath, stat) if self.project_index else None
+		if known is not None:
+			properties.update(known)
+			return properties
+
+		data = cmd_open_bytes(filepath)
+		digest = hashlib.sha1(data).hexdigest()
+		properties['text'] = text_lines(data)
+
+		known = self.project_index.same(filepath, digest) if self.project_index else None
+		if known is not None:
+			properties.update(known)
+		else:
+			properties.update(self._fileMetadataScan(filepath, properties['text'], data, toc))
+
+		if properties['toc'] is not None:
+			self._fileMetadataKeep(filepath, stat, digest, properties)
+
+		return properties
+
+	def _fileMetadataKeep(self, filepath, stat, digest, properties):
+		"""Keep the properties of the file (see _fileMetadata), in memory and 
+		in the project index
+		"""
+
+		if self.project_index:
+			self.project_index.put(filepath, stat, digest, properties)
+
+		tmp = dict(properties)
+		tmp['text'] = list(self._textOf(tmp))
+		self.cache_metadata[filepath] = (stat.st_mtime, stat.st_size, tmp)
+
+	def _filePaths(self, filepath):
+		"""Output paths of the file in the book. See _fileMetadata """
+
+		properties = {'real_output' : '', 'path_input' : '', 'toc':'', 
+		             'title' : '', 'index_url': ''}
+
+		properties['path_input']  = filepath
+		properties['real_output'] = self._getOutputPath(filepath) + ".html"
+		properties['output']      = self._getOutputPath(filepath, strip_root=True) + ".html"
+		properties['title']       = properties['output']
+		properties['index_url']   = path_relative_to(
+				            os.path.join(self.output, 'index.html'), properties['real_output'])
+
+		return properties
+
+	def _fileText(self, filepath):
+		"""The lines of the file """
+
+		return text_lines(cmd_open_bytes(filepath))
+
+	def _textOf(self, properties):
+		"""The text of the file, read now if it came from the project index """
+
+		if 'text' not in properties:
+			properties['text'] = self._fileText(properties['path_input'])
+
+		return properties['text']
+
+	def _fileMetadataScan(self, filepath, cmd_text, data, toc=True):
+		"""Title, outgoing links and, from pandoc, the TOC (of data, the file 
+		as bytes: no encoding again). See _fileMetadata
+
+		:toc   False: no pandoc, the TOC is None
+		"""
+
+		properties = dict()
+
+		if self.format_from == 'markdown':
+			tmp = findTitleMd(text_lines=cmd_text)
+			if tmp:
+				properties['title'] = tmp
+
+			extensions = "|".join(ACCEPTED_MD_EXTENSIONS)
+			properties['links'] = sorted(set(
+				[link[0] for link in extractMdLinks(cmd_text, extension=extensions, style='wiki')] + 
+				[link[1] for link in extractMdLinks(cmd_text, extension=extensions, style='inline')]))
+
+		properties['toc'] = self._fileToc(data) if toc else None
+		
+		return properties
+
+	def _fileToc(self, data):
+		"""The TOC (html) of the file (data, as bytes), from pandoc """
+
+		# Magic begins! extract TOC
+		cmd = list() 
+		cmd.append(self.settings['PANDOC'])
+		cmd.append('--toc')
+		cmd.append('--standalone')
+
+		minimum = self._runPandoc(cmd, True, data)
+		minimum = str(minimum, encoding='utf8')
+
+		#remove new lines to not break pandoc
+		minimum = minimum.splitlines()
+		minimum = "".join(minimum)
+		
+		return getTOC(minimum) 
+
+	def _parseBody(self, text_lines, references=True):
+		"""Parse properly the text 
+
+		:references   add the references (wikilinks) at the end. Chunked book: 
+		              once for all the pages
+		"""
+
+		cmd_text = text_lines
+
+		if not self.format_from == 'markdown':
+			cmd_text = "".join(cmd_text)
+		else:
+			cmd_text, _ = if_special_elements(cmd_text, self.settings['TOC_TAG'])
+			cmd_text, _ = parse_wikilinks(cmd_text, this_references=self.references_list)
+			cmd_text = "".join(cmd_text)
+			if references:
+				cmd_text += "\n\n" + self.references_all
+
+		return cmd_text
+
+	def _variablesArgs(self, variables):
+		"""Template variables (dict name: html) for pandoc. In a metadata file 
+		if pandoc can (no ARG_MAX or quoting problems), if not as --variable. 
+		Nothing with pandy's template: it doesn't use them
+		"""
+
+		if self.settings['TEMPLATE_PANDY']:
+			return list()
+
+		if pandoc_version(self.settings['PANDOC']) >= (2, 3):
+			return ['--metadata-file=' + pandoc_variablesFile(variables, self.tmp_dir)]
+
+		args = list()
+		for key in sorted(variables):
+			args.append('--variable=' + key + ':' + variables[key])
+
+		return args
+
+	def _sidebarNavigation(self, current):
+		"""Sidebar for the page: the whole list, or (shared) only a placeholder 
+		and the script that fills it (see navigation_js). Search box first, if any
+		"""
+
+		root = path_relative_to(os.path.join(self.output, "x"), current['real_output'])
+		root = root[:-1].replace(os.sep, "/")
+
+		search = ''
+		if self.settings['SEARCH_INDEX']:
+			search = HTML_SEARCH.format(root=root)
+
+		if not self.nav_shared:
+			return search + self.makeNavigationLinks(href_active=current['output'])
+
+		src = root + path_getFilename(self.nav_shared)
+
+		return search + HTML_NAV_SHARED.format(root=root, src=src, 
+			                          active=current['output'].replace(os.sep, "/"))
+
+	def makeNavigationLinks(self, href_active=None, isIndex=False):
+		"""make the whole book navigation: 
+
+		:href_selected    item to apply active class and insert toc 
+		"""
+
+		final = ""
+		anchor_tpl = '<a href="{href}">{title}</a>'
+
+		for i in range(0, len(self.files)):
+			current = self.db_files[self.files[i]]
+
+			if current == "index":
+				continue			
+			
+			title = current['title']
+			href  = current['output']
+			
+			info_active = ""
+			info_toc    = ""
+
+			if not isIndex:
+				real_href = path_relative_to(href, href_active)
+
+				if href == href_active:
+					info_active = " class='active'"
+					info_toc = current['toc']
+			else:
+				real_href = href
+				info_toc = current['toc'].replace('<a href="#', '<a href="' + real_href + "#")
+
+			anchor = anchor_tpl.format(href=real_href, title=title)
+			li = "<li{active}>" + anchor + "{toc}</li>"
+			li = li.format(active=info_active, toc=info_toc)
+			
+			final += li
+
+		return "<ul>" + final + "</ul>"
+
+
+
+# =================
+# == Projects! ====
+# =================
+
+def projects_list(paths):
+	"""Config files of the projects: .ini files as they are, folders: their 
+	.ini files (sorted, not recursive)
+	"""
+
+	projects = list()
+
+	for path in paths:
+		if os.path.isdir(path):
+			for name in sorted(os.listdir(path)):
+				if name.endswith(".ini"):
+					projects.append(os.path.join(path, name))
+		else:
+			projects.append(path)
+
+	return projects
+
+def projects_run(arg_dict):
+	"""Build all the projects (--projects) at once: plan all of them and run 
+	every job with one pool of workers. A failing project doesn't stop 
+	the others. Prints a summary by project. 
+
+	:arg_dict   args (see get_args); the projects .ini replace the source
+	returns True if all the projects finished fine
+	"""
+
+	sessions = list() # (ini, prefix of its messages, session, jobs, error)
+
+	# one pool for all the projects: its workers and lanes from the command line
+	pool = dict(_DEFAULT_CONFIG)
+	pool.update((key, value) for key, value in arg_dict.items() if value is not None and key in pool)
+	workers = pool['JOBS'] or _DEFAULT_CONFIG['JOBS']
+	lanes, latex_memory = plan_lanes(dict(pool, JOBS=workers))
+
+	for ini in projects_list(arg_dict.pop('PROJECTS')):
+		msg("Project: " + ini)
+
+		args = dict(arg_dict)
+		args['SOURCE'] = ini
+		prefix = "[" + path_delExtension(path_getFilename(ini)) + "] "
+
+		session, jobs, error = None, None, None
+		try:
+			session = msg_prefixed(prefix, Pandy)(prepare_args(args), autorun=False)
+			session.latex_memory = latex_memory
+			jobs = msg_prefixed(prefix, session.start)()
+		except (Exception, SystemExit) as problem:
+			error = problem
+
+		for job in jobs or list():
+			job.action = msg_prefixed(prefix, job.action)
+
+		sessions.append((ini, prefix, session, jobs, error))
+
+	all_jobs = list()
+	for _, _, _, jobs, _ in sessions:
+		all_jobs += jobs or list()
+
+	plan_run(all_jobs, workers, stop_on_error=False, lanes=lanes)
+
+	msg("\nProjects:")
+	all_fine = True
+
+	for ini, prefix, session, jobs, error in sessions:
+		jobs = jobs or list()
+		states = dict()
+		for job in jobs:
+			states[job.state] = states.get(job.state, 0) + 1
+
+		failed = [job for job in jobs if job.state == 'failed']
+		fine = (error is None and not failed and not states.get('skipped') 
+		        and session.stats['success']) # --check
+		all_fine = all_fine and fine
+
+		summary = ", ".join(str(states[state]) + " " + state for state in sorted(states))
+		msg(ini + " ... " + ("ok" if fine else "FAILED") + (" (" + summary + ")" if summary else ""), 4)
+
+		if error is not None:
+			msg(str(error) or error.__class__.__name__, 8)
+		for job in failed:
+			msg(job.name + ": " + str(job.error), 8)
+
+		if session is not None:
+			msg_prefixed(prefix, session.finish)(jobs, fine, pooled=True)
+
+	projects_finish([(session, jobs) for _, _, session, jobs, _ in sessions if session is not None])
+
+	return all_fine
+
+def projects_finish(finished):
+	"""What the sessions of the pool share, once for all of them: the 
+	durations (by file), the cache eviction (by folder) and the metrics 
+	(by file, a source label for each project)
+
+	:finished   list of (session, jobs) after session.finish(pooled=True)
+	"""
+
+	durations, caches, metrics = dict(), dict(), dict()
+
+	for session, jobs in finished:
+		if jobs:
+			durations.setdefault(session._durationsPath(), list()).extend(jobs)
+
+		if session.cache:
+			caches.setdefault(os.path.abspath(session.cache.folder), session.cache)
+
+		if session.settings['METRICS_FILE']:
+			path = os.path.abspath(session.settings['METRICS_FILE'])
+			metrics.setdefault(path, list()).append((session.stats, {'source': session.input}))
+
+	for path, jobs in durations.items():
+		durations_save(path, jobs)
+
+	for cache in caches.values():
+		cache.evict()
+
+	for path, runs in metrics.items():
+		metrics_write(path, runs)
+
+
+if __name__ == '__main__':
+
+	if sys.version_info[0] < 3:
+		print(" Sorry, only python 3")
+		exit()
+
+	args = get_args()
+
+	print ("\n  ------------------ STARTING... ---------------------------\n ")
+
+	if args.get('PROJECTS'):
+		if not projects_run(args):
+			print ("\n  ------------------ DONE, WITH ERRORS :( -------------------")
+			sys.exit(1)
+	else:
+		CONFIG = prepare_args(args)
+
+		# steady, ready, go!
+		try:
+			session = Pandy(CONFIG)
+		except ShardsIncomplete as error:
+			msg(str(error))
+			print ("\n  ------------------ DONE, WITH ERRORS :( -------------------")
+			sys.exit(1)
+
+		if not session.stats['success']:
+			print ("\n  ------------------ DONE, WITH ERRORS :( -------------------")
+			sys.exit(1)
+	
+	print ("\n  ------------------ DONE! :) ------------------------------")
+
+# History 
+
+# unreleased:  --metrics: prometheus textfile with the run stats
+#              Pandy as a reusable session: autorun=False, plan(), build(paths)
+#              build plan (jobs), --jobs, longest first from previous durations, --dry-run
+#              only replace outputs whose content changed
+#              --tpl-pandy-css: pandy's CSS in a shared file
+#              --side-shared: book sidebar in a shared .js file
+#              book navigation to pandoc in a metadata file (pandoc >= 2.3), not args
+#              fix: pandoc through a shell only on windows (elsewhere only the first arg reached it)
+#              --search: book search with a prebuilt, sharded index
+#              --projects: many .ini projects, one pool of workers
+#              --shard i/N and --shard-merge N: builds split across machines
+#              book: titles, TOC and links kept between runs in .pandy-index.sqlite
+#              --check: links, titles, index and outputs checked without pandoc
+#              findTitleMd: stops at the title, YAML front matter, no newline in # titles
+#              files without pandy's markdown extras go to pandoc as they are (bytes)
+#              pandy's template injected while pandoc writes, not on the whole page
+#              --timeout, --limit-memory, --limit-cpu for each pandoc
+#              --keep-going (summary with pandoc's errors) and --retry-failed
+#              merge in volumes (--volume-size, --volume-files) with a front page
+#              individually: one job per file and format, each with its own -t (they piled up)
+#              lanes for slow formats (--lane-heavy, --lane-latex, --lane-latex-memory)
+#              individually: identical sources converted once, the rest hardlinked/copied
+#              --cache (or $PANDY_CACHE_DIR): outputs by content, shared by projects and runs
+#              --chunked: book rendered by one pandoc (chunkedhtml), pages made from the chunks
+#              --fast-md: simple markdown to html without starting pandoc for each file
+#              --index-split N: book index by folders, in pages of N files
+# 2017-08-21:  version 2.0.3 (released)
+#              misc fixes/bugs
+#              fixes for css
+# 2014-02-18:  wikilinks fixes
+# 2014-02-16:  Version 2.0 (released)
+#              updated tests
+#              fix references creation: only add found
+#              Add built-in template
+#              book should work with any file format. On markdown you get goodies.
+#              args: proper list for format-to option
+#                    -> in settings, use space separated list
+#              .ini now parsed with configparser. Values in .ini must not have quotes
+#              fixes
+#              clean up
+#  
+# 2014-02-15:  complete ref list added
+#              wikilinks: use a ref "database" to search (instead of files)
+#              fixes
+#  
+# 2014-02-14:  if found, use beautifulsoup
+#              new syntax for wikilinks [:file][title]
+#              fixes for merging
+#              Change whole navigation handling
+#              fix index creation (toc) when subfolders
+#              fix sidebar navigation when subfolders
+#              fix wikilinks (reference)
+#              find title in md and not in html
+#              fixes
+#              clean up
+# 
+# 2014-02-13:  source also accept a .ini (no force source and use only from config)
+#              option to exclude toc from sidebar navigation
+#              auto discover index
+#              Navigations in own pandoc variables
+#              check duplicates from custom index (while adding them to process)
+#              if custom index has title, use it as project title
+#              new wiki links: like md reference links but inverted -> [file][title]
+#              no required: format to/from (so can use .ini)
+#              book only for markdown
+#              list all titles (and toc) in index
+#              New way for handling files in book
+#              chg db_files format
+#              Remove toc for index
+#              fixes
+#  
+# 2014-02-12:  rewriting. fixes
+#              order files according to custom index
+#              navigation: pages titles in sidebar, next-prev
+#              sidebar -> highlight active
+#              nav_pre according to index
+#              read .ini automatically in folder where runs/source
+#              remove some methods/cleanup
+#              args take precedence over ini, which take precedence over default
+#              wikilinks without file| prefix. Must use markdown extension
+#              wikilinks in any file (not only index) (book)
+#  
+# 2014-02-11: ini fixes
+#             option to hide navigation in book
+#             modify command options
+#             
+# 2014-02-11: version 1.9 (released)
+#             only python 3
+#             fixes for book
+# 
+# 2014-01-30: prints file being converted
+#             Filter extensions for converting, only html (hardcoded)
+# 
+# 2014-01-23: add titles in sidebar for navigation
+# 
+# 2014-01-21: version 1.8.1 (released)
+#             new syntax for admonition
+# 
+# 2013-12-10: version 1.8 (released)
+#             code refactoring
+#             Less call to globals/obvious params
+#             wikiLinks: if md link has no title and it's an existing file, use the filename as title 
+#             Book: warn if no output path (defaults to current dir) and source dir is the running one
+#             minor fixes
+#             remove object creation to get file properties -> now dict
+#             code refactoring, now using a class
+#             config dict takes precedence over args
+#
+# 2013-12-09: less calls to globals
+#             changes to args
+#             + processing messages
+#             no more tmp files
+#             + more tests
+#             modified test findH1
+#             change findH1 method
+#             Fix merging
+#             merge (HTML): now can parse metadata block and have toc for full document
+#             Book: include toc ONLY on selected file
+#             book: fix having title twice in file when declared with meta-block
+#             fix titles in book: add them, if not found add the filename (no ext)
+#
+# 2013-12-08: fixing nasty bugs
+#             Fix finding H1s
+#             code fixing / rewriting, less call to globals
+#             + config file support (ini without sections)
+#
+# 2013-12-06: Clean up code
+#             default config in dictionary
+#             minor fix for admonitions
+#             add simple tests / debug
+#             Finish admonition parsing
+#
+# 2013-12-05: version 1.5 (released)
+#             rewritten and to include cool stuff
+#             + admonition parsing
+#             + Abbreviations parsing markdown -> html
+#             + warning when book also have other output formatting & html
+#             + warning custom index with wiki links only for markdown
+#             + more formats for input and output
+#             fix: formats_to: no duplicates
+#             fix: --nav only for book
+#             fix: add html5 output default, can change to 'html'
+#             fix: when merging: add <title>
+#
+# 2013-11-10: Added: merge files in directory -> end up with one output
+#
+# 2013-07-25: CHG data dir path
+#
+# 2013-07-21: version 1.0
+#             Add folder (recursive) support
+#             Add pandy script: "wrapper" for Pandoc.
@@ -17,6 +17,29 @@ class TestMe(object):
 		self.init_func(self.test_internallinks)
 		self.init_func(self.test_wikilinks)
 		self.init_func(self.test_findTitleMd)
+		self.init_func(self.test_metrics)
+		self.init_func(self.test_buildPlan)
+		self.init_func(self.test_saveIfChanged)
+		self.init_func(self.test_searchIndex)
+		self.init_func(self.test_shards)
+		self.init_func(self.test_projectIndex)
+		self.init_func(self.test_check)
+		self.init_func(self.test_specialMarkers)
+		self.init_func(self.test_templateStream)
+		self.init_func(self.test_limits)
+		self.init_func(self.test_keepGoing)
+		self.init_func(self.test_mergeVolumes)
+		self.init_func(self.test_lanes)
+		self.init_func(self.test_dedupe)
+		self.init_func(self.test_cache)
+		self.init_func(self.test_chunked)
+		self.init_func(self.test_fastMd)
+		self.init_func(self.test_indexFolders)
+		self.init_func(self.test_session)
+		self.init_func(self.test_projects)
+		self.init_func(self.test_variablesFile)
+		self.init_func(self.test_sharedCss)
+		self.init_func(self.test_sharedNav)
 		
 		self.finishing()
 
@@ -246,7 +269,953 @@ class TestMe(object):
 			print (" It should be: " + shouldbe)
 			print ("But got " + result)
 
+		# YAML front matter, with a comment and a long block
+		md_from = ['---', '# not a title', 'author: someone'] + ['tags: x'] * 40 + [
+		'title: "Tiempo"',
+		'---',
+		'# Hora']
+
+		result = pandy.findTitleMd(text_lines=md_from)
+		self.tests_total += 1
+
+		drumroll = compare('string', result, shouldbe)
+		self.print_result("Finding title, YAML front matter", drumroll)
+		if not drumroll:
+			print (" It should be: " + shouldbe)
+			print ("But got " + str(result))
+
+		# headers in code are not titles
+		md_from = [
+		'```',
+		'# comment in code',
+		'```',
+		'# Tiempo\n']
+
+		result = pandy.findTitleMd(text_lines=md_from)
+		self.tests_total += 1
+
+		drumroll = compare('string', result, shouldbe)
+		self.print_result("Finding title, not in code", drumroll)
+		if not drumroll:
+			print (" It should be: " + shouldbe)
+			print ("But got " + str(result))
+
+
+
+	def test_metrics(self):
+		"""Prometheus textfile metrics"""
+
+		stats = pandy.stats_new()
+		stats['files'][('converted', 'html')] = 3
+		stats['bytes']['html'] = 1024
+		stats['pandoc_launches'] = 4
+		stats['durations']['total'] = 1.5
+
+		result = pandy.metrics_text(stats, {'source': 'C:\\docs "main"'})
+		result = result.splitlines()
+
+		shouldbe = [
+		'pandy_files{format="html",result="converted",source="C:\\\\docs \\"main\\""} 3',
+		'pandy_pandoc_launches{source="C:\\\\docs \\"main\\""} 4',
+		'pandy_duration_seconds{mode="total",source="C:\\\\docs \\"main\\""} 1.5',
+		'pandy_bytes_written{format="html",source="C:\\\\docs \\"main\\""} 1024',
+		]
+
+		self.tests_total += 1
+		drumroll = all(line in result for line in shouldbe)
+		self.print_result("Metrics samples", drumroll)
+		if not drumroll:
+			diff = difflib.ndiff(shouldbe, result)
+
+			for d in diff:
+				print (d)
+
+		self.tests_total += 1
+		drumroll = "# TYPE pandy_files gauge" in result
+		self.print_result("Metrics type lines", drumroll)
+
+	def test_buildPlan(self):
+		"""Build plan: longest job first and critical path"""
+
+		ran = list()
+		def job(name, deps=None):
+			return pandy.Job(name, 'convert', lambda: ran.append(name), deps=deps)
+
+		small = job('small')
+		big   = job('big')
+		order = job('order', [small, big])
+		last  = job('last', [order])
+		jobs  = [small, big, order, last]
+
+		pandy.plan_estimate(jobs, {'small': 1, 'big': 10, 'order': 2, 'last': 3})
+		failed = pandy.plan_run(jobs, workers=1)
+
+		self.tests_total += 1
+		drumroll = compare('list', ran, ['big', 'small', 'order', 'last']) and not failed
+		self.print_result("Longest job first", drumroll)
+		if not drumroll:
+			print ("Order: " + ", ".join(ran))
+
+		path, total = pandy.plan_criticalPath(jobs)
+
+		self.tests_total += 1
+		drumroll = [j.name for j in path] == ['big', 'order', 'last'] and total == 15
+		self.print_result("Critical path", drumroll)
+		if not drumroll:
+			print ("Got: " + str(path) + " " + str(total))
+
+		# a failure skips everything after it, not only its children
+		ran = list()
+		def fail():
+			raise ValueError("boom")
+
+		bad    = pandy.Job('bad', 'convert', fail)
+		child  = job('child', [bad])
+		grand  = job('grand', [child, small])
+		others = [job('other' + str(n)) for n in range(3)]
+		jobs   = [small, bad, child, grand] + others
+		for each in jobs:
+			each.state, each.error = 'pending', None
+
+		pandy.plan_estimate(jobs, {'small': 1, 'bad': 1, 'child': 1, 'grand': 1, 
+		                           'other0': 3, 'other1': 4, 'other2': 5})
+		failed = pandy.plan_run(jobs, workers=1, stop_on_error=False)
+
+		self.tests_total += 1
+		drumroll = (failed == [bad] and [child.state, grand.state] == ['skipped', 'skipped'] 
+			        and ran == ['other2', 'other1', 'other0', 'small'])
+		self.print_result("Failed job, the rest skipped", drumroll)
+		if not drumroll:
+			print ("Got: " + str(ran) + " " + str([child.state, grand.state]))
+
+	def test_saveIfChanged(self):
+		"""Outputs only rewritten when their content changes"""
+
+		import tempfile, os
+
+		with tempfile.TemporaryDirectory() as folder:
+			path = os.path.join(folder, "page.html")
+
+			results = [pandy.save(path, "hola"), pandy.save(path, "hola"), pandy.save(path, "chau")]
+
+			self.tests_total += 1
+			drumroll = compare('list', results, [True, False, True]) and len(os.listdir(folder)) == 1
+			self.print_result("Save only if changed", drumroll)
+			if not drumroll:
+				print ("Got: " + str(results) + " " + str(os.listdir(folder)))
+
+	def test_searchIndex(self):
+		"""Search index: terms and shards"""
+
+		text = 'Hora con [contadores](contadores.md) y <b>bun</b>\n\n[ref]: http://example.com/ignored\n'
+		result = pandy.search_terms(text, headings=['Hora'], title='Tiempo')
+		shouldbe = {'hora': 6, 'con': 1, 'contadores': 1, 'bun': 1, 'tiempo': 10}
+
+		self.tests_total += 1
+		drumroll = result == shouldbe
+		self.print_result("Search terms", drumroll)
+		if not drumroll:
+			print ("Got: " + str(result))
+
+		index = pandy.SearchIndex()
+		index.add('tiempo.html', 'Tiempo', result)
+		index.add('hora.html', 'Hora', {'hora': 10})
+		shards = index.shards()
+
+		self.tests_total += 1
+		drumroll = (shards['68.json'] == {'hora': [0, 6, 1, 10]} 
+			        and sorted(shards['63.json']) == ['con', 'contadores'])
+		self.print_result("Search shards", drumroll)
+		if not drumroll:
+			print ("Got: " + str(shards))
+
+	def test_shards(self):
+		"""Sharded builds: stable split and manifests check"""
+
+		import tempfile, os
+
+		names = ["convert:{}.md".format(n) for n in range(20)]
+		split = [pandy.shard_of(name, 3) for name in names]
+
+		self.tests_total += 1
+		drumroll = (split == [pandy.shard_of(name, 3) for name in names] and set(split) == {1, 2, 3}
+			        and pandy.shard_parse("2/3") == (2, 3))
+		self.print_result("Shard split", drumroll)
+		if not drumroll:
+			print ("Got: " + str(split))
+
+		with tempfile.TemporaryDirectory() as folder:
+			jobs = [pandy.Job(name, 'convert', None, ext_to='html', output=os.path.join(folder, name[8:-3] + ".html")) 
+			        for name in names]
+			plan_hash = pandy.shard_planHash(jobs, folder)
+
+			for job in jobs:
+				job.state = 'done'
+				pandy.save(job.output, job.name)
+
+			for number in (1, 2):
+				mine = [job for job in jobs if pandy.shard_of(job.name, 3) == number]
+				pandy.shard_writeManifest(folder, (number, 3), plan_hash, mine)
+
+			missing = pandy.shard_check(folder, 3, jobs)
+
+			mine = [job for job in jobs if pandy.shard_of(job.name, 3) == 3]
+			pandy.shard_writeManifest(folder, (3, 3), plan_hash, mine)
+			complete = pandy.shard_check(folder, 3, jobs)
+
+			self.tests_total += 1
+			drumroll = missing[0] == "Shard 3/3: no manifest" and complete == []
+			self.print_result("Shards check", drumroll)
+			if not drumroll:
+				print ("Got: " + str(missing) + " " + str(complete))
+
+		# book: scans everywhere, the TOCs (pandoc) only where a page or index uses them
+		scans = [pandy.Job("scan:{}.md".format(n), 'scan', None) for n in range(6)]
+		tocs  = [pandy.Job("toc:{}.md".format(n), 'toc', None, deps=[scans[n]]) for n in range(6)]
+		pages = [pandy.Job("page:{}.md".format(n), 'page', None, deps=[tocs[n]]) for n in range(6)]
+		index = pandy.Job("index", 'index', None, deps=tocs[:2])
+		book  = scans + tocs + pages + [index]
+
+		kept = list()
+		for number in (1, 2, 3):
+			mine = pandy.shard_jobs(book, number, 3)
+			names = set(job.name for job in mine)
+			needed = set(dep.name for job in mine if job.kind in pandy.SHARD_KINDS for dep in job.deps)
+			kept.append(all(job.name in names for job in scans) 
+				        and set(job.name for job in mine if job.kind == 'toc') == needed)
+
+		self.tests_total += 1
+		drumroll = all(kept) and len(set(pandy.shard_planHash(book[:n], "") for n in (12, 6))) == 1
+		self.print_result("Shards: TOCs where needed", drumroll)
+		if not drumroll:
+			print ("Got: " + str(kept))
+
+	def test_projectIndex(self):
+		"""Book properties kept between runs"""
+
+		import tempfile, os
+
+		with tempfile.TemporaryDirectory() as folder:
+			page = os.path.join(folder, "page.md")
+			pandy.save(page, "# Hola")
+			stat = os.stat(page)
+
+			index = pandy.ProjectIndex(os.path.join(folder, pandy.INDEX_DB_NAME), "3.1 markdown")
+			index.put(page, stat, "abc", {'title': 'Hola', 'toc': '', 'links': ['b.md'], 'text': ['# Hola']})
+			index.save()
+
+			index = pandy.ProjectIndex(os.path.join(folder, pandy.INDEX_DB_NAME), "3.1 markdown")
+			index.load()
+			fresh, same = index.fresh(page, stat), index.same(page, "abc")
+
+			other = pandy.ProjectIndex(os.path.join(folder, pandy.INDEX_DB_NAME), "3.2 markdown")
+			other.load()
+
+			self.tests_total += 1
+			drumroll = (fresh == {'title': 'Hola', 'toc': '', 'links': ['b.md']} and same == fresh 
+				        and index.same(page, "xyz") is None and other.records == {})
+			self.print_result("Project index", drumroll)
+			if not drumroll:
+				print ("Got: " + str(fresh) + " " + str(other.records))
+
+	def test_check(self):
+		"""--check: problems found without pandoc"""
+
+		import tempfile, os
+
+		with tempfile.TemporaryDirectory() as folder:
+			source = os.path.join(folder, "src")
+			os.mkdir(source)
+			pandy.save(os.path.join(source, "a.md"), "# Same\n\n[:nothere][] [ok](b.md) [bad](gone.md)\n")
+			pandy.save(os.path.join(source, "b.md"), "# Same\n")
+
+			config = dict(pandy._DEFAULT_CONFIG)
+			config.update({'SOURCE': source, 'OUTPUT_PATH': os.path.join(folder, "out"), 
+			               'PANDOC': 'no-pandoc-here', 'EXTENSIONS_EXTRA': pandy.EXTENSIONS_EXTRA})
+			problems = pandy.Pandy(config, autorun=False).check()
+
+			# --check in a session: the build fails, the caller goes on
+			try:
+				stats = pandy.Pandy(dict(config, CHECK=True), autorun=False).build()
+				failed = not stats['success'] and not os.path.exists(os.path.join(folder, "out"))
+			except SystemExit:
+				failed = False
+
+		shouldbe = ["Unresolved wikilink in {}: [:nothere]".format(os.path.join(source, "a.md")), 
+		            "Unresolved link in {}: (gone.md)".format(os.path.join(source, "a.md")), 
+		            "Duplicated title 'Same': {}, {}".format(os.path.join(source, "a.md"), os.path.join(source, "b.md"))]
+
+		self.tests_total += 1
+		drumroll = compare('list', problems, shouldbe)
+		self.print_result("Check without pandoc", drumroll)
+		if not drumroll:
+			print ("Got: " + str(problems))
+
+		self.tests_total += 1
+		self.print_result("Check in a session, no exit", failed)
+
+	def test_specialMarkers(self):
+		"""Raw files without pandy extras go to pandoc as they are"""
+
+		plain = [b'# Title\n\nSome [link](http://example.com) and [ref][1].\n', b'\xef\xbb\xbfHola\r\n']
+		special = [b'\xef\xbb\xbf[note:Title]\r\n  text\n', b'text\n*[ABBR]: Abbreviation\n', 
+		           b'see [other](other.md)\n', b'text\n\n[TOC]\n', 'text\n*[CAFÉ]: Cafetería\n'.encode('utf-8')]
+
+		results = [pandy.if_special_markers(data, '[TOC]') for data in plain + special]
+
+		self.tests_total += 1
+		drumroll = compare('list', results, [False, False, True, True, True, True, True])
+		self.print_result("Special markers in bytes", drumroll)
+		if not drumroll:
+			print ("Got: " + str(results))
+
+	def test_templateStream(self):
+		"""Pandy's template injected while the page comes, in any chunks"""
+
+		html = "<html><head><title>Tiempo</title></head><body><p>Hora</p></body></html>\n"
+		whole = pandy.builtintpl(html, book_nav='NAV', sidebar='SIDE', projindex='INDEX', pagetitle='Tiempo')
+		data = html.encode('utf-8')
+
+		results = list()
+		for size in (1, 3, 7, 1024):
+			parts = list()
+			template = pandy.TemplateStream(parts.append, book_nav='NAV', sidebar='SIDE', 
+				                            projindex='INDEX', pagetitle='Tiempo')
+			for start in range(0, len(data), size):
+				template.feed(data[start:start + size])
+			template.close()
+
+			results.append(b"".join(parts).decode('utf-8') == whole)
+
+		self.tests_total += 1
+		drumroll = all(results) and whole.count('NAV') == 2 and '<style' in whole.split('</head>')[0]
+		self.print_result("Template while streaming", drumroll)
+		if not drumroll:
+			print ("Got: " + str(results))
+
+	def test_limits(self):
+		"""Stuck conversions are killed after the timeout"""
+
+		import subprocess, sys, time
+
+		start = time.time()
+		results = list()
+		for stream in (None, [].append):
+			try:
+				pandy.run_subprocess([sys.executable, '-c', 'import time; time.sleep(10)'], True, "text", 
+					                 stream=stream, limits={'timeout': 0.5})
+				results.append(False)
+			except subprocess.TimeoutExpired as error:
+				results.append(error.timeout == 0.5)
+
+		self.tests_total += 1
+		drumroll = results == [True, True] and time.time() - start < 5
+		self.print_result("Timeout kills", drumroll)
+		if not drumroll:
+			print ("Got: " + str(results))
+
+	def test_keepGoing(self):
+		"""A failure doesn't stop the rest; failed and skipped are listed"""
+
+		import tempfile, os
+
+		def fail():
+			raise ValueError("boom")
 
+		with tempfile.TemporaryDirectory() as folder:
+			inputs = [os.path.join(folder, name + ".md") for name in ('bad', 'after', 'good')]
+			for path in inputs:
+				pandy.save(path, "text")
+
+			bad   = pandy.Job('bad', 'convert', fail, input=inputs[0])
+			after = pandy.Job('after', 'page', lambda: None, deps=[bad], input=inputs[1])
+			good  = pandy.Job('good', 'convert', lambda: None, input=inputs[2])
+			jobs  = [bad, after, good]
+
+			failed = pandy.plan_run(jobs, workers=2, stop_on_error=False)
+			listed = pandy.failed_save(os.path.join(folder, pandy.FAILED_NAME), jobs)
+			loaded = pandy.failed_load(os.path.join(folder, pandy.FAILED_NAME))
+
+		states = [job.state for job in jobs]
+
+		self.tests_total += 1
+		drumroll = (failed == [bad] and states == ['failed', 'skipped', 'done'] 
+			        and listed == loaded == [os.path.abspath(path) for path in inputs[:2]])
+		self.print_result("Keep going, list failed", drumroll)
+		if not drumroll:
+			print ("Got: " + str(states) + " " + str(loaded))
+
+		# a failed merge: all its files, and --retry-failed converts it again
+		with tempfile.TemporaryDirectory() as folder:
+			source = os.path.join(folder, "src")
+			os.mkdir(source)
+			pandy.save(os.path.join(source, "a.md"), "# A\n")
+			pandy.save(os.path.join(source, "b.md"), "FAILME\n")
+
+			config = dict(pandy._DEFAULT_CONFIG)
+			config.update({'SOURCE': source, 'OUTPUT_PATH': os.path.join(folder, "out"), 'MERGE': True, 
+			               'KEEP_GOING': True, 'PANDOC': self.fake_pandoc(folder)})
+			session = pandy.Pandy(config, autorun=False)
+			session.build()
+			loaded = pandy.failed_load(os.path.join(folder, "out", pandy.FAILED_NAME))
+
+			pandy.save(os.path.join(source, "b.md"), "# B\n")
+			session.settings['RETRY_FAILED'] = True
+			retried = session.build()['outputs_changed']
+
+		self.tests_total += 1
+		drumroll = sorted(os.path.basename(path) for path in loaded) == ["a.md", "b.md"] and retried == 1
+		self.print_result("Failed merge, retried", drumroll)
+		if not drumroll:
+			print ("Got: " + str(loaded) + " " + str(retried))
+
+	def test_mergeVolumes(self):
+		"""Merge split in volumes by size and amount of files"""
+
+		import tempfile, os
+
+		with tempfile.TemporaryDirectory() as folder:
+			files = list()
+			for name, size in (('a', 400), ('b', 400), ('c', 1500), ('d', 100), ('e', 100)):
+				files.append(os.path.join(folder, name + ".md"))
+				pandy.save(files[-1], "x" * size)
+
+			names = lambda volumes: [[os.path.basename(f)[0] for f in volume] for volume in volumes]
+
+			by_size  = names(pandy.merge_volumes(files, max_size=1024))
+			by_files = names(pandy.merge_volumes(files, max_files=2))
+			single   = names(pandy.merge_volumes(files))
+
+		self.tests_total += 1
+		drumroll = (by_size == [['a', 'b'], ['c'], ['d', 'e']] and by_files == [['a', 'b'], ['c', 'd'], ['e']] 
+			        and single == [['a', 'b', 'c', 'd', 'e']])
+		self.print_result("Merge volumes", drumroll)
+		if not drumroll:
+			print ("Got: " + str(by_size) + " " + str(by_files))
+
+	def test_lanes(self):
+		"""Heavy formats limited to their lane, quick ones don't wait"""
+
+		import threading, time
+
+		lock = threading.Lock()
+		running, most = dict(), dict()
+
+		def action(lane):
+			def work():
+				with lock:
+					running[lane] = running.get(lane, 0) + 1
+					most[lane] = max(most.get(lane, 0), running[lane])
+				time.sleep(0.05)
+				with lock:
+					running[lane] -= 1
+			return work
+
+		jobs = [pandy.Job("epub" + str(n), 'convert', action('heavy'), ext_to='epub') for n in range(4)]
+		jobs += [pandy.Job("html" + str(n), 'convert', action('light'), ext_to='html') for n in range(4)]
+		pandy.plan_estimate(jobs, dict(("epub" + str(n), 10) for n in range(4)))
+
+		pandy.plan_run(jobs, workers=3, lanes={'heavy': 1})
+		queues = pandy.plan_queues(jobs)
+
+		settings = dict(pandy._DEFAULT_CONFIG, JOBS=4, LANE_LATEX=3, LANE_LATEX_MEMORY=1200)
+		lanes, memory = pandy.plan_lanes(settings)
+
+		self.tests_total += 1
+		drumroll = (most == {'heavy': 1, 'light': 2} and queues['light']['jobs'] == 4
+			        and lanes == {'heavy': 2, 'latex': 2} and memory == 600)
+		self.print_result("Lanes", drumroll)
+		if not drumroll:
+			print ("Got: " + str(most) + " " + str(lanes) + " " + str(memory))
+
+	def test_dedupe(self):
+		"""Identical sources converted once, the others take the output"""
+
+		import tempfile, os
+
+		with tempfile.TemporaryDirectory() as folder:
+			files = list()
+			for name, text in (('a', "same"), ('b', "same"), ('c', "diff"), ('d', "longer")):
+				files.append(os.path.join(folder, name + ".md"))
+				pandy.save(files[-1], text)
+
+			digests = pandy.file_digests(files)
+
+			jobs = [pandy.Job(os.path.basename(f), 'convert', lambda: None, input=f) for f in files]
+			duplicated = pandy.plan_dedupe(jobs, lambda job: digests.get(job.input))
+
+			copy = os.path.join(folder, "copy.md")
+			pandy.file_linkOrCopy(files[0], copy)
+			copied = pandy.cmd_open_file(copy) == "same"
+			again = pandy.file_linkOrCopy(files[0], copy)
+
+		self.tests_total += 1
+		drumroll = (sorted(digests) == sorted(files[:3]) and duplicated == [jobs[1]] 
+			        and jobs[1].same is jobs[0] and jobs[1].deps == [jobs[0]] and copied and not again)
+		self.print_result("Identical sources", drumroll)
+		if not drumroll:
+			print ("Got: " + str(duplicated) + " " + str(sorted(digests)))
+
+	def test_cache(self):
+		"""Cache keys by content (not paths), kept outputs, least recently used out"""
+
+		import tempfile, os, time
+
+		with tempfile.TemporaryDirectory() as folder:
+			for branch in ('one', 'two'):
+				os.mkdir(os.path.join(folder, branch))
+				pandy.save(os.path.join(folder, branch, "page.md"), "# Page\n")
+				pandy.save(os.path.join(folder, branch, "tpl.html"), "$body$")
+
+			pandy.save(os.path.join(folder, "two", "tpl.html"), "<b>$body$</b>")
+
+			cache = pandy.ConversionCache(os.path.join(folder, "cache"), 100, "3.1")
+
+			def key(branch, tpl_branch=None):
+				page = os.path.join(folder, branch, "page.md")
+				tpl = os.path.join(folder, tpl_branch or branch, "tpl.html")
+				return cache.key(['pandoc', '--template=' + tpl, page], [page])
+
+			same     = key('one') == key('two', 'one')
+			template = key('one') != key('two')
+
+			# template by name, from the data dir (as the ini: TEMPLATE = github.html)
+			data_dir = os.path.join(folder, "data")
+			os.makedirs(os.path.join(data_dir, "templates"))
+			command = ['pandoc', '--data-dir=' + data_dir, '-t', 'html5', '--template=pandy-test']
+			pandy.save(os.path.join(data_dir, "templates", "pandy-test.html"), "$body$")
+			before = cache.key(command)
+			pandy.save(os.path.join(data_dir, "templates", "pandy-test.html"), "<i>$body$</i>")
+			data_template = before != cache.key(command)
+
+			output = os.path.join(folder, "out.html")
+			copied = os.path.join(folder, "copied.html")
+			pandy.save(output, "x" * 60)
+
+			cache.put("aa01", output)
+			missing = cache.copy("aa02", copied)
+			kept = cache.copy("aa01", copied) and os.path.getsize(copied) == os.path.getsize(output)
+
+			os.utime(cache.path("aa01"), (time.time() - 60, time.time() - 60))
+			cache.put("bb01", output)
+			deleted = cache.evict()
+			evicted = not os.path.exists(cache.path("aa01")) and os.path.exists(cache.path("bb01"))
+
+		self.tests_total += 1
+		drumroll = same and template and data_template and not missing and kept and deleted == 1 and evicted
+		self.print_result("Conversion cache", drumroll)
+		if not drumroll:
+			print ("Got: " + str([same, template, data_template, missing, kept, deleted, evicted]))
+
+	def test_chunked(self):
+		"""Chunked book: one pandoc for all the pages, then each page from its chunks"""
+
+		import tempfile, os, stat, sys
+
+		# stand-in pandoc: chunkedhtml splits at every heading 1
+		fake = "\n".join([
+			"import os, re, sys", 
+			"args = sys.argv[1:]", 
+			"if '--version' in args:", 
+			"	print('pandoc 3.1')", 
+			"	sys.exit(0)", 
+			"text = sys.stdin.buffer.read().decode('utf-8')", 
+			"if 'chunkedhtml' not in args:", 
+			"	sys.stdout.write('<html><body>' + text + '</body></html>')", 
+			"	sys.exit(0)", 
+			"out = args[args.index('-o') + 1]", 
+			"os.makedirs(out)", 
+			"chunks, ids = list(), dict()", 
+			"for number, chunk in enumerate(re.split(r'(?m)^# ', text)[1:]):", 
+			"	head, _, rest = chunk.partition('\\n')", 
+			"	found = re.search(r'\\{#([\\w-]+)', head)", 
+			"	title = re.sub(r'\\s*\\{.*', '', head)", 
+			"	ident = base = found.group(1) if found else title.lower().replace(' ', '-')", 
+			"	while ident in ids:", 
+			"		ident = base + '-' + str(int(ident[len(base) + 1:] or 0) + 1)", 
+			"	ids[ident] = '%03d.html' % number", 
+			"	chunks.append((ident, title, rest))", 
+			"for number, (ident, title, rest) in enumerate(chunks):", 
+			"	rest = re.sub(r'href=\"#([^\"]+)\"', lambda link: 'href=\"' + ids.get(link.group(1), '') + '#' + link.group(1) + '\"', rest)", 
+			"	with open(os.path.join(out, '%03d.html' % number), 'w') as tmp:", 
+			"		tmp.write('<!--pandy-before--><!--pandy-body--><section id=\"' + ident + ", 
+			"		          '\"><h1>' + title + '</h1>' + rest + '</section><!--pandy-after-->')", 
+			""])
+
+		with tempfile.TemporaryDirectory() as folder:
+			pandoc = os.path.join(folder, "pandoc")
+			pandy.save_ifChanged(pandoc, ("#!" + sys.executable + "\n" + fake).encode('utf-8'))
+			os.chmod(pandoc, os.stat(pandoc).st_mode | stat.S_IEXEC)
+
+			source = os.path.join(folder, "src")
+			os.mkdir(source)
+			pandy.save(os.path.join(source, "a.md"), "# A\n\nalpha\n\n# A two\n\nmore\n")
+			pandy.save(os.path.join(source, "b.md"), "% B\n\nbeta\n")
+			pandy.save(os.path.join(source, "c.md"), '# A\n\ngamma <a href="#a">top</a> <a href="#a-two">two</a>\n')
+
+			config = dict(pandy._DEFAULT_CONFIG)
+			config.update({'SOURCE': source, 'OUTPUT_PATH': os.path.join(folder, "out"), 'PANDOC': pandoc, 
+			               'BOOK': True, 'BOOK_CHUNKED': True, 'EXTENSIONS_EXTRA': pandy.EXTENSIONS_EXTRA})
+			book = pandy.Pandy(config)
+
+			page_a = pandy.cmd_open_file(os.path.join(folder, "out", "a.html"))
+			page_b = pandy.cmd_open_file(os.path.join(folder, "out", "b.html"))
+			page_c = pandy.cmd_open_file(os.path.join(folder, "out", "c.html"))
+			index  = pandy.cmd_open_file(os.path.join(folder, "out", "index.html"))
+
+		self.tests_total += 1
+		drumroll = (book.stats['pandoc_launches'] == 4 and "alpha" in page_a and "more" in page_a 
+			        and 'class="booknav"' in page_a and "pandy-page-1</h1>" not in page_a 
+			        and '<h1 class="title">B</h1>' in page_b and "% B" not in page_b and "beta" not in page_a 
+			        and 'href="a.html"' in index)
+		self.print_result("Chunked book", drumroll)
+		if not drumroll:
+			print ("Got: " + str(book.stats['pandoc_launches']) + " " + page_a)
+
+		# a heading repeated in other page keeps the id of the page alone, 
+		# links to the chunks go to the pages
+		self.tests_total += 1
+		drumroll = ('<section id="a"><h1>A</h1>' in page_c and 'href="#a"' in page_c 
+			        and 'href="a.html#a-two"' in page_c and "a-1" not in page_c and ".html#a\"" not in page_c)
+		self.print_result("Chunked book, ids of the page", drumroll)
+		if not drumroll:
+			print ("Got: " + page_c)
+
+	def test_fastMd(self):
+		"""Simple markdown rendered as pandoc does (-t html5, EXTENSIONS_EXTRA); 
+		anything else left for pandoc. Checked against pandoc too, if it's there
+		"""
+
+		import shutil, subprocess
+
+		# markdown: pandoc 3.1 html
+		simple = [
+			("# Hello world\n\nSome *text* and **bold**.\n", 
+			 '<h1 id="hello-world">Hello world</h1>\n<p>Some <em>text</em> and <strong>bold</strong>.</p>'), 
+			("- one\n- two `x<y`\n", '<ul>\n<li>one</li>\n<li>two <code>x&lt;y</code></li>\n</ul>'), 
+			("1. a\n2. b\n", '<ol type="1">\n<li>a</li>\n<li>b</li>\n</ol>'), 
+			("line one\nline two\n", '<p>line one<br />\nline two</p>'), 
+			("See [the *docs*](http://example.com/a?b=1&c=2).\n", 
+			 '<p>See <a href="http://example.com/a?b=1&amp;c=2">the <em>docs</em></a>.</p>'), 
+			("## Intro\n\n## Intro\n", '<h2 id="intro">Intro</h2>\n<h2 id="intro-1">Intro</h2>'), 
+			("# 2. Setup\nfirst\n", '<h1 id="setup">2. Setup</h1>\n<p>first</p>'), 
+			]
+
+		others = ["> quote\n", "It's\n", "a -- b\n", "![i](x.png)\n", "snake_case\n", "para\n- x\n", 
+		          "***\n", "```\ncode\n```\n", "a | b\n--|--\n1 | 2\n", "<b>html</b>\n", "[ref][]\n", "- a\n\n- b\n", 
+		          "a) x\n", "i. x\n", "(1) x\n", "#. x\n", "B) x\n", "- 1. x\n", "- # x\n", "1. - x\n"]
+
+		pandoc = shutil.which('pandoc')
+
+		got = list()
+		for text, html in simple:
+			rendered = pandy.fastmd_render(pandy.text_lines(text.encode('utf-8')))
+			if pandoc:
+				html = subprocess.check_output([pandoc, '-f', 'markdown+link_attributes+hard_line_breaks+raw_html-markdown_in_html_blocks', 
+					                            '-t', 'html5'], input=text.encode('utf-8')).decode('utf-8').strip()
+			if rendered != html:
+				got.append((text, rendered, html))
+
+		for text in others:
+			if pandy.fastmd_render(pandy.text_lines(text.encode('utf-8'))) is not None:
+				got.append((text, "rendered", None))
+
+		self.tests_total += 1
+		drumroll = not got
+		self.print_result("Fast markdown" + (" (against pandoc)" if pandoc else ""), drumroll)
+		if not drumroll:
+			print ("Got: " + str(got))
+
+		# in a run: html5 only, --html4 goes to pandoc
+		import tempfile, os
+
+		fast = dict()
+		with tempfile.TemporaryDirectory() as folder:
+			source = os.path.join(folder, "src")
+			os.mkdir(source)
+			pandy.save(os.path.join(source, "a.md"), "1. a\n2. b\n")
+
+			for version in ('html5', 'html'):
+				config = dict(pandy._DEFAULT_CONFIG)
+				config.update({'SOURCE': source, 'OUTPUT_PATH': os.path.join(folder, version), 'FAST_MD': True, 
+				               'HTML_VER': version, 'PANDOC': self.fake_pandoc(folder)})
+				fast[version] = pandy.Pandy(config, autorun=False).build()['fast_md']
+
+		self.tests_total += 1
+		drumroll = fast == {'html5': 1, 'html': 0}
+		self.print_result("Fast markdown, html5 only", drumroll)
+		if not drumroll:
+			print ("Got: " + str(fast))
+
+	def test_indexFolders(self):
+		"""Index split by folders: files, subfolders (parents too) and totals"""
+
+		outputs = ["a.html", "sub/s1.html", "sub/deep/d.html", "sub/s2.html", "other/x/y.html"]
+		folders = pandy.index_folders(outputs)
+
+		shouldbe = {
+			"":          {'files': ["a.html"], 'folders': ["sub", "other"], 'total': 5}, 
+			"sub":       {'files': ["sub/s1.html", "sub/s2.html"], 'folders': ["sub/deep"], 'total': 3}, 
+			"sub/deep":  {'files': ["sub/deep/d.html"], 'folders': [], 'total': 1}, 
+			"other":     {'files': [], 'folders': ["other/x"], 'total': 1}, 
+			"other/x":   {'files': ["other/x/y.html"], 'folders': [], 'total': 1}, 
+			}
+
+		self.tests_total += 1
+		drumroll = (folders == shouldbe and pandy.index_pageName(1) == "index.html" 
+			        and pandy.index_pageName(3) == "index-3.html")
+		self.print_result("Index by folders", drumroll)
+		if not drumroll:
+			print ("Got: " + str(folders))
+
+	def test_session(self):
+		"""Session without ini: plan() converts nothing, build(paths) only those"""
+
+		import tempfile, os
+
+		with tempfile.TemporaryDirectory() as folder:
+			source = os.path.join(folder, "src")
+			os.mkdir(source)
+			pandy.save(os.path.join(source, "a.md"), "# A\n")
+			pandy.save(os.path.join(source, "b.md"), "# B\n")
+
+			config = dict(pandy._DEFAULT_CONFIG)
+			config.update({'SOURCE': source, 'OUTPUT_PATH': os.path.join(folder, "out"), 
+			               'PANDOC': self.fake_pandoc(folder)})
+			session = pandy.Pandy(config, autorun=False)
+
+			planned = sorted(os.path.basename(job.input) for job in session.plan())
+			nothing = not os.path.exists(os.path.join(folder, "out", "a.html"))
+
+			stats = session.build([os.path.join(source, "b.md")])
+			only_b = (stats['outputs_changed'] == 1 and os.path.exists(os.path.join(folder, "out", "b.html")) 
+				      and not os.path.exists(os.path.join(folder, "out", "a.html")))
+
+			stats = session.build()
+			both = stats['outputs_changed'] == 1 and stats['outputs_unchanged'] == 1
+
+		self.tests_total += 1
+		drumroll = planned == ["a.md", "b.md"] and nothing and only_b and both
+		self.print_result("Build session", drumroll)
+		if not drumroll:
+			print ("Got: " + str([planned, nothing, only_b, both]))
+
+	def test_projects(self):
+		"""--projects: the ini projects in one pool, lines tagged by project, 
+		a failing one doesn't stop the other
+		"""
+
+		import tempfile, os, io, contextlib
+
+		with tempfile.TemporaryDirectory() as folder:
+			pandoc = self.fake_pandoc(folder)
+			projects = os.path.join(folder, "projects")
+			os.mkdir(projects)
+
+			for name, text in (("docs", "# Docs\n"), ("wiki", "FAILME\n")):
+				source = os.path.join(folder, name)
+				os.mkdir(source)
+				pandy.save(os.path.join(source, "page.md"), text)
+				pandy.save_ifChanged(os.path.join(projects, name + ".ini"), "\n".join([
+					"SOURCE = " + source, "OUTPUT_PATH = " + os.path.join(folder, "out-" + name), 
+					"PANDOC = " + pandoc, ""]).encode('utf-8'))
+
+			args = dict(pandy._DEFAULT_CONFIG)
+			metrics_file = os.path.join(folder, "pandy.prom")
+			args.update({'PROJECTS': [projects], 'JOBS': 2, 'METRICS_FILE': metrics_file, 
+			             'LANE_LATEX': 2, 'LANE_LATEX_MEMORY': 1200})
+
+			# the LaTeX memory of every session, before it's planned
+			memory = list()
+			start = pandy.Pandy.start
+			def spy(session):
+				memory.append(session.latex_memory)
+				return start(session)
+
+			printed = io.StringIO()
+			pandy.Pandy.start = spy
+			try:
+				with contextlib.redirect_stdout(printed):
+					all_fine = pandy.projects_run(args)
+			finally:
+				pandy.Pandy.start = start
+
+			built  = os.path.exists(os.path.join(folder, "out-docs", "page.html"))
+			failed = not os.path.exists(os.path.join(folder, "out-wiki", "page.html"))
+			metrics = pandy.cmd_open_file(metrics_file).split("\n")
+			sources = [os.path.join(folder, name) for name in ("docs", "wiki")]
+
+		lines = printed.getvalue().split("\n")
+		tagged = ("  [docs] Converting: page.md (html)" in lines and "  [wiki] Converting: page.md (html)" in lines 
+			      and [line for line in lines if "docs.ini ... ok" in line] and [line for line in lines if "wiki.ini ... FAILED" in line])
+
+		self.tests_total += 1
+		drumroll = not all_fine and built and failed and bool(tagged)
+		self.print_result("Projects", drumroll)
+		if not drumroll:
+			print ("Got: " + str([all_fine, built, failed]) + "\n" + printed.getvalue())
+
+		success = [line for line in metrics if line.startswith("pandy_last_run_success")]
+		self.tests_total += 1
+		drumroll = (memory == [600, 600] and len([line for line in metrics if line == "# TYPE pandy_files gauge"]) == 1
+			        and len(success) == 2 and all(any(pandy.metrics_labels({'source': source}) in line for line in success) 
+			                                      for source in sources))
+		self.print_result("Projects, one pool", drumroll)
+		if not drumroll:
+			print ("Got: " + str(memory) + "\n" + "\n".join(success))
+
+	def test_variablesFile(self):
+		"""Book navigation for pandoc: metadata file (pandoc >= 2.3), --variable before"""
+
+		import tempfile, os, json
+
+		with tempfile.TemporaryDirectory() as folder:
+			variables = {'side_navigation': '<ul><li>a</li></ul>', 'project-index': '<a href="index.html">x</a>'}
+			path = pandy.pandoc_variablesFile(variables, folder)
+			with open(path, encoding='utf-8') as tmp:
+				metadata = json.load(tmp)
+
+			saved = (os.path.dirname(path) == folder and path == pandy.pandoc_variablesFile(dict(variables), folder) 
+				     and metadata['side_navigation'] == "```{=html}\n<ul><li>a</li></ul>\n```\n")
+
+			source = os.path.join(folder, "src")
+			os.mkdir(source)
+			pandy.save(os.path.join(source, "a.md"), "# A\n")
+
+			pages = dict()
+			for version in ("2.2", "2.3"):
+				config = dict(pandy._DEFAULT_CONFIG)
+				config.update({'SOURCE': source, 'OUTPUT_PATH': os.path.join(folder, "out-" + version), 'BOOK': True, 
+				               'PANDOC': self.fake_pandoc(folder, version)})
+				pandy.Pandy(config)
+				pages[version] = pandy.cmd_open_file(os.path.join(folder, "out-" + version, "a.html"))
+
+		old, new = pages["2.2"], pages["2.3"]
+
+		self.tests_total += 1
+		drumroll = (saved and "--variable=side_navigation:<ul>" in old and "--metadata-file" not in old 
+			        and '"side_navigation": "```{=html}' in new and "--variable=side_navigation" not in new)
+		self.print_result("Navigation in a metadata file", drumroll)
+		if not drumroll:
+			print ("Got: " + str(saved) + "\n" + old + "\n" + new)
+
+	def test_sharedCss(self):
+		"""Pandy's template with its CSS in one shared file, named by content"""
+
+		import tempfile, os, hashlib
+
+		with tempfile.TemporaryDirectory() as folder:
+			path = pandy.builtintpl_css(folder)
+			name = "pandy." + hashlib.sha1(pandy.HTML_CSS.encode('utf-8')).hexdigest()[:10] + ".css"
+			saved = (os.path.basename(path) == name and pandy.builtintpl_css(folder) == path 
+				     and pandy.cmd_open_file(path) == pandy.HTML_CSS)
+
+			source = os.path.join(folder, "src")
+			os.makedirs(os.path.join(source, "sub"))
+			pandy.save(os.path.join(source, "a.md"), "# A\n")
+			pandy.save(os.path.join(source, "sub", "c.md"), "# C\n")
+
+			output = os.path.join(folder, "out")
+			config = dict(pandy._DEFAULT_CONFIG)
+			config.update({'SOURCE': source, 'OUTPUT_PATH': output, 'BOOK': True, 'TEMPLATE_PANDY': True, 
+			               'TEMPLATE_PANDY_CSS': True, 'PANDOC': self.fake_pandoc(folder)})
+			pandy.Pandy(config)
+
+			page_a = pandy.cmd_open_file(os.path.join(output, "a.html"))
+			page_c = pandy.cmd_open_file(os.path.join(output, "sub", "c.html"))
+			shared = os.path.exists(os.path.join(output, name))
+
+		self.tests_total += 1
+		drumroll = (saved and shared and '<link rel="stylesheet" href="' + name + '" />' in page_a 
+			        and 'href="../' + name + '"' in page_c and "line-height: 1.8em" not in page_a)
+		self.print_result("Shared stylesheet", drumroll)
+		if not drumroll:
+			print ("Got: " + str([saved, shared]) + "\n" + page_c)
+
+	def test_sharedNav(self):
+		"""Book sidebar from one shared .js, a placeholder in every page"""
+
+		import tempfile, os, glob
+
+		with tempfile.TemporaryDirectory() as folder:
+			items = [["a.html", "A", "<ul><li>A</li></ul>"], ["sub/c.html", "C </script>", ""]]
+			path = pandy.navigation_js(folder, items)
+			code = pandy.cmd_open_file(path)
+			saved = (os.path.basename(path).startswith("pandy-nav.") and path.endswith(".js") 
+			         and pandy.navigation_js(folder, items) == path and code.endswith(pandy.NAV_JS)
+			         and '["sub/c.html","C <\\/script>",""]' in code and "</script>" not in code
+			         and code.startswith("var PANDY_NAV = [[\"a.html\""))
+
+			source = os.path.join(folder, "src")
+			os.makedirs(os.path.join(source, "sub"))
+			pandy.save(os.path.join(source, "a.md"), "# A\n")
+			pandy.save(os.path.join(source, "sub", "c.md"), "# C\n")
+
+			output = os.path.join(folder, "out")
+			config = dict(pandy._DEFAULT_CONFIG)
+			config.update({'SOURCE': source, 'OUTPUT_PATH': output, 'BOOK': True, 'NAV_SIDEBAR': True, 
+			               'NAV_SIDEBAR_SHARED': True, 'PANDOC': self.fake_pandoc(folder)})
+			pandy.Pandy(config)
+
+			# the stand-in pandoc shows the variables as json
+			page_a = pandy.cmd_open_file(os.path.join(output, "a.html")).replace('\\"', '"')
+			page_c = pandy.cmd_open_file(os.path.join(output, "sub", "c.html")).replace('\\"', '"')
+			shared = [os.path.basename(x) for x in glob.glob(os.path.join(output, "pandy-nav.*.js"))]
+
+		self.tests_total += 1
+		drumroll = (saved and len(shared) == 1
+			        and '<nav id="pandy-nav" data-root="" data-active="a.html">' in page_a
+			        and '<script src="' + shared[0] + '">' in page_a
+			        and '<nav id="pandy-nav" data-root="../" data-active="sub/c.html">' in page_c
+			        and '<script src="../' + shared[0] + '">' in page_c)
+		self.print_result("Shared navigation", drumroll)
+		if not drumroll:
+			print ("Got: " + str([saved, shared]) + "\n" + page_a + "\n" + page_c)
+
+	def fake_pandoc(self, folder, version="3.1.2"):
+		"""A stand-in pandoc in folder, returns its path. Its html: the title 
+		(file name), the --variable args, the --metadata-file content and the 
+		input as it is (the FAST_MD probe as pandoc does). Exits 3 if the input has FAILME
+		"""
+
+		import os, stat, sys
+
+		fake = "\n".join([
+			"import os, sys", 
+			"args = sys.argv[1:]", 
+			"if '--version' in args:", 
+			"	print('pandoc " + version + "')", 
+			"	sys.exit(0)", 
+			"files, output, number = list(), None, 0", 
+			"while number < len(args):", 
+			"	if args[number] in ('-f', '-t', '-o'):", 
+			"		output = args[number + 1] if args[number] == '-o' else output", 
+			"		number += 2", 
+			"		continue", 
+			"	if not args[number].startswith('-'):", 
+			"		files.append(args[number])", 
+			"	number += 1", 
+			"data = b''.join(open(name, 'rb').read() for name in files) if files else sys.stdin.buffer.read()", 
+			"if data.strip() == b'" + pandy.FASTMD_PROBE_TEXT.strip() + "':", 
+			"	data = b'" + pandy.FASTMD_PROBE_BODY + "'", 
+			"if b'FAILME' in data:", 
+			"	sys.stderr.write('pandoc: boom\\n')", 
+			"	sys.exit(3)", 
+			"meta = [open(arg[16:], encoding='utf-8').read() for arg in args if arg.startswith('--metadata-file=')]", 
+			"title = os.path.splitext(os.path.basename(files[0]))[0] if files else 't'", 
+			"page = ('<html><head><title>' + title + '</title></head><body><pre>' + ' '.join(arg for arg in args if arg.startswith('--variable')) ", 
+			"        + '</pre><pre>' + ''.join(meta) + '</pre>' + data.decode('utf-8') + '</body></html>\\n')", 
+			"if output:", 
+			"	open(output, 'w', encoding='utf-8').write(page)", 
+			"else:", 
+			"	sys.stdout.write(page)", 
+			""])
+
+		pandoc = os.path.join(folder, "pandoc-" + version)
+		pandy.save_ifChanged(pandoc, ("#!" + sys.executable + "\n" + fake).encode('utf-8'))
+		os.chmod(pandoc, os.stat(pandoc).st_mode | stat.S_IEXEC)
+
+		return pandoc
 
 	def finishing(self):
 		print ("\n\n------------------------------- ")